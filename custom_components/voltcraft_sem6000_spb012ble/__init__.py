@@ -1,60 +1,94 @@
 from __future__ import annotations
 
-from bleak import BleakClient
-from bleak_retry_connector import establish_connection
-
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_MAC, Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .const import CONF_ENTRY_TYPE, DOMAIN, ENERGY_STORAGE_VERSION, ENTRY_TYPE_GROUP, SCHEDULE_STORAGE_VERSION
 from .coordinator import VoltcraftDataUpdateCoordinator
+from .energy import energy_storage_key
+from .group import VoltcraftGroupCoordinator
+from .services import async_setup_services
+from .timers import schedule_storage_key
+from .websocket_api import async_setup_websocket_api
+
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
+GROUP_PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.SWITCH]
+
+def _platforms(entry: ConfigEntry) -> list[Platform]:
+    return GROUP_PLATFORMS if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP else PLATFORMS
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return await _async_setup_group_entry(hass, entry)
+
     mac_address = entry.data[CONF_MAC]
-    ble_device = bluetooth.async_ble_device_from_address(hass, mac_address)
-    if not ble_device:
-        raise ConfigEntryNotReady(f"Device {mac_address} not found")
-
-    client = await establish_connection(
-        BleakClient,
-        ble_device,
-        entry.entry_id,
-    )
-
-    coord = VoltcraftDataUpdateCoordinator(
-        hass,
-        client,
-        mac_address,
-        ble_device.name,
-    )
-
-    # Setup coordinator (start notifications)
-    await coord.async_setup()
+    # May be None if the plug isn't advertising (yet), the coordinator keeps trying in the background
+    ble_device = bluetooth.async_ble_device_from_address(hass, mac_address, connectable=True)
 
-    # Perform initial data fetch
-    await coord.async_config_entry_first_refresh()
+    coord = VoltcraftDataUpdateCoordinator(hass, entry, ble_device)
+    await coord.async_setup()
 
     # Store coordinator in hass.data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coord
 
-    # Forward to platforms
+    # Forward to platforms, entities start from their restored state
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Connect and fetch the first measurement without holding up Home Assistant startup
+    entry.async_create_background_task(hass, coord.async_start(), f"{coord.name} start")
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
     return True
 
 
+async def _async_setup_group_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    group = VoltcraftGroupCoordinator(hass, entry)
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = group
+
+    await hass.config_entries.async_forward_entry_setups(entry, GROUP_PLATFORMS)
+
+    # The first round waits for the members to connect, don't hold up Home Assistant startup with it
+    entry.async_create_background_task(hass, group.async_refresh(), f"{group.name} start")
+
+    return True
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, _platforms(entry))
 
     if unload_ok:
-        coord: VoltcraftDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coord: VoltcraftDataUpdateCoordinator | VoltcraftGroupCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
         await coord.async_shutdown()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored energy offset and timers of a deleted entry."""
+    if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP:
+        return
+    await Store(hass, ENERGY_STORAGE_VERSION, energy_storage_key(entry.entry_id)).async_remove()
+    await Store(hass, SCHEDULE_STORAGE_VERSION, schedule_storage_key(entry.entry_id)).async_remove()
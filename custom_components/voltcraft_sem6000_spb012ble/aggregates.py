@@ -0,0 +1,144 @@
+"""In-memory sample history with rolling aggregates."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RollingStats:
+    samples: int
+    power_mean: float
+    power_min: float
+    power_max: float
+    power_stddev: float
+    current_peak: float
+    voltage_mean: float
+
+
+class SampleBuffer:
+    """Ring buffer of (timestamp, power, voltage, current) samples."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))  # monotonic seconds
+        self.power = array("d", bytes(8 * capacity))  # W
+        self.voltage = array("d", bytes(8 * capacity))  # V
+        self.current = array("d", bytes(8 * capacity))  # A
+        # Sequence number of the next sample, the slot of a sample is its sequence number modulo capacity
+        self.next_seq = 0
+        self._windows: list[RollingWindow] = []
+
+    def __len__(self) -> int:
+        return min(self.next_seq, self.capacity)
+
+    def add_window(self, duration: float) -> RollingWindow:
+        window = RollingWindow(self, duration)
+        self._windows.append(window)
+        return window
+
+    def append(self, timestamp: float, power: float, voltage: float, current: float) -> None:
+        seq = self.next_seq
+        if seq >= self.capacity:
+            # The oldest sample gets overwritten, windows still holding it must drop it first
+            for window in self._windows:
+                window.evict_seq(seq - self.capacity)
+
+        slot = seq % self.capacity
+        self.timestamps[slot] = timestamp
+        self.power[slot] = power
+        self.voltage[slot] = voltage
+        self.current[slot] = current
+        self.next_seq = seq + 1
+
+        for window in self._windows:
+            window.add(seq, power, voltage, current)
+            window.expire(timestamp)
+
+
+class RollingWindow:
+    """Aggregates of the samples of the last `duration` seconds."""
+
+    def __init__(self, buffer: SampleBuffer, duration: float) -> None:
+        self.duration = duration
+        self._buffer = buffer
+        self._first_seq = buffer.next_seq
+        self._count = 0
+        self._power_sum = 0.0
+        self._power_sq_sum = 0.0
+        self._voltage_sum = 0.0
+        # Monotonic queues of (seq, value), the front holds the extreme of the window
+        self._power_min: deque[tuple[int, float]] = deque()
+        self._power_max: deque[tuple[int, float]] = deque()
+        self._current_max: deque[tuple[int, float]] = deque()
+
+    def add(self, seq: int, power: float, voltage: float, current: float) -> None:
+        self._count += 1
+        self._power_sum += power
+        self._power_sq_sum += power * power
+        self._voltage_sum += voltage
+        _push_min(self._power_min, seq, power)
+        _push_max(self._power_max, seq, power)
+        _push_max(self._current_max, seq, current)
+
+    def expire(self, now: float) -> None:
+        timestamps = self._buffer.timestamps
+        capacity = self._buffer.capacity
+        cutoff = now - self.duration
+        while self._count and timestamps[self._first_seq % capacity] < cutoff:
+            self._evict_oldest()
+
+    def evict_seq(self, seq: int) -> None:
+        if self._count and self._first_seq == seq:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        buffer = self._buffer
+        seq = self._first_seq
+        slot = seq % buffer.capacity
+        power = buffer.power[slot]
+        self._count -= 1
+        self._power_sum -= power
+        self._power_sq_sum -= power * power
+        self._voltage_sum -= buffer.voltage[slot]
+        self._first_seq = seq + 1
+        for queue in (self._power_min, self._power_max, self._current_max):
+            if queue and queue[0][0] <= seq:
+                queue.popleft()
+
+        if not self._count:
+            # Reset the running sums to get rid of accumulated rounding errors
+            self._power_sum = self._power_sq_sum = self._voltage_sum = 0.0
+
+    def stats(self, now: float) -> RollingStats | None:
+        self.expire(now)
+        count = self._count
+        if not count:
+            return None
+
+        mean = self._power_sum / count
+        variance = max(0.0, self._power_sq_sum / count - mean * mean)
+        return RollingStats(
+            samples=count,
+            power_mean=mean,
+            power_min=self._power_min[0][1],
+            power_max=self._power_max[0][1],
+            power_stddev=math.sqrt(variance),
+            current_peak=self._current_max[0][1],
+            voltage_mean=self._voltage_sum / count,
+        )
+
+
+def _push_min(queue: deque[tuple[int, float]], seq: int, value: float) -> None:
+    while queue and queue[-1][1] >= value:
+        queue.pop()
+    queue.append((seq, value))
+
+
+def _push_max(queue: deque[tuple[int, float]], seq: int, value: float) -> None:
+    while queue and queue[-1][1] <= value:
+        queue.pop()
+    queue.append((seq, value))
@@ -0,0 +1,141 @@
+"""Appliance cycle detection on the power signal of a plug ("washing machine finished")."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+from .const import (
+    APPLIANCE_ACTIVE_ALPHA,
+    APPLIANCE_FINISHED_HOLD,
+    APPLIANCE_IDLE_ALPHA,
+    APPLIANCE_MAX_GAP,
+    APPLIANCE_START_TIME,
+)
+
+
+class ApplianceState(StrEnum):
+    IDLE = "idle"
+    RUNNING = "running"
+    FINISHED = "finished"
+
+
+class ApplianceEvent(StrEnum):
+    CYCLE_STARTED = "cycle_started"
+    CYCLE_FINISHED = "cycle_finished"
+    CYCLE_INTERRUPTED = "cycle_interrupted"  # the outlet was switched off during the cycle
+
+
+@dataclass(slots=True)
+class ApplianceCycle:
+    started_at: float  # unix timestamp
+    duration: float = 0.0  # seconds
+    energy: float = 0.0  # Wh
+    peak_power: float = 0.0  # W
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "duration": round(self.duration),
+            "energy": round(self.energy, 2),
+            "peak_power": self.peak_power,
+        }
+
+
+class ApplianceDetector:
+    """State of the appliance behind one plug, fed with (unix timestamp, power, outlet on) samples."""
+
+    def __init__(self, threshold: float, end_delay: float) -> None:
+        self.threshold = threshold  # W above the idle level that count as running
+        self.end_delay = end_delay  # seconds below the end level before a cycle is finished
+        self.state = ApplianceState.IDLE
+        self.idle_power: float | None = None  # W, learned
+        self.active_power: float | None = None  # W, learned over the running cycles
+        self.cycle: ApplianceCycle | None = None  # the running cycle
+        self.last_cycle: ApplianceCycle | None = None
+        self._cusum = 0.0  # W*s
+        self._quiet_since: float | None = None  # unix timestamp the power dropped below the end level
+        self._finished_at: float | None = None
+        self._last_timestamp: float | None = None
+
+    def update(self, timestamp: float, power: float, is_on: bool) -> ApplianceEvent | None:
+        elapsed = 0.0
+        if self._last_timestamp is not None:
+            elapsed = min(max(0.0, timestamp - self._last_timestamp), APPLIANCE_MAX_GAP)
+        self._last_timestamp = timestamp
+
+        if not is_on:
+            # Nothing to learn from a switched off outlet
+            self._cusum = 0.0
+            if self.state is not ApplianceState.RUNNING:
+                return None
+            self._end_cycle(ApplianceState.IDLE)
+            return ApplianceEvent.CYCLE_INTERRUPTED
+
+        idle = self.idle_power
+        if idle is None or power < idle:
+            self.idle_power = idle = power
+        end_level = idle + self.threshold / 2
+
+        if self.state is ApplianceState.RUNNING:
+            return self._update_running(timestamp, power, elapsed, end_level)
+
+        if self.state is ApplianceState.FINISHED and self._finished_at is not None:
+            if timestamp - self._finished_at >= APPLIANCE_FINISHED_HOLD:
+                self.state = ApplianceState.IDLE
+                self._finished_at = None
+
+        if power < idle + self.threshold:
+            self.idle_power = idle + APPLIANCE_IDLE_ALPHA * (power - idle)
+
+        self._cusum = max(0.0, self._cusum + (power - end_level) * elapsed)
+        if self._cusum < self.threshold * APPLIANCE_START_TIME:
+            return None
+
+        self.state = ApplianceState.RUNNING
+        self.cycle = ApplianceCycle(started_at=timestamp - elapsed, peak_power=power)
+        self._cusum = 0.0
+        self._quiet_since = None
+        self._finished_at = None
+        return ApplianceEvent.CYCLE_STARTED
+
+    def _update_running(
+        self, timestamp: float, power: float, elapsed: float, end_level: float
+    ) -> ApplianceEvent | None:
+        cycle = self.cycle
+        assert cycle is not None
+        cycle.duration = timestamp - cycle.started_at
+        cycle.energy += power * elapsed / 3600
+        cycle.peak_power = max(cycle.peak_power, power)
+
+        if power >= end_level:
+            self._quiet_since = None
+            active = self.active_power
+            self.active_power = power if active is None else active + APPLIANCE_ACTIVE_ALPHA * (power - active)
+            return None
+
+        if self._quiet_since is None:
+            self._quiet_since = timestamp
+        if timestamp - self._quiet_since < self.end_delay:
+            return None
+
+        # The quiet tail isn't part of the cycle
+        cycle.duration = self._quiet_since - cycle.started_at
+        self._finished_at = timestamp
+        self._end_cycle(ApplianceState.FINISHED)
+        return ApplianceEvent.CYCLE_FINISHED
+
+    def _end_cycle(self, state: ApplianceState) -> None:
+        self.state = state
+        self.last_cycle, self.cycle = self.cycle, None
+        self._quiet_since = None
+        self._cusum = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "idle_power": round(self.idle_power, 2) if self.idle_power is not None else None,
+            "active_power": round(self.active_power, 2) if self.active_power is not None else None,
+            "cycle": self.cycle.as_dict() if self.cycle else None,
+            "last_cycle": self.last_cycle.as_dict() if self.last_cycle else None,
+        }
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import VoltcraftDataUpdateCoordinator
+from .group import VoltcraftGroupCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: VoltcraftDataUpdateCoordinator | VoltcraftGroupCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(coordinator, VoltcraftGroupCoordinator):
+        async_add_entities([VoltcraftGroupIncompleteBinarySensor(coordinator)])
+        return
+    async_add_entities([VoltcraftOverloadBinarySensor(coordinator)])
+
+
+class VoltcraftOverloadBinarySensor(CoordinatorEntity[VoltcraftDataUpdateCoordinator], BinarySensorEntity):
+    """On after the power protection cut the outlet, until the outlet is switched on again."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_overload"
+        self._attr_name = "Overload"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def is_on(self) -> bool:
+        return self.coordinator.overload_tripped
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        return self.coordinator.last_overload
+
+
+class VoltcraftGroupIncompleteBinarySensor(CoordinatorEntity[VoltcraftGroupCoordinator], BinarySensorEntity):
+    """On while the totals of a group leave out members that didn't report in time."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, coordinator: VoltcraftGroupCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"group_{coordinator.config_entry.entry_id}_incomplete"
+        self._attr_name = "Incomplete"
+        self._attr_device_info = coordinator.device_info
+
+    @property
+    def is_on(self) -> bool | None:
+        data = self.coordinator.data
+        if not data:
+            return None
+        return bool(data.stale or data.missing)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        data = self.coordinator.data
+        if not data:
+            return None
+        return {"stale": data.stale, "missing": data.missing}
@@ -0,0 +1,79 @@
+"""Sample buffer of a burst capture (MEASURE requests back to back for a few seconds)."""
+
+from __future__ import annotations
+
+import csv
+from array import array
+from pathlib import Path
+from typing import Any
+
+from .const import BURST_MAX_SAMPLES
+
+COLUMNS = ("time", "is_on", "power", "voltage", "current", "frequency")
+
+
+class BurstBuffer:
+    """Columns of the samples of one burst, timestamps in unix seconds."""
+
+    def __init__(self, max_samples: int = BURST_MAX_SAMPLES) -> None:
+        self.max_samples = max_samples
+        self.columns: dict[str, array[float]] = {column: array("d") for column in COLUMNS}
+        self.requests = 0
+        self.timeouts = 0
+        self.started_at: float | None = None  # monotonic
+        self.ended_at: float | None = None  # monotonic
+
+    def __len__(self) -> int:
+        return len(self.columns["time"])
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.max_samples
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.ended_at is None:
+            return 0.0
+        return self.ended_at - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Achieved samples per second."""
+        return len(self) / self.duration if self.duration else 0.0
+
+    def append(
+        self, timestamp: float, is_on: bool, power: float, voltage: float, current: float, frequency: int
+    ) -> None:
+        if self.full:
+            return
+        columns = self.columns
+        columns["time"].append(timestamp)
+        columns["is_on"].append(is_on)
+        columns["power"].append(power)
+        columns["voltage"].append(voltage)
+        columns["current"].append(current)
+        columns["frequency"].append(frequency)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "samples": len(self),
+            "duration": round(self.duration, 3),
+            "rate": round(self.rate, 2),
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summary plus the samples column-wise (one list per value)."""
+        data = {column: values.tolist() for column, values in self.columns.items()}
+        data["is_on"] = [bool(value) for value in data["is_on"]]
+        return {**self.summary(), "columns": data}
+
+    def write_csv(self, path: Path) -> None:
+        """Write the samples as CSV (blocking, run it in the executor)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            for timestamp, is_on, power, voltage, current, frequency in zip(*self.columns.values(), strict=True):
+                writer.writerow((timestamp, int(is_on), power, voltage, current, int(frequency)))
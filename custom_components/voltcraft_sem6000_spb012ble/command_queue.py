@@ -0,0 +1,138 @@
+"""Per-device queue of GATT commands."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from enum import IntEnum
+
+from .protocol import Command, ParsedNotifyPayload
+
+
+class CommandPriority(IntEnum):
+    """Lower values run first."""
+
+    CONTROL = 0  # switching the outlet
+    CONFIG = 1  # device settings
+    POLL = 2  # measurements
+    BACKGROUND = 3  # history downloads
+
+
+class _QueuedCommand:
+    __slots__ = ("frame", "response", "timeout", "future")
+
+    def __init__(self, frame: bytes, response: Command, timeout: float, future: asyncio.Future[ParsedNotifyPayload]):
+        self.frame = frame
+        self.response = response
+        self.timeout = timeout
+        self.future = future
+
+
+class CommandQueue:
+    """Serializes the commands of one device and hands notifications to the command waiting for them."""
+
+    def __init__(
+        self,
+        write: Callable[[bytes], Awaitable[None]],
+        slot: Callable[[], AbstractAsyncContextManager[None]],
+    ) -> None:
+        self._write = write
+        self._slot = slot
+        self._heap: list[tuple[int, int, _QueuedCommand]] = []
+        self._seq = itertools.count()
+        # Commands not written yet, by (frame, expected answer)
+        self._waiting: dict[tuple[bytes, Command], _QueuedCommand] = {}
+        self._in_flight: _QueuedCommand | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self.coalesced = 0  # commands that joined an equal waiting one
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    async def async_request(
+        self,
+        frame: bytes,
+        response: Command,
+        priority: CommandPriority,
+        timeout: float,
+    ) -> ParsedNotifyPayload:
+        """Queue a command and wait for the notification answering it.
+
+        Raises TimeoutError if no answer arrives within `timeout` seconds after the command was
+        written, or the error raised by the write.
+        """
+        key = (frame, response)
+        command = self._waiting.get(key)
+        if command is None:
+            command = _QueuedCommand(frame, response, timeout, asyncio.get_running_loop().create_future())
+            self._waiting[key] = command
+        else:
+            self.coalesced += 1
+        # Pushing a joined command again is harmless, it runs at the best priority and the other entry is skipped
+        heapq.heappush(self._heap, (priority, next(self._seq), command))
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._async_run())
+
+        # Shielded, a cancelled caller must not cancel the answer for the others
+        return await asyncio.shield(command.future)
+
+    def resolve(self, response: Command, payload: ParsedNotifyPayload) -> bool:
+        """Hand a notification to the command waiting for it, returns False if nobody was waiting."""
+        command = self._in_flight
+        if command is None or command.response != response or command.future.done():
+            return False
+        command.future.set_result(payload)
+        return True
+
+    def fail_all(self, err: Exception) -> None:
+        """Fail the command in flight and all waiting ones (the connection is gone)."""
+        for command in self._drain():
+            _set_exception(command.future, err)
+
+    def cancel(self) -> None:
+        """Stop the queue, cancelling every command."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        for command in self._drain():
+            command.future.cancel()
+
+    def _drain(self) -> list[_QueuedCommand]:
+        commands = list(self._waiting.values())
+        if self._in_flight is not None:
+            commands.append(self._in_flight)
+        self._waiting.clear()
+        self._heap.clear()
+        return commands
+
+    async def _async_run(self) -> None:
+        while self._heap:
+            _, _, command = heapq.heappop(self._heap)
+            key = (command.frame, command.response)
+            if self._waiting.get(key) is not command:
+                # Already run through an entry with a better priority
+                continue
+            del self._waiting[key]
+
+            self._in_flight = command
+            try:
+                async with self._slot(), asyncio.timeout(command.timeout):
+                    await self._write(command.frame)
+                    await asyncio.shield(command.future)
+            except Exception as err:
+                # Handed to the callers
+                _set_exception(command.future, err)
+            finally:
+                self._in_flight = None
+
+
+def _set_exception(future: asyncio.Future[ParsedNotifyPayload], err: BaseException) -> None:
+    if future.done():
+        return
+    future.set_exception(err)
+    # Mark the exception as retrieved, every caller may have given up already
+    future.exception()
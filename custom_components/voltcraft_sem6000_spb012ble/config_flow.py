@@ -5,19 +5,58 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.const import CONF_MAC
+from homeassistant.const import CONF_MAC, CONF_NAME
 from homeassistant.helpers.device_registry import format_mac
 from homeassistant.components import onboarding
 from homeassistant.components.bluetooth import (
     BluetoothServiceInfoBleak,
     async_discovered_service_info,
 )
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN, DEVICE_NAME, SERVICE_UUID
+from .const import (
+    AGGREGATE_WINDOW_CHOICES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_AGGREGATE_WINDOWS,
+    CONF_APPLIANCE_END_DELAY,
+    CONF_APPLIANCE_THRESHOLD,
+    CONF_CONNECTION_MODE,
+    CONF_ENTRY_TYPE,
+    CONF_GROUP_INTERVAL,
+    CONF_IDLE_TIMEOUT,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_PUBLISH_INTERVAL,
+    CONF_MEMBERS,
+    CONF_MIN_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_STATE_FILTER,
+    CONNECTION_MODE_CHOICES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_AGGREGATE_WINDOWS,
+    DEFAULT_APPLIANCE_END_DELAY,
+    DEFAULT_APPLIANCE_THRESHOLD,
+    DEFAULT_CONNECTION_MODE,
+    DEFAULT_GROUP_INTERVAL,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_PUBLISH_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_STATE_FILTER,
+    DEVICE_NAME,
+    DOMAIN,
+    ENTRY_TYPE_GROUP,
+    SERVICE_UUID,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Entry of the device list of the user step that sets up a group of configured plugs instead
+_NEW_GROUP = "group"
+_NEW_GROUP_LABEL = "New group of configured plugs"
+
 
 class MainConfigFlow(ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -27,6 +66,17 @@ class MainConfigFlow(ConfigFlow, domain=DOMAIN):
         self._discovered_devices: dict[str, str] = {}
         self._mac_address: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> MainOptionsFlow:
+        return MainOptionsFlow()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        # The options only apply to plugs
+        return config_entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_GROUP
+
     async def async_step_bluetooth(self, discovery_info: BluetoothServiceInfoBleak) -> ConfigFlowResult:
         device_unique_id = format_mac(discovery_info.address)
         await self.async_set_unique_id(device_unique_id)
@@ -48,6 +98,8 @@ class MainConfigFlow(ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         if user_input is not None:
             mac_address = user_input[CONF_MAC]
+            if mac_address == _NEW_GROUP:
+                return await self.async_step_group()
             device_unique_id = format_mac(mac_address)
             await self.async_set_unique_id(device_unique_id, raise_on_progress=False)
             self._abort_if_unique_id_configured()
@@ -67,18 +119,68 @@ class MainConfigFlow(ConfigFlow, domain=DOMAIN):
             if SERVICE_UUID in discovery_info.service_uuids:
                 self._discovered_devices[address] = f"{discovery_info.name} ({address})"
 
-        if not self._discovered_devices:
+        choices = dict(self._discovered_devices)
+        if self._groupable_plugs():
+            # Groups are set up from configured plugs, offered next to the discovered ones
+            choices[_NEW_GROUP] = _NEW_GROUP_LABEL
+        if not choices:
             return self.async_abort(reason="no_devices_found")
 
         return self.async_show_form(
             step_id="user",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_MAC): vol.In(self._discovered_devices),
+                    vol.Required(CONF_MAC): vol.In(choices),
                 }
             ),
         )
 
+    async def async_step_group(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        """Group configured plugs, a plug can be a member of one group only."""
+        plugs = self._groupable_plugs()
+        if not plugs:
+            return self.async_abort(reason="no_plugs")
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if not user_input[CONF_MEMBERS]:
+                errors["base"] = "no_members"
+            else:
+                return self.async_create_entry(
+                    title=user_input[CONF_NAME],
+                    data={CONF_ENTRY_TYPE: ENTRY_TYPE_GROUP, **user_input},
+                )
+
+        return self.async_show_form(
+            step_id="group",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): cv.string,
+                    vol.Required(CONF_MEMBERS): cv.multi_select(plugs),
+                    vol.Required(CONF_GROUP_INTERVAL, default=DEFAULT_GROUP_INTERVAL): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=3600)
+                    ),
+                }
+            ),
+            errors=errors,
+        )
+
+    @callback
+    def _groupable_plugs(self) -> dict[str, str]:
+        """Return the configured plugs that aren't a member of a group yet, by MAC address."""
+        entries = self.hass.config_entries.async_entries(DOMAIN)
+        grouped = {
+            mac
+            for entry in entries
+            if entry.data.get(CONF_ENTRY_TYPE) == ENTRY_TYPE_GROUP
+            for mac in entry.data[CONF_MEMBERS]
+        }
+        return {
+            format_mac(entry.data[CONF_MAC]): entry.title
+            for entry in entries
+            if entry.data.get(CONF_ENTRY_TYPE) != ENTRY_TYPE_GROUP and format_mac(entry.data[CONF_MAC]) not in grouped
+        }
+
     @property
     def _name(self) -> str:
         return self.context["title_placeholders"]["name"] or DEVICE_NAME
@@ -92,3 +194,69 @@ class MainConfigFlow(ConfigFlow, domain=DOMAIN):
             title=self._name,
             data={CONF_MAC: self._mac_address},
         )
+
+
+class MainOptionsFlow(OptionsFlow):
+    async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if user_input[CONF_MIN_INTERVAL] > user_input[CONF_MAX_INTERVAL]:
+                errors["base"] = "invalid_interval_range"
+            elif 0 < user_input[CONF_MAX_PUBLISH_INTERVAL] < user_input[CONF_MIN_PUBLISH_INTERVAL]:
+                errors["base"] = "invalid_publish_interval_range"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_CONNECTION_MODE,
+                        default=options.get(CONF_CONNECTION_MODE, DEFAULT_CONNECTION_MODE),
+                    ): vol.In(CONNECTION_MODE_CHOICES),
+                    vol.Required(
+                        CONF_IDLE_TIMEOUT,
+                        default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING),
+                    ): bool,
+                    vol.Required(
+                        CONF_MIN_INTERVAL,
+                        default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Required(
+                        CONF_MAX_INTERVAL,
+                        default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+                    vol.Required(
+                        CONF_STATE_FILTER,
+                        default=options.get(CONF_STATE_FILTER, DEFAULT_STATE_FILTER),
+                    ): bool,
+                    vol.Required(
+                        CONF_MIN_PUBLISH_INTERVAL,
+                        default=options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_MAX_PUBLISH_INTERVAL,
+                        default=options.get(CONF_MAX_PUBLISH_INTERVAL, DEFAULT_MAX_PUBLISH_INTERVAL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                    vol.Required(
+                        CONF_AGGREGATE_WINDOWS,
+                        default=options.get(CONF_AGGREGATE_WINDOWS, DEFAULT_AGGREGATE_WINDOWS),
+                    ): cv.multi_select(AGGREGATE_WINDOW_CHOICES),
+                    vol.Required(
+                        CONF_APPLIANCE_THRESHOLD,
+                        default=options.get(CONF_APPLIANCE_THRESHOLD, DEFAULT_APPLIANCE_THRESHOLD),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3680)),
+                    vol.Required(
+                        CONF_APPLIANCE_END_DELAY,
+                        default=options.get(CONF_APPLIANCE_END_DELAY, DEFAULT_APPLIANCE_END_DELAY),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+                }
+            ),
+            errors=errors,
+        )
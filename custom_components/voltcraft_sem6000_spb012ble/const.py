@@ -9,3 +9,179 @@ NOTIFY_UUID = "0000fff4-0000-1000-8000-00805f9b34fb"
 
 # Polling interval for sensor updates
 SCAN_INTERVAL = timedelta(seconds=5)
+
+# Connection supervisor
+RECONNECT_BACKOFF_MIN = 1.0  # seconds
+RECONNECT_BACKOFF_MAX = 60.0  # seconds
+# Number of consecutive unanswered polls before the link is considered dead
+STALL_POLL_LIMIT = 3
+
+# Shared per-adapter scheduling (hass.data[DOMAIN][DATA_SCHEDULERS][adapter source])
+DATA_SCHEDULERS = "schedulers"
+ADAPTER_MAX_CONCURRENT_OPS = 2
+ADAPTER_MAX_POLL_SPACING = 0.25  # seconds
+ADAPTER_UTILIZATION_WINDOW = 60.0  # seconds
+ADAPTER_SATURATION_WARNING = 0.8
+# Simultaneous connections of an adapter or proxy that hasn't reported its slot count (ESPHome proxies default to 3)
+ADAPTER_CONNECTION_SLOTS = 3
+# Longest wait for a free connection slot before a connect attempt fails
+CONNECTION_SLOT_TIMEOUT = 30.0  # seconds
+
+# Connection path selection across adapters and proxies
+PATH_EVALUATION_INTERVAL = 60.0  # seconds between checks for a better path
+PATH_MIN_DWELL = 600.0  # seconds on a path before moving away from it
+PATH_RSSI_HYSTERESIS = 10  # dB a candidate must be stronger than the current path
+PATH_MIN_SAMPLES = 10  # polls before a path's quality is judged
+PATH_DEGRADED_FAILURE_RATE = 0.2
+PATH_DEGRADED_ROUND_TRIP = 1.0  # seconds
+PATH_EWMA_ALPHA = 0.1
+# Home Assistant may connect through another path than the one asked for, moves are then paused (doubling each time)
+PATH_MIGRATION_BACKOFF = 1800.0  # seconds
+PATH_MIGRATION_BACKOFF_MAX = 86400.0  # seconds
+
+# Connection mode (options flow)
+CONF_CONNECTION_MODE = "connection_mode"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONNECTION_MODE_PERSISTENT = "persistent"
+CONNECTION_MODE_ON_DEMAND = "on_demand"
+CONNECTION_MODE_CHOICES = {CONNECTION_MODE_PERSISTENT: "Persistent", CONNECTION_MODE_ON_DEMAND: "On demand"}
+DEFAULT_CONNECTION_MODE = CONNECTION_MODE_PERSISTENT
+DEFAULT_IDLE_TIMEOUT = 30  # seconds
+
+# Adaptive polling (options flow)
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_INTERVAL = 5  # seconds
+DEFAULT_MAX_INTERVAL = 60  # seconds
+# Interval growth per stable sample
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+# Power change treated as significant: larger of an absolute and a relative threshold
+ADAPTIVE_POWER_CHANGE_ABS = 1.0  # Watts
+ADAPTIVE_POWER_CHANGE_REL = 0.05
+
+# Live measurement streaming (websocket API)
+LIVE_POLL_INTERVAL = timedelta(seconds=1)  # poll interval while a stream is subscribed
+LIVE_MAX_BATCH_SIZE = 100  # samples per message
+LIVE_MAX_BATCH_DELAY = 60.0  # seconds a partial batch may wait
+
+# Appliance cycle detection (options flow)
+CONF_APPLIANCE_THRESHOLD = "appliance_threshold"
+CONF_APPLIANCE_END_DELAY = "appliance_end_delay"
+DEFAULT_APPLIANCE_THRESHOLD = 5  # Watts above the idle level
+DEFAULT_APPLIANCE_END_DELAY = 300  # seconds below the end level before a cycle is finished
+APPLIANCE_START_TIME = 30.0  # seconds at the threshold before a cycle starts, larger loads start it sooner
+APPLIANCE_FINISHED_HOLD = 3600.0  # seconds "finished" is kept before going back to "idle"
+APPLIANCE_MAX_GAP = 60.0  # seconds, longer gaps between samples are counted as this long
+APPLIANCE_IDLE_ALPHA = 0.05
+APPLIANCE_ACTIVE_ALPHA = 0.05
+EVENT_APPLIANCE = f"{DOMAIN}_appliance"
+
+# Burst capture (MEASURE requests back to back)
+BURST_DEFAULT_DURATION = 10  # seconds
+BURST_MAX_DURATION = 300  # seconds
+BURST_MAX_SAMPLES = 50_000
+
+# Plug groups (config flow): members polled together, aggregate sensors on a group device
+CONF_ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_GROUP = "group"
+CONF_MEMBERS = "members"
+CONF_GROUP_INTERVAL = "group_interval"
+DEFAULT_GROUP_INTERVAL = 5  # seconds
+# Rounds without a sample before a member is left out of the totals
+GROUP_STALE_ROUNDS = 2
+
+# Time to wait for the plug to answer a command
+RESPONSE_TIMEOUT = 3.0  # seconds
+SWITCH_RESPONSE_TIMEOUT = 2.0  # seconds
+HISTORY_RESPONSE_TIMEOUT = 5.0  # seconds, the answer spans several notifications
+
+# Entity state filtering (options flow)
+CONF_STATE_FILTER = "state_filter"
+CONF_MIN_PUBLISH_INTERVAL = "min_publish_interval"
+CONF_MAX_PUBLISH_INTERVAL = "max_publish_interval"
+DEFAULT_STATE_FILTER = False
+DEFAULT_MIN_PUBLISH_INTERVAL = 0  # seconds
+DEFAULT_MAX_PUBLISH_INTERVAL = 300  # seconds, heartbeat
+# Change needed to publish a new state per entity: (absolute, relative to the last published value)
+STATE_FILTER_DEADBANDS: dict[str, tuple[float, float]] = {
+    "power": (0.5, 0.02),  # W
+    "voltage": (1.0, 0.0),  # V
+    "current": (0.005, 0.02),  # A
+    "frequency": (0.0, 0.0),  # Hz
+    "power_factor": (0.02, 0.0),
+    "energy": (0.0, 0.0),  # kWh
+    "adapter_utilization": (5.0, 0.0),  # %
+    "rolling_power": (0.5, 0.02),  # W
+    "rolling_current": (0.005, 0.02),  # A
+    "switch": (0.0, 0.0),
+    "switch_latency": (0.0, 0.0),  # ms
+    "metric": (0.0, 0.0),
+    "appliance": (0.0, 0.0),
+}
+# Publish intervals per entity in seconds: (minimum, maximum), None uses the options flow value.
+# Switch and appliance states are never delayed, slow-moving values get a longer heartbeat.
+STATE_FILTER_PUBLISH_INTERVALS: dict[str, tuple[float | None, float | None]] = {
+    "power": (None, None),
+    "voltage": (None, 900),
+    "current": (None, None),
+    "frequency": (None, 900),
+    "power_factor": (None, None),
+    "energy": (None, None),
+    "adapter_utilization": (30, None),
+    "rolling_power": (None, None),
+    "rolling_current": (None, None),
+    "switch": (0, None),
+    "switch_latency": (0, None),
+    "metric": (30, None),
+    "appliance": (0, None),
+}
+
+# Device-side consumption history
+# Imported after every reconnect and at least this often (the device keeps the last 24 hours)
+HISTORY_IMPORT_INTERVAL = timedelta(hours=6)
+
+# Energy total (integrated from the device counter and power samples)
+ENERGY_STORAGE_VERSION = 1
+# Written on this schedule and right away after a wrap or reset
+ENERGY_SAVE_INTERVAL = timedelta(seconds=60)
+ENERGY_INTEGRATION_MAX_GAP = 300.0  # seconds, power isn't integrated across longer gaps between samples
+# A counter drop from within this many Wh of the counter width to below it is a wrap, anything else a reset
+ENERGY_WRAP_MARGIN = 1000  # Wh
+# ...and only if the Wh across the wrap fit the power measured since the previous sample (within this factor),
+# plus the counter resolution, otherwise the plug restarted near the top of the range
+ENERGY_WRAP_POWER_TOLERANCE = 1.5
+ENERGY_WRAP_SLACK = 2  # Wh
+
+# Power protection: the plug switches its outlet off when the load exceeds the limit
+POWER_LIMIT_MAX = 3680  # Watts, 16 A at 230 V
+EVENT_OVERLOAD = f"{DOMAIN}_overload"
+# The plug doesn't say why its outlet turned off. Only a cutoff after a load close to the limit is an overload,
+# and not when an off-timer stored on the plug was due since the previous sample
+OVERLOAD_POWER_RATIO = 0.9
+OVERLOAD_TIMER_MARGIN = 60.0  # seconds, allowed drift of the plug clock
+
+# Plug clock and timers
+CLOCK_SYNC_INTERVAL = timedelta(hours=24)  # the clock is also synced after every reconnect
+SCHEDULE_SLOTS = 12  # timers the plug stores
+SCHEDULE_STORAGE_VERSION = 1
+
+# Services
+SERVICE_IMPORT_HISTORY = "import_history"
+SERVICE_GET_ROLLING_STATISTICS = "get_rolling_statistics"
+SERVICE_SET_OUTLETS = "set_outlets"
+SERVICE_PUSH_SCHEDULE = "push_schedule"
+SERVICE_CAPTURE_BURST = "capture_burst"
+
+# Rolling aggregates (options flow), window lengths in seconds
+CONF_AGGREGATE_WINDOWS = "aggregate_windows"
+AGGREGATE_WINDOW_CHOICES = {"60": "1 minute", "300": "5 minutes", "900": "15 minutes", "3600": "1 hour"}
+DEFAULT_AGGREGATE_WINDOWS = ["60", "300"]
+# The sample buffer holds the longest window at up to one sample per this many seconds
+SAMPLE_BUFFER_MIN_SPACING = 1.0  # seconds
+
+# Diagnostics
+DIAGNOSTICS_FRAME_RING = 100  # most recent raw frames (sent and received) kept per device
+LATENCY_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+METRICS_RATE_WINDOW = 60.0  # seconds
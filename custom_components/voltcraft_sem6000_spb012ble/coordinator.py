@@ -1,24 +1,116 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, cast
 
 from bleak import BleakClient, BleakGATTCharacteristic
+from bleak.backends.device import BLEDevice
 from bleak.exc import BleakError
+from bleak_retry_connector import BleakNotFoundError, establish_connection
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components import bluetooth
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH, DeviceInfo
 from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import COMMAND_UUID, DEVICE_NAME, DOMAIN, NOTIFY_UUID, SCAN_INTERVAL
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_POWER_CHANGE_ABS,
+    ADAPTIVE_POWER_CHANGE_REL,
+    CLOCK_SYNC_INTERVAL,
+    COMMAND_UUID,
+    CONF_ADAPTIVE_POLLING,
+    CONF_AGGREGATE_WINDOWS,
+    CONF_APPLIANCE_END_DELAY,
+    CONF_APPLIANCE_THRESHOLD,
+    CONF_CONNECTION_MODE,
+    CONF_IDLE_TIMEOUT,
+    CONF_MAX_INTERVAL,
+    CONF_MAX_PUBLISH_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MIN_PUBLISH_INTERVAL,
+    CONF_STATE_FILTER,
+    CONNECTION_MODE_ON_DEMAND,
+    CONNECTION_SLOT_TIMEOUT,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_AGGREGATE_WINDOWS,
+    DEFAULT_APPLIANCE_END_DELAY,
+    DEFAULT_APPLIANCE_THRESHOLD,
+    DEFAULT_CONNECTION_MODE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MAX_PUBLISH_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MIN_PUBLISH_INTERVAL,
+    DEFAULT_STATE_FILTER,
+    DEVICE_NAME,
+    DOMAIN,
+    ENERGY_SAVE_INTERVAL,
+    ENERGY_STORAGE_VERSION,
+    EVENT_APPLIANCE,
+    EVENT_OVERLOAD,
+    HISTORY_IMPORT_INTERVAL,
+    HISTORY_RESPONSE_TIMEOUT,
+    LIVE_POLL_INTERVAL,
+    NOTIFY_UUID,
+    OVERLOAD_POWER_RATIO,
+    OVERLOAD_TIMER_MARGIN,
+    PATH_EVALUATION_INTERVAL,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    RESPONSE_TIMEOUT,
+    SAMPLE_BUFFER_MIN_SPACING,
+    SCAN_INTERVAL,
+    SCHEDULE_STORAGE_VERSION,
+    STALL_POLL_LIMIT,
+    STATE_FILTER_DEADBANDS,
+    STATE_FILTER_PUBLISH_INTERVALS,
+    SWITCH_RESPONSE_TIMEOUT,
+)
+from .aggregates import RollingStats, RollingWindow, SampleBuffer
+from .appliance import ApplianceDetector
+from .burst import BurstBuffer
+from .command_queue import CommandPriority, CommandQueue
+from .energy import EnergyIntegrator, energy_storage_key
+from .history import async_import_hourly_history
+from .metrics import DeviceMetrics
+from .path_selection import PathSelector
 from .protocol import (
     Command,
+    FrameDecoder,
+    HourlyHistoryNotifyPayload,
     MeasureNotifyPayload,
-    NotifyPayload,
+    ParsedNotifyPayload,
+    PowerLimitNotifyPayload,
+    ScheduleAction,
+    ScheduleEntry,
+    ScheduleNotifyPayload,
     SwitchModes,
     SwitchNotifyPayload,
+    TimeSyncNotifyPayload,
+    build_hourly_history_request,
+    build_power_limit_request,
+    build_schedule_request,
+    build_time_sync_request,
 )
+from .scheduler import AdapterScheduler, async_get_scheduler
+from .state_filter import Deadband, StateFilter
+from .timers import entry_as_dict, entry_from_dict, schedule_storage_key, timer_due
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,7 +125,8 @@ class VoltcraftData:
     current: float  # Amps (converted from mA)
     frequency: int  # Hz
     power_factor: float | None  # 0.0 - 1.0, calculated from P/(V*I)
-    consumed_energy: float  # kWh (converted from Wh)
+    consumed_energy: float  # kWh (converted from Wh), the raw device counter
+    total_energy: float | None = None  # kWh, monotonic total (device counter wraps and resets removed)
 
     @staticmethod
     def from_payload(payload: MeasureNotifyPayload) -> VoltcraftData:
@@ -60,25 +153,128 @@ class VoltcraftData:
         )
 
 
+def _adapter_source(ble_device: BLEDevice | None) -> str:
+    """Return the source (adapter or proxy) Home Assistant uses to reach the device."""
+    if ble_device is None:
+        return "default"
+    details = ble_device.details
+    if isinstance(details, dict) and isinstance(source := details.get("source"), str):
+        return source
+    return "default"
+
+
 class VoltcraftDataUpdateCoordinator(DataUpdateCoordinator[VoltcraftData | None]):
+    config_entry: ConfigEntry
+
     def __init__(
         self,
         hass: HomeAssistant,
-        client: BleakClient,
-        mac: str,
-        device_name: str | None,
+        entry: ConfigEntry,
+        ble_device: BLEDevice | None,
     ) -> None:
+        mac = entry.data[CONF_MAC]
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=f"{DOMAIN}_{mac}",
             update_interval=SCAN_INTERVAL,
         )
-        self.client = client
+        self.client: BleakClient | None = None
         self.mac = format_mac(mac)
-        self._device_name = device_name
+        self._address = mac
+        # None while the plug hasn't been seen advertising since Home Assistant started
+        self._ble_device = ble_device
+        self._device_name = ble_device.name if ble_device else entry.title
         self._latest_data: VoltcraftData | None = None
 
+        # Adaptive polling
+        options = entry.options
+        self._adaptive_polling: bool = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self._min_interval = timedelta(seconds=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL))
+        self._max_interval = timedelta(seconds=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL))
+        if self._adaptive_polling:
+            self.update_interval = self._min_interval
+
+        # Measurement subscribers, polling runs at the live interval while any live stream is subscribed
+        self._measurement_subscribers: list[Callable[[float, VoltcraftData], None]] = []
+        self._live_subscribers = 0
+
+        # Entry id of the group polling this plug together with the other members, None when polling alone
+        self.group: str | None = None
+        self._burst: BurstBuffer | None = None  # running burst capture
+
+        # Recent samples and rolling aggregates, by window length in seconds
+        windows = sorted(int(window) for window in options.get(CONF_AGGREGATE_WINDOWS, DEFAULT_AGGREGATE_WINDOWS))
+        self.samples = SampleBuffer(max(1, int(max(windows, default=0) / SAMPLE_BUFFER_MIN_SPACING)))
+        self.rolling_windows: dict[int, RollingWindow] = {window: self.samples.add_window(window) for window in windows}
+
+        # Appliance cycles (idle / running / finished) detected on the power signal
+        self.appliance = ApplianceDetector(
+            options.get(CONF_APPLIANCE_THRESHOLD, DEFAULT_APPLIANCE_THRESHOLD),
+            options.get(CONF_APPLIANCE_END_DELAY, DEFAULT_APPLIANCE_END_DELAY),
+        )
+
+        # On-demand connections are opened for each request and closed after the idle timeout
+        self._on_demand = options.get(CONF_CONNECTION_MODE, DEFAULT_CONNECTION_MODE) == CONNECTION_MODE_ON_DEMAND
+        self._idle_timeout: float = options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        self._connection_users = 0
+        self._cancel_idle_disconnect: CALLBACK_TYPE | None = None
+
+        # Connection supervisor state
+        self._connect_lock = asyncio.Lock()
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._reconnect_attempt = 0
+        self._shutting_down = False
+        self._polls_without_measure = 0
+
+        # Reassembles frames from the notification stream of the current connection
+        self._decoder = FrameDecoder()
+
+        # Serializes all writes to the device and matches answers to them
+        self._queue = CommandQueue(self._async_write, self._command_slot)
+        self.last_round_trip: float | None = None  # seconds
+        self.last_switch_latency: float | None = None  # seconds from the switch command to the confirmed state
+        self.metrics = DeviceMetrics()
+
+        # Monotonic energy total, its offset survives restarts
+        self.energy = EnergyIntegrator()
+        self._energy_store: Store[dict[str, Any]] = Store(
+            hass, ENERGY_STORAGE_VERSION, energy_storage_key(entry.entry_id)
+        )
+        self._energy_saved: dict[str, Any] | None = None  # last written state
+        self._cancel_energy_save: CALLBACK_TYPE | None = None
+
+        # Device-side consumption history
+        self._history_task: asyncio.Task[None] | None = None
+        self._history_fetched_at: float | None = None  # monotonic
+
+        # Settings kept on the plug, synced in the background after polls. The plug can't report its power
+        # limit, so the last value set from Home Assistant is sent again after a restart and whenever the
+        # plug lost power. The clock is synced after every reconnect and at least once a day.
+        self._settings_task: asyncio.Task[None] | None = None
+        self.power_limit: int | None = None  # Watts, 0 when disabled
+        self._power_limit_synced = True
+        self._clock_synced_at: float | None = None  # monotonic
+        self.schedule: list[ScheduleEntry] = []  # timers on the plug, by slot
+        self._schedule_store: Store[list[dict[str, Any]]] = Store(
+            hass, SCHEDULE_STORAGE_VERSION, schedule_storage_key(entry.entry_id)
+        )
+
+        # Plug-side overload cutoff
+        self._switch_commands = 0  # in flight, an outlet turning off meanwhile is no overload cutoff
+        self.overload_tripped = False
+        self.last_overload: dict[str, Any] | None = None
+
+        # Link quality per adapter or proxy, to move away from a degraded path
+        self.paths = PathSelector()
+        # Monotonic, the first check waits a full interval so the paths have samples to be judged on
+        self._path_checked_at = time.monotonic()
+
+        # Shared adapter scheduling
+        self._scheduler: AdapterScheduler = async_get_scheduler(hass, _adapter_source(ble_device))
+        self._unregister_scheduler = self._scheduler.async_register(self.mac)
+
     @property
     def device_info(self) -> DeviceInfo:
         return DeviceInfo(
@@ -87,55 +283,857 @@ class VoltcraftDataUpdateCoordinator(DataUpdateCoordinator[VoltcraftData | None]
             name=self._device_name or DEVICE_NAME,
         )
 
+    @property
+    def is_connected(self) -> bool:
+        return self.client is not None and self.client.is_connected
+
+    @property
+    def scheduler(self) -> AdapterScheduler:
+        return self._scheduler
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting to be written."""
+        return len(self._queue)
+
+    @property
+    def commands_coalesced(self) -> int:
+        return self._queue.coalesced
+
+    @property
+    def connection_info(self) -> dict[str, Any]:
+        return {
+            "connected": self.is_connected,
+            "on_demand": self._on_demand,
+            "adapter": self._scheduler.source,
+            "reconnect_attempt": self._reconnect_attempt,
+            "polls_without_measure": self._polls_without_measure,
+            "update_interval": self.update_interval.total_seconds() if self.update_interval else None,
+            "live_subscribers": self._live_subscribers,
+            "group": self.group,
+        }
+
+    @property
+    def evictable(self) -> bool:
+        """Return True if the connection is an idle on-demand one (its adapter slot may be reused)."""
+        return self._on_demand and not self._connection_users
+
+    def create_state_filter(self, key: str) -> StateFilter | None:
+        """Return the state filter for an entity, or None if state filtering is disabled."""
+        options = self.config_entry.options
+        if not options.get(CONF_STATE_FILTER, DEFAULT_STATE_FILTER):
+            return None
+
+        absolute, relative = STATE_FILTER_DEADBANDS[key]
+        min_interval, max_interval = STATE_FILTER_PUBLISH_INTERVALS[key]
+        return StateFilter(
+            Deadband(absolute, relative),
+            min_interval=(
+                options.get(CONF_MIN_PUBLISH_INTERVAL, DEFAULT_MIN_PUBLISH_INTERVAL)
+                if min_interval is None
+                else min_interval
+            ),
+            max_interval=(
+                options.get(CONF_MAX_PUBLISH_INTERVAL, DEFAULT_MAX_PUBLISH_INTERVAL)
+                if max_interval is None
+                else max_interval
+            ),
+        )
+
+    async def _async_save_energy(self, _now: datetime | None = None) -> None:
+        if self.energy.last_counter is None:
+            return
+        data = self.energy.as_dict()
+        if data == self._energy_saved:
+            return
+        self._energy_saved = data
+        await self._energy_store.async_save(data)
+
+    def rolling_stats(self, window: int) -> RollingStats | None:
+        return self.rolling_windows[window].stats(time.monotonic())
+
     async def async_setup(self) -> None:
-        await self.client.start_notify(NOTIFY_UUID, self._handle_notify)
+        """Load the stored state, without touching the device."""
+        if (stored := await self._energy_store.async_load()) is not None:
+            self.energy = EnergyIntegrator.from_dict(stored)
+            self._energy_saved = stored
+        # On a fixed schedule, a debounced save would be pushed back by every sample until shutdown
+        self._cancel_energy_save = async_track_time_interval(
+            self.hass, self._async_save_energy, ENERGY_SAVE_INTERVAL, name=f"{self.name} energy save"
+        )
+        if (timers := await self._schedule_store.async_load()) is not None:
+            self.schedule = [entry_from_dict(timer) for timer in timers]
+
+    async def async_start(self) -> None:
+        """Connect and fetch the first measurement, runs in the background so setup never waits for the plug.
+
+        On-demand mode connects on the first poll, a failed persistent connection is retried by the
+        reconnect loop.
+        """
+        if not self._on_demand:
+            try:
+                await self._async_connect()
+            except (BleakError, TimeoutError) as err:
+                _LOGGER.debug("%s: Initial connection failed: %s", self.name, err)
+                self._schedule_reconnect()
+                return
+        await self.async_refresh()
 
     async def async_shutdown(self) -> None:
+        self._shutting_down = True
+        for task in (self._reconnect_task, self._history_task, self._settings_task):
+            if task is not None:
+                task.cancel()
+        self._reconnect_task = self._history_task = self._settings_task = None
+        self._queue.cancel()
+        self._cancel_idle_timer()
+        if self._cancel_energy_save is not None:
+            self._cancel_energy_save()
+            self._cancel_energy_save = None
+
+        await super().async_shutdown()
+        self._unregister_scheduler()
+        await self._async_save_energy()
+        self._scheduler.release_connection(self.mac)
+
+        client, self.client = self.client, None
+        if client is None:
+            return
+
         try:
-            await self.client.stop_notify(NOTIFY_UUID)
+            await client.stop_notify(NOTIFY_UUID)
         except BleakError as err:
             _LOGGER.debug("Error stopping notifications: %s", err)
 
         try:
-            await self.client.disconnect()
+            await client.disconnect()
+        except BleakError as err:
+            _LOGGER.debug("Error disconnecting client: %s", err)
+
+    @callback
+    def _get_ble_device(self) -> BLEDevice | None:
+        """Return the freshest BLEDevice known for the plug (it may have moved to another adapter).
+
+        While the connection is moved to another path, the BLEDevice as seen by that path's scanner.
+        """
+        ble_device = None
+        if (target := self.paths.target) is not None:
+            ble_device = next(
+                (
+                    device.ble_device
+                    for device in bluetooth.async_scanner_devices_by_address(self.hass, self._address, connectable=True)
+                    if device.scanner.source == target
+                ),
+                None,
+            )
+        if ble_device is None:
+            ble_device = bluetooth.async_ble_device_from_address(self.hass, self._address, connectable=True)
+        if ble_device is not None:
+            self._ble_device = ble_device
+        return self._ble_device
+
+    async def _async_connect(self) -> None:
+        """Connect to the device and subscribe to notifications."""
+        async with self._connect_lock:
+            if self.is_connected:
+                return
+
+            ble_device = self._get_ble_device()
+            if ble_device is None:
+                raise BleakNotFoundError(f"{self.name}: Device is not advertising")
+            self._update_scheduler(ble_device)
+
+            async with asyncio.timeout(CONNECTION_SLOT_TIMEOUT):
+                await self._scheduler.async_acquire_connection(self.mac, self, pinned=not self._on_demand)
+            try:
+                client = await self._async_establish_client(ble_device)
+            except BaseException:
+                self._scheduler.release_connection(self.mac)
+                raise
+
+            # Frames split across notifications must not be completed with data from another connection
+            self._decoder = FrameDecoder()
+            try:
+                await client.start_notify(NOTIFY_UUID, self._handle_notify)
+            except BleakError:
+                self._scheduler.release_connection(self.mac)
+                await client.disconnect()
+                raise
+
+            self.client = client
+            self._polls_without_measure = 0
+            self._record_path()
+
+    @callback
+    def _record_path(self) -> None:
+        """Record the path of a new connection, and whether a move to another path reached its target."""
+        target = self.paths.target
+        active = self._active_source()
+        source = active or self._scheduler.source
+        if not self.paths.connected(source, time.monotonic(), verified=active is not None):
+            # Home Assistant's connection path scoring doesn't follow the BLEDevice passed in
+            _LOGGER.info(
+                "%s: Connected through %s instead of %s, not moving the connection again for a while",
+                self.name,
+                active or "an unknown path",
+                target,
+            )
+        _LOGGER.debug("%s: Connected through %s", self.name, source)
+
+    @callback
+    def _active_source(self) -> str | None:
+        """Return the adapter or proxy holding the connection slot of the plug, None if no adapter reports it."""
+        try:
+            allocations = bluetooth.async_current_allocations(self.hass)
+        except RuntimeError:
+            # Bluetooth isn't set up (e.g. the benchmark harness)
+            return None
+        address = self._address.upper()
+        for allocation in allocations or ():
+            if any(allocated.upper() == address for allocated in allocation.allocated):
+                return allocation.source
+        return None
+
+    async def _async_establish_client(self, ble_device: BLEDevice) -> BleakClient:
+        return await establish_connection(
+            BleakClient,
+            ble_device,
+            self.name,
+            disconnected_callback=self._handle_disconnect,
+            ble_device_callback=lambda: self._get_ble_device() or ble_device,
+        )
+
+    @callback
+    def _update_scheduler(self, ble_device: BLEDevice) -> None:
+        """Move to another adapter's scheduler if the device is now reached through a different adapter."""
+        source = _adapter_source(ble_device)
+        if source == self._scheduler.source:
+            return
+
+        _LOGGER.debug("%s: Now using adapter %s (was %s)", self.name, source, self._scheduler.source)
+        self._scheduler.release_connection(self.mac)
+        self._unregister_scheduler()
+        self._scheduler = async_get_scheduler(self.hass, source)
+        self._unregister_scheduler = self._scheduler.async_register(self.mac)
+
+    @callback
+    def _handle_disconnect(self, client: BleakClient) -> None:
+        """Handle an unexpected disconnect reported by bleak."""
+        if client is not self.client:
+            # Stale client (already replaced or shut down)
+            return
+
+        _LOGGER.debug("%s: Disconnected", self.name)
+        self.metrics.disconnects += 1
+        self.client = None
+        self._scheduler.release_connection(self.mac)
+        self._queue.fail_all(BleakError(f"{self.name} disconnected"))
+        self._schedule_reconnect()
+
+    @callback
+    def _schedule_reconnect(self) -> None:
+        if self._on_demand:
+            # Connected again by the next request
+            return
+        if self._shutting_down or (self._reconnect_task is not None and not self._reconnect_task.done()):
+            return
+
+        self._reconnect_task = self.hass.async_create_background_task(
+            self._async_reconnect_loop(),
+            f"{self.name} reconnect",
+        )
+
+    async def _async_reconnect_loop(self) -> None:
+        """Reconnect with exponential backoff and full jitter until it succeeds."""
+        while not self._shutting_down:
+            backoff = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_MIN * 2**self._reconnect_attempt)
+            delay = random.uniform(RECONNECT_BACKOFF_MIN, backoff)
+            self._reconnect_attempt += 1
+            _LOGGER.debug("%s: Reconnecting in %.1f s (attempt %d)", self.name, delay, self._reconnect_attempt)
+            await asyncio.sleep(delay)
+
+            try:
+                await self._async_connect()
+            except (BleakError, TimeoutError) as err:
+                _LOGGER.debug("%s: Reconnect failed: %s", self.name, err)
+                continue
+
+            _LOGGER.info("%s: Reconnected after %d attempt(s)", self.name, self._reconnect_attempt)
+            self.metrics.reconnects += 1
+            self._reconnect_attempt = 0
+            # Fill the gap the outage left in the energy statistics and resync the clock on the next poll
+            self._history_fetched_at = None
+            self._clock_synced_at = None
+            await self.async_request_refresh()
+            return
+
+    async def _async_drop_connection(self) -> None:
+        """Tear down a connection that is no longer usable and start reconnecting."""
+        client, self.client = self.client, None
+        self._scheduler.release_connection(self.mac)
+        self._queue.fail_all(BleakError(f"{self.name} connection dropped"))
+        if client is not None:
+            try:
+                await client.disconnect()
+            except BleakError as err:
+                _LOGGER.debug("Error disconnecting client: %s", err)
+        self._schedule_reconnect()
+
+    @asynccontextmanager
+    async def _async_connection(self) -> AsyncIterator[None]:
+        """Keep the device connected while a request runs, connecting first in on-demand mode.
+
+        Raises BleakError (or TimeoutError) if the device can't be reached.
+        """
+        self._connection_users += 1
+        self._cancel_idle_timer()
+        try:
+            if not self.is_connected and not self._on_demand and self._connect_lock.locked():
+                # A connection attempt (startup or reconnect) is running, wait for its outcome
+                async with self._connect_lock:
+                    pass
+            if self.is_connected:
+                self._scheduler.touch_connection(self.mac)
+            elif self._on_demand:
+                await self._async_connect()
+            else:
+                self._schedule_reconnect()
+                raise BleakError(f"{self.name} is not connected")
+            yield
+        finally:
+            self._connection_users -= 1
+            if self._on_demand and not self._connection_users and not self._shutting_down:
+                self._cancel_idle_disconnect = async_call_later(
+                    self.hass, self._idle_timeout, self._async_idle_disconnect
+                )
+
+    @callback
+    def _cancel_idle_timer(self) -> None:
+        if self._cancel_idle_disconnect is not None:
+            self._cancel_idle_disconnect()
+            self._cancel_idle_disconnect = None
+
+    async def _async_idle_disconnect(self, _now: datetime) -> None:
+        self._cancel_idle_disconnect = None
+        if self._connection_users:
+            return
+        _LOGGER.debug("%s: Idle, disconnecting", self.name)
+        await self._async_close_connection()
+
+    async def async_evict(self) -> None:
+        """Close the idle on-demand connection, its adapter slot was given to another plug."""
+        self._cancel_idle_timer()
+        _LOGGER.debug("%s: Disconnecting to free the adapter slot", self.name)
+        await self._async_close_connection()
+
+    async def _async_close_connection(self) -> None:
+        # Cleared first, the disconnect callback ignores clients that are no longer current
+        client, self.client = self.client, None
+        self._scheduler.release_connection(self.mac)
+        if client is None:
+            return
+        try:
+            await client.disconnect()
         except BleakError as err:
             _LOGGER.debug("Error disconnecting client: %s", err)
 
     async def _async_update_data(self) -> VoltcraftData | None:
         """Fetch data from the device.
 
-        This sends a measure command and returns the latest data.
-        The actual data update happens asynchronously via a notification handler.
+        This sends a measure command and waits for the matching MEASURE notification,
+        which the notification handler hands over through the command queue.
         """
+        self.metrics.polls += 1
+
+        if self._polls_without_measure >= STALL_POLL_LIMIT:
+            # Writes may still succeed while notifications have silently stopped
+            _LOGGER.warning(
+                "%s: No measurement received for %d polls, reconnecting",
+                self.name,
+                self._polls_without_measure,
+            )
+            await self._async_drop_connection()
+            self._record_poll_failure()
+            raise UpdateFailed("Device stopped sending measurements")
 
+        if self.group is None:
+            # Group members are polled at the same moment on purpose
+            await self._scheduler.async_wait_poll_turn(self.update_interval or SCAN_INTERVAL)
         try:
-            await self.client.write_gatt_char(COMMAND_UUID, Command.MEASURE.build_payload())
-        except BleakError as err:
+            async with self._async_connection():
+                started = time.monotonic()
+                try:
+                    await self._queue.async_request(
+                        Command.MEASURE.build_payload(), Command.MEASURE, CommandPriority.POLL, RESPONSE_TIMEOUT
+                    )
+                except TimeoutError as err:
+                    self._polls_without_measure += 1
+                    self._record_poll_failure()
+                    raise UpdateFailed(
+                        f"Device did not answer the measure command within {RESPONSE_TIMEOUT} s"
+                    ) from err
+        except (BleakError, TimeoutError) as err:
+            self._record_poll_failure()
             raise UpdateFailed(f"Failed to send measure command: {err}") from err
 
+        self.last_round_trip = time.monotonic() - started
+        self.metrics.poll_round_trip.observe(self.last_round_trip * 1000)
+        self.paths.record_poll(self.last_round_trip)
+        self._check_path()
+        _LOGGER.debug("%s: Measure round trip %.0f ms", self.name, self.last_round_trip * 1000)
+
+        if self._history_due():
+            self._schedule_history_import()
+        if self._settings_due():
+            self._schedule_settings_sync()
+
         return self._latest_data
 
+    @callback
+    def _record_poll_failure(self) -> None:
+        self.metrics.poll_failures += 1
+        self.paths.record_poll(None)
+        self._check_path()
+
+    @callback
+    def scanner_rssi(self) -> dict[str, int]:
+        """Return the signal strength of the plug as heard by every connectable adapter and proxy."""
+        return {
+            device.scanner.source: device.advertisement.rssi
+            for device in bluetooth.async_scanner_devices_by_address(self.hass, self._address, connectable=True)
+        }
+
+    @callback
+    def _check_path(self) -> None:
+        """Move the connection when another adapter or proxy offers a clearly better path."""
+        now = time.monotonic()
+        if now - self._path_checked_at < PATH_EVALUATION_INTERVAL or not self.is_connected:
+            return
+        self._path_checked_at = now
+
+        rssi_by_source = self.scanner_rssi()
+        if (target := self.paths.better_path(rssi_by_source, now)) is None:
+            return
+
+        _LOGGER.info(
+            "%s: Link through %s is degraded, reconnecting through %s (RSSI %d dBm)",
+            self.name,
+            self.paths.current,
+            target,
+            rssi_by_source[target],
+        )
+        self.paths.migrate(target)
+        # The reconnect asks for the target's BLEDevice and checks where the connection ended up
+        self.hass.async_create_background_task(self._async_drop_connection(), f"{self.name} path migration")
+
+    async def _async_write(self, frame: bytes) -> None:
+        client = self.client
+        if client is None or not client.is_connected:
+            raise BleakError(f"{self.name} is not connected")
+        started = time.monotonic()
+        await client.write_gatt_char(COMMAND_UUID, frame)
+        self.metrics.record_write(frame, time.monotonic() - started)
+
+    def _command_slot(self) -> AbstractAsyncContextManager[None]:
+        # Looked up on every command, the device may have moved to another adapter
+        return self._scheduler.async_command_slot()
+
+    async def async_fetch_history(self) -> HourlyHistoryNotifyPayload:
+        """Download the hourly consumption history stored on the device."""
+        try:
+            async with self._async_connection():
+                payload = await self._queue.async_request(
+                    build_hourly_history_request(),
+                    Command.HOURLY_HISTORY,
+                    CommandPriority.BACKGROUND,
+                    HISTORY_RESPONSE_TIMEOUT,
+                )
+        except (BleakError, TimeoutError) as err:
+            raise HomeAssistantError(f"Failed to fetch consumption history from {self.name}: {err}") from err
+
+        return cast(HourlyHistoryNotifyPayload, payload)
+
+    async def async_import_history(self) -> int:
+        """Fetch the device history and import it into long-term statistics, returns the imported hours."""
+        payload = await self.async_fetch_history()
+        self._history_fetched_at = time.monotonic()
+        return await async_import_hourly_history(
+            self.hass,
+            self.mac,
+            self._device_name or DEVICE_NAME,
+            payload.hourly_energy,
+            dt_util.utcnow(),
+        )
+
+    def _history_due(self) -> bool:
+        if "recorder" not in self.hass.config.components:
+            return False
+        return self._history_fetched_at is None or (
+            time.monotonic() - self._history_fetched_at >= HISTORY_IMPORT_INTERVAL.total_seconds()
+        )
+
+    @callback
+    def _schedule_history_import(self) -> None:
+        if self._shutting_down or (self._history_task is not None and not self._history_task.done()):
+            return
+
+        self._history_task = self.hass.async_create_background_task(
+            self._async_background_history_import(),
+            f"{self.name} history import",
+        )
+
+    async def _async_background_history_import(self) -> None:
+        try:
+            hours = await self.async_import_history()
+        except HomeAssistantError as err:
+            _LOGGER.debug("%s: History import failed: %s", self.name, err)
+            return
+        _LOGGER.debug("%s: Imported %d hour(s) of consumption history", self.name, hours)
+
     async def _handle_notify(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
         """Handle notifications from the device."""
-        _LOGGER.debug("Received notification: %s", data.hex())
-        payload = NotifyPayload.from_payload(data)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Received notification: %s", self.name, data.hex())
+        self.metrics.record_notification(bytes(data))
 
+        decoder = self._decoder
+        unknown_frames = decoder.unknown_frames
+        for payload in decoder.feed(data):
+            self._handle_payload(payload)
+
+        if decoder.unknown_frames != unknown_frames:
+            self.metrics.unknown_frames += decoder.unknown_frames - unknown_frames
+            _LOGGER.debug("%s: Unknown payload received: %s", self.name, data.hex())
+
+    @callback
+    def _handle_payload(self, payload: ParsedNotifyPayload) -> None:
         match payload:
             case MeasureNotifyPayload():
-                self._latest_data = VoltcraftData.from_payload(payload)
-                self.async_set_updated_data(self._latest_data)
+                self._polls_without_measure = 0
+                timestamp = time.time()
+                previous_sample_at = self.metrics.last_sample_at
+                self.metrics.last_sample_at = timestamp
+                sample = VoltcraftData.from_payload(payload)
+                now = time.monotonic()
+                resets, wraps = self.energy.resets, self.energy.wraps
+                sample.total_energy = self.energy.update(now, sample.power, payload.consumed_energy) / 1000.0
+                if (self.energy.resets, self.energy.wraps) != (resets, wraps):
+                    # The new offset must survive a crash, or the total goes backwards after a restart
+                    self.hass.async_create_background_task(self._async_save_energy(), f"{self.name} energy save")
+                if self.energy.resets != resets:
+                    # The plug lost power, its clock is gone and it may have forgotten its settings as well
+                    self._clock_synced_at = None
+                    self._power_limit_synced = self.power_limit is None
+                self._detect_overload(self._latest_data, sample, previous_sample_at)
+                self._adapt_poll_interval(self._latest_data, sample)
+                self._latest_data = sample
+                if self.rolling_windows:
+                    self.samples.append(now, sample.power, sample.voltage, sample.current)
+                self._detect_appliance_cycle(timestamp, sample)
+                for subscriber in self._measurement_subscribers:
+                    subscriber(timestamp, sample)
+
+                if not self._queue.resolve(Command.MEASURE, payload):
+                    # Not an answer to our poll (the refresh publishes those)
+                    self.async_set_updated_data(sample)
 
             case SwitchNotifyPayload():
-                # Switch state changed, trigger immediate measure to update data
-                self.hass.create_task(self.async_request_refresh())
+                self._tighten_poll_interval()
+                if not self._queue.resolve(Command.SWITCH, payload):
+                    # Not an answer to our switch command, trigger a measure to update data
+                    self.hass.create_task(self.async_request_refresh())
+
+            case PowerLimitNotifyPayload():
+                self._queue.resolve(Command.POWER_LIMIT, payload)
+
+            case TimeSyncNotifyPayload():
+                self._queue.resolve(Command.TIME_SYNC, payload)
+
+            case ScheduleNotifyPayload():
+                self._queue.resolve(Command.SCHEDULE, payload)
+
+            case HourlyHistoryNotifyPayload():
+                self._queue.resolve(Command.HOURLY_HISTORY, payload)
+
+    @callback
+    def _detect_overload(
+        self, previous: VoltcraftData | None, current: VoltcraftData, previous_sample_at: float | None
+    ) -> None:
+        """Report an outlet that turned off by itself after a load close to the power limit.
+
+        Only a limit the plug holds counts (not one restored after a restart and not sent yet). Switch
+        commands in flight and off-timers stored on the plug that were due since the previous sample are
+        not overloads. Pressing the button on the plug while the load is close to the limit still is
+        reported as one, the plug doesn't tell the difference.
+        """
+        if current.is_on:
+            self.overload_tripped = False
+            return
+        if previous is None or not previous.is_on or self._switch_commands:
+            return
+        if not self.power_limit or not self._power_limit_synced:
+            return
+        if previous.power < self.power_limit * OVERLOAD_POWER_RATIO:
+            return
+        if previous_sample_at is not None and timer_due(
+            self.schedule,
+            False,
+            dt_util.as_local(dt_util.utc_from_timestamp(previous_sample_at - OVERLOAD_TIMER_MARGIN)),
+            dt_util.now(),
+        ):
+            _LOGGER.debug("%s: Outlet switched off by a timer", self.name)
+            return
+
+        self.overload_tripped = True
+        self.last_overload = {
+            "time": dt_util.utcnow().isoformat(),
+            "power_limit": self.power_limit,
+            "last_power": previous.power,
+        }
+        _LOGGER.warning(
+            "%s: Outlet switched off by the power protection (limit %d W, last measured %.1f W)",
+            self.name,
+            self.power_limit,
+            previous.power,
+        )
+        self._fire_event(EVENT_OVERLOAD, self.last_overload)
+
+    @callback
+    def _fire_event(self, event_type: str, data: dict[str, Any]) -> None:
+        device = dr.async_get(self.hass).async_get_device(identifiers={(DOMAIN, self.mac)})
+        self.hass.bus.async_fire(event_type, {"device_id": device.id if device else None, "mac": self.mac, **data})
+
+    @callback
+    def _detect_appliance_cycle(self, timestamp: float, sample: VoltcraftData) -> None:
+        if (event := self.appliance.update(timestamp, sample.power, sample.is_on)) is None:
+            return
 
-            case None:
-                _LOGGER.warning("Unknown payload received: %s", data.hex())
+        cycle = self.appliance.cycle or self.appliance.last_cycle
+        _LOGGER.debug("%s: Appliance %s", self.name, event.replace("_", " "))
+        self._fire_event(EVENT_APPLIANCE, {"type": event, **(cycle.as_dict() if cycle else {})})
+
+    @callback
+    def _adapt_poll_interval(self, previous: VoltcraftData | None, current: VoltcraftData) -> None:
+        """Back off while the load is stable or the outlet is off, tighten as soon as it changes."""
+        if not self._adaptive_polling or self._live_subscribers or self.group is not None:
+            return
+
+        if previous is None or previous.is_on != current.is_on:
+            self._tighten_poll_interval()
+            return
+
+        threshold = max(ADAPTIVE_POWER_CHANGE_ABS, ADAPTIVE_POWER_CHANGE_REL * max(previous.power, current.power))
+        if current.is_on and abs(current.power - previous.power) > threshold:
+            self._tighten_poll_interval()
+            return
+
+        interval = self.update_interval or self._min_interval
+        self.update_interval = min(self._max_interval, interval * ADAPTIVE_BACKOFF_FACTOR)
+
+    @callback
+    def _tighten_poll_interval(self) -> None:
+        if self._adaptive_polling and not self._live_subscribers and self.group is None:
+            self.update_interval = self._min_interval
+
+    def _base_update_interval(self) -> timedelta | None:
+        if self.group is not None:
+            # The group polls its members
+            return None
+        return self._min_interval if self._adaptive_polling else SCAN_INTERVAL
+
+    @callback
+    def join_group(self, group: str) -> None:
+        """Leave the polling to a group, which polls all its members at the same moment."""
+        self.group = group
+        if not self._live_subscribers:
+            self.update_interval = None
+
+    @callback
+    def leave_group(self, group: str) -> None:
+        if self.group != group:
+            return
+        self.group = None
+        if not self._live_subscribers and not self._shutting_down:
+            self.update_interval = self._base_update_interval()
+            self.hass.async_create_background_task(self.async_request_refresh(), f"{self.name} polling")
+
+    @callback
+    def async_subscribe_measurements(
+        self, subscriber: Callable[[float, VoltcraftData], None], live: bool = True
+    ) -> CALLBACK_TYPE:
+        """Call subscriber with every measurement (unix timestamp, data) until the returned callback is called.
+
+        Measurements bypass the state machine. While anyone is subscribed live the plug is polled at the
+        live interval, so a dashboard gets a sample every second without the entities writing more states.
+        """
+        self._measurement_subscribers.append(subscriber)
+        if live:
+            self._live_subscribers += 1
+            if self._live_subscribers == 1:
+                self.update_interval = LIVE_POLL_INTERVAL
+                # Reschedules the next poll at the live interval
+                self.hass.async_create_background_task(self.async_request_refresh(), f"{self.name} live polling")
+
+        @callback
+        def _unsubscribe() -> None:
+            self._measurement_subscribers.remove(subscriber)
+            if live:
+                self._live_subscribers -= 1
+                if not self._live_subscribers:
+                    self.update_interval = self._base_update_interval()
+
+        return _unsubscribe
 
     async def async_send_switch_command(self, mode: SwitchModes) -> None:
-        """Send a switch command to the device."""
+        """Switch the outlet and publish the confirmed state.
+
+        The SWITCH acknowledgement is followed right away by a MEASURE (not a debounced refresh), the
+        state it reports is published as soon as it arrives.
+        """
+        self._tighten_poll_interval()
+        started = time.monotonic()
+        self._switch_commands += 1
         try:
-            await self.client.write_gatt_char(COMMAND_UUID, mode.build_payload())
+            async with self._async_connection():
+                await self._queue.async_request(
+                    mode.build_payload(), Command.SWITCH, CommandPriority.CONTROL, SWITCH_RESPONSE_TIMEOUT
+                )
+                await self._queue.async_request(
+                    Command.MEASURE.build_payload(), Command.MEASURE, CommandPriority.CONTROL, RESPONSE_TIMEOUT
+                )
         except BleakError as err:
             _LOGGER.error("Failed to send switch command: %s", err)
-            raise
+            raise HomeAssistantError(f"Failed to switch {self.name}: {err}") from err
+        except TimeoutError as err:
+            # The outlet may have switched anyway, the next poll tells
+            await self.async_request_refresh()
+            raise HomeAssistantError(f"{self.name} did not confirm the switch command") from err
+        finally:
+            self._switch_commands -= 1
+
+        self.last_switch_latency = time.monotonic() - started
+        _LOGGER.debug("%s: Switch confirmed after %.0f ms", self.name, self.last_switch_latency * 1000)
+        self.async_set_updated_data(self._latest_data)
+
+    async def async_capture_burst(self, duration: float) -> BurstBuffer:
+        """Measure back to back for duration seconds, as fast as the link answers.
+
+        Every request waits for its answer before the next one is written (the plug answers MEASURE
+        commands in order, with nothing to tell two answers apart), so the rate is bound by the round
+        trip. Commands of higher priority (switching) still go first.
+        """
+        if self._burst is not None:
+            raise HomeAssistantError(f"A burst capture of {self.name} is already running")
+
+        buffer = self._burst = BurstBuffer()
+
+        @callback
+        def _collect(timestamp: float, data: VoltcraftData) -> None:
+            buffer.append(timestamp, data.is_on, data.power, data.voltage, data.current, data.frequency)
+
+        # Regular polls are answered with samples as well, they end up in the buffer too. Not live: faster
+        # regular polls would only compete with the burst requests
+        unsubscribe = self.async_subscribe_measurements(_collect, live=False)
+        buffer.started_at = time.monotonic()
+        deadline = buffer.started_at + duration
+        try:
+            async with self._async_connection():
+                while time.monotonic() < deadline and not buffer.full:
+                    buffer.requests += 1
+                    try:
+                        await self._queue.async_request(
+                            Command.MEASURE.build_payload(), Command.MEASURE, CommandPriority.POLL, RESPONSE_TIMEOUT
+                        )
+                    except TimeoutError:
+                        buffer.timeouts += 1
+        except (BleakError, TimeoutError) as err:
+            # TimeoutError from connecting, the timeouts of the requests are counted above
+            raise HomeAssistantError(f"Burst capture of {self.name} failed: {err}") from err
+        finally:
+            buffer.ended_at = time.monotonic()
+            unsubscribe()
+            self._burst = None
+
+        _LOGGER.debug("%s: Burst capture: %s", self.name, buffer.summary())
+        # Entities show the last sample of the burst
+        self.async_set_updated_data(self._latest_data)
+        return buffer
+
+    async def _async_configure(self, frame: bytes, response: Command, action: str) -> None:
+        """Send a settings command and wait for its acknowledgement."""
+        try:
+            async with self._async_connection():
+                await self._queue.async_request(frame, response, CommandPriority.CONFIG, SWITCH_RESPONSE_TIMEOUT)
+        except (BleakError, TimeoutError) as err:
+            raise HomeAssistantError(f"Failed to {action} {self.name}: {err}") from err
+
+    async def async_set_power_limit(self, watts: int) -> None:
+        """Set the load above which the plug switches its outlet off, 0 disables the protection."""
+        await self._async_configure(build_power_limit_request(watts), Command.POWER_LIMIT, "set the power limit of")
+        self.power_limit = watts
+        self._power_limit_synced = True
+        _LOGGER.debug("%s: Power limit set to %d W", self.name, watts)
+
+    @callback
+    def restore_power_limit(self, watts: int) -> None:
+        """Take over the power limit set before a restart, it is sent to the plug after the next poll."""
+        self.power_limit = watts
+        self._power_limit_synced = False
+
+    async def async_sync_clock(self) -> None:
+        """Set the plug clock to the local time of Home Assistant, the timers run on it."""
+        await self._async_configure(build_time_sync_request(dt_util.now()), Command.TIME_SYNC, "sync the clock of")
+        self._clock_synced_at = time.monotonic()
+        _LOGGER.debug("%s: Clock synced", self.name)
+
+    async def async_push_schedule(self, entries: list[ScheduleEntry]) -> None:
+        """Replace the timers on the plug, slots already in use are overwritten and the rest deleted."""
+        await self.async_sync_clock()
+        previous = len(self.schedule)
+        try:
+            for slot, entry in enumerate(entries):
+                action = ScheduleAction.EDIT if slot < len(self.schedule) else ScheduleAction.ADD
+                await self._async_configure(
+                    build_schedule_request(action, slot, entry), Command.SCHEDULE, "write a timer to"
+                )
+                if slot < len(self.schedule):
+                    self.schedule[slot] = entry
+                else:
+                    self.schedule.append(entry)
+            # From the end, slots are not renumbered
+            for slot in reversed(range(len(entries), previous)):
+                await self._async_configure(
+                    build_schedule_request(ScheduleAction.DELETE, slot), Command.SCHEDULE, "delete a timer of"
+                )
+                del self.schedule[slot]
+        finally:
+            # What the plug holds now, also after a partial update
+            await self._schedule_store.async_save([entry_as_dict(entry) for entry in self.schedule])
+        _LOGGER.debug("%s: %d timer(s) pushed", self.name, len(entries))
+
+    def _settings_due(self) -> bool:
+        return not self._power_limit_synced or self._clock_due()
+
+    def _clock_due(self) -> bool:
+        return self._clock_synced_at is None or (
+            time.monotonic() - self._clock_synced_at >= CLOCK_SYNC_INTERVAL.total_seconds()
+        )
+
+    @callback
+    def _schedule_settings_sync(self) -> None:
+        if self._shutting_down or (self._settings_task is not None and not self._settings_task.done()):
+            return
+
+        self._settings_task = self.hass.async_create_background_task(
+            self._async_sync_settings(),
+            f"{self.name} settings sync",
+        )
+
+    async def _async_sync_settings(self) -> None:
+        try:
+            if self._clock_due():
+                await self.async_sync_clock()
+            if not self._power_limit_synced and self.power_limit is not None:
+                await self.async_set_power_limit(self.power_limit)
+        except HomeAssistantError as err:
+            _LOGGER.debug("%s: Settings sync failed: %s", self.name, err)
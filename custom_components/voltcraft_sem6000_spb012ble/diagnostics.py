@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_MEMBERS, DOMAIN
+from .coordinator import VoltcraftDataUpdateCoordinator
+from .group import VoltcraftGroupCoordinator
+from .timers import entry_as_dict
+
+TO_REDACT = {CONF_MAC}
+# Member MACs of groups, also listed per round as fresh, stale or missing
+GROUP_TO_REDACT = {CONF_MAC, CONF_MEMBERS, "fresh", "stale", "missing"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    coordinator: VoltcraftDataUpdateCoordinator | VoltcraftGroupCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(coordinator, VoltcraftGroupCoordinator):
+        return {
+            "entry": {"data": async_redact_data(entry.data, GROUP_TO_REDACT)},
+            "group": async_redact_data(coordinator.as_dict(), GROUP_TO_REDACT),
+            "latest_data": async_redact_data(asdict(coordinator.data), GROUP_TO_REDACT) if coordinator.data else None,
+        }
+
+    scheduler = coordinator.scheduler
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": coordinator.connection_info,
+        "adapter": {
+            "source": scheduler.source,
+            "plugs": scheduler.member_count,
+            "connections": scheduler.connection_count,
+            "connection_evictions": scheduler.evictions,
+            "active_operations": scheduler.active_operations,
+            "utilization": scheduler.utilization,
+        },
+        "path": {
+            **coordinator.paths.as_dict(),
+            "scanner_rssi": coordinator.scanner_rssi(),
+        },
+        "metrics": coordinator.metrics.as_dict(),
+        "queue": {
+            "depth": coordinator.queue_depth,
+            "coalesced": coordinator.commands_coalesced,
+        },
+        "last_switch_latency": coordinator.last_switch_latency,
+        "settings": {
+            "power_limit": coordinator.power_limit,
+            "last_overload": coordinator.last_overload,
+            "timers": [entry_as_dict(entry) for entry in coordinator.schedule],
+        },
+        "energy": {
+            **coordinator.energy.as_dict(),
+            "wraps": coordinator.energy.wraps,
+            "resets": coordinator.energy.resets,
+        },
+        "appliance": {"state": coordinator.appliance.state, **coordinator.appliance.as_dict()},
+        "latest_data": asdict(coordinator.data) if coordinator.data else None,
+        "frames": [
+            {
+                "time": dt_util.utc_from_timestamp(timestamp).isoformat(),
+                "direction": direction,
+                "data": frame.hex(),
+            }
+            for timestamp, direction, frame in coordinator.metrics.frames
+        ],
+    }
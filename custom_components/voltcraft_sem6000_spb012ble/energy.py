@@ -0,0 +1,102 @@
+"""Monotonic energy total from the device counter and the power samples."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import (
+    DOMAIN,
+    ENERGY_INTEGRATION_MAX_GAP,
+    ENERGY_WRAP_MARGIN,
+    ENERGY_WRAP_POWER_TOLERANCE,
+    ENERGY_WRAP_SLACK,
+)
+
+# Widths of the device energy counter (hw v3: 2 bytes, hw v2: 4 bytes)
+_COUNTER_MODULI = (1 << 16, 1 << 32)
+# Largest fraction of a Wh added on top of the counter
+_MAX_FRACTION = 0.999
+
+
+def energy_storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.energy"
+
+
+class EnergyIntegrator:
+    """Total energy in Wh, persisted through as_dict / from_dict."""
+
+    def __init__(self, offset: int = 0, last_counter: int | None = None, fraction: float = 0.0) -> None:
+        self.offset = offset  # Wh lost to wraps and resets
+        self.last_counter = last_counter  # Wh, as reported by the device
+        self.fraction = fraction  # Wh integrated since the counter last moved
+        self.wraps = 0
+        self.resets = 0
+        self._last_power: float | None = None  # W
+        self._last_timestamp: float | None = None  # monotonic seconds
+
+    @property
+    def total(self) -> float | None:
+        """Total energy in Wh, None until the first sample."""
+        if self.last_counter is None:
+            return None
+        return self.offset + self.last_counter + self.fraction
+
+    def update(self, timestamp: float, power: float, counter: int) -> float:
+        """Add a sample (monotonic seconds, W, device counter in Wh) and return the total in Wh."""
+        increment = 0.0
+        max_delta: float | None = None  # Wh the plug can have counted since the previous sample
+        if self._last_timestamp is not None and self._last_power is not None:
+            elapsed = timestamp - self._last_timestamp
+            if 0 < elapsed <= ENERGY_INTEGRATION_MAX_GAP:
+                increment = (self._last_power + power) * elapsed / 7200  # trapezoid, W*s to Wh
+            max_delta = (
+                max(self._last_power, power) * max(elapsed, 0.0) / 3600 * ENERGY_WRAP_POWER_TOLERANCE
+                + ENERGY_WRAP_SLACK
+            )
+        self._last_power = power
+        self._last_timestamp = timestamp
+
+        last_counter = self.last_counter
+        if last_counter is None or counter == last_counter:
+            self.fraction = min(_MAX_FRACTION, self.fraction + increment)
+        elif counter > last_counter:
+            # The counter moved on, its own fraction is close to zero again
+            self.fraction = 0.0
+        elif (modulus := _wrap_modulus(last_counter, counter, max_delta)) is not None:
+            self.offset += modulus
+            self.wraps += 1
+            self.fraction = 0.0
+        else:
+            # The plug lost power and restarted counting from zero
+            self.offset += last_counter
+            self.resets += 1
+            self.fraction = 0.0
+
+        self.last_counter = counter
+        return self.offset + counter + self.fraction
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"offset": self.offset, "last_counter": self.last_counter, "fraction": self.fraction}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EnergyIntegrator:
+        return cls(
+            offset=int(data.get("offset", 0)),
+            last_counter=data.get("last_counter"),
+            fraction=float(data.get("fraction", 0.0)),
+        )
+
+
+def _wrap_modulus(last_counter: int, counter: int, max_delta: float | None) -> int | None:
+    """
+    Return the counter width if going from last_counter to counter looks like a wrap, not a reset.
+
+    Without a previous sample to bound the delta (first sample after a restart), only the margin is checked.
+    """
+    for modulus in _COUNTER_MODULI:
+        if last_counter < modulus and last_counter >= modulus - ENERGY_WRAP_MARGIN and counter < ENERGY_WRAP_MARGIN:
+            # A plug that restarts from zero close to the top of the range would look the same
+            if max_delta is not None and modulus - last_counter + counter > max_delta:
+                return None
+            return modulus
+    return None
@@ -0,0 +1,192 @@
+"""Group of plugs sampled together, with aggregate totals (e.g. "total power of the workshop circuit")."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC, CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo, format_mac
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import CONF_GROUP_INTERVAL, CONF_MEMBERS, DEFAULT_GROUP_INTERVAL, DOMAIN, GROUP_STALE_ROUNDS
+from .coordinator import VoltcraftData, VoltcraftDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class MemberSample:
+    timestamp: float  # unix
+    power: float  # W
+    current: float  # A
+    total_energy: float | None  # kWh
+
+
+@dataclass(slots=True)
+class GroupData:
+    power: float  # W, sum over the fresh members
+    current: float  # A, sum over the fresh members
+    energy: float | None  # kWh, None until a member reported its total energy
+    fresh: list[str] = field(default_factory=list)  # member MACs
+    stale: list[str] = field(default_factory=list)  # loaded, but no sample within the stale limit
+    missing: list[str] = field(default_factory=list)  # not loaded or never sampled
+    spread: float | None = None  # seconds between the first and the last sample of the fresh members
+
+
+class GroupAggregate:
+    """Running sums over the last sample of every member."""
+
+    def __init__(self, members: list[str]) -> None:
+        self.members = members
+        self.samples: dict[str, MemberSample] = {}
+        self._power = 0.0
+        self._current = 0.0
+        # kWh, sum of the increases of the members' total energy. Members that are missing for a while add
+        # their consumption when they report again, removed or never loaded members just don't add to it,
+        # so the total never goes down and doesn't wait for every member
+        self.energy: float | None = None
+
+    def restore_energy(self, energy: float) -> None:
+        """Continue from the total of the previous run."""
+        self.energy = energy + (self.energy or 0.0)
+
+    @callback
+    def update(self, member: str, timestamp: float, data: VoltcraftData) -> None:
+        sample = MemberSample(timestamp, data.power, data.current, data.total_energy)
+        previous = self.samples.get(member)
+        if previous is not None:
+            self._power -= previous.power
+            self._current -= previous.current
+        if sample.total_energy is not None:
+            if self.energy is None:
+                self.energy = 0.0
+            if previous is not None and previous.total_energy is not None:
+                self.energy += max(0.0, sample.total_energy - previous.total_energy)
+        self._power += sample.power
+        self._current += sample.current
+        self.samples[member] = sample
+
+    def snapshot(self, now: float, max_age: float, loaded: set[str]) -> GroupData:
+        """Return the totals, leaving out members whose last sample is older than max_age seconds."""
+        data = GroupData(power=self._power, current=self._current, energy=self.energy)
+        oldest = newest = None
+        for member in self.members:
+            sample = self.samples.get(member)
+            if sample is None or member not in loaded:
+                data.missing.append(member)
+            elif now - sample.timestamp > max_age:
+                data.stale.append(member)
+            else:
+                data.fresh.append(member)
+                oldest = sample.timestamp if oldest is None else min(oldest, sample.timestamp)
+                newest = sample.timestamp if newest is None else max(newest, sample.timestamp)
+                continue
+            if sample is not None:
+                data.power -= sample.power
+                data.current -= sample.current
+
+        if oldest is not None and newest is not None:
+            data.spread = newest - oldest
+        # Float error of the running sums
+        data.power = max(0.0, data.power)
+        data.current = max(0.0, data.current)
+        return data
+
+
+class VoltcraftGroupCoordinator(DataUpdateCoordinator[GroupData]):
+    """Polls the member plugs of a group together and aggregates their samples."""
+
+    config_entry: ConfigEntry
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        interval = timedelta(seconds=entry.data.get(CONF_GROUP_INTERVAL, DEFAULT_GROUP_INTERVAL))
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN}_group_{entry.entry_id}",
+            update_interval=interval,
+        )
+        self.members: list[str] = [format_mac(mac) for mac in entry.data[CONF_MEMBERS]]
+        self.aggregate = GroupAggregate(self.members)
+        self._max_age = interval.total_seconds() * GROUP_STALE_ROUNDS
+        # Member coordinators joined so far, replaced when a member entry is reloaded
+        self._joined: dict[str, tuple[VoltcraftDataUpdateCoordinator, CALLBACK_TYPE]] = {}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"group_{self.config_entry.entry_id}")},
+            name=self.config_entry.data[CONF_NAME],
+            model="Plug group",
+        )
+
+    @callback
+    def _member_coordinators(self) -> dict[str, VoltcraftDataUpdateCoordinator]:
+        """Return the loaded member coordinators by MAC, joining the ones not seen before."""
+        loaded: dict[str, VoltcraftDataUpdateCoordinator] = {}
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            coordinator = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if not isinstance(coordinator, VoltcraftDataUpdateCoordinator):
+                continue
+            mac = format_mac(entry.data[CONF_MAC])
+            if mac in self.members:
+                loaded[mac] = coordinator
+
+        for mac, coordinator in loaded.items():
+            joined = self._joined.get(mac)
+            if joined is not None and joined[0] is coordinator:
+                continue
+            if joined is not None:
+                joined[1]()
+            coordinator.join_group(self.config_entry.entry_id)
+            unsubscribe = coordinator.async_subscribe_measurements(
+                lambda timestamp, data, mac=mac: self.aggregate.update(mac, timestamp, data), live=False
+            )
+            self._joined[mac] = (coordinator, unsubscribe)
+        return loaded
+
+    async def _async_update_data(self) -> GroupData:
+        members = self._member_coordinators()
+        started = time.monotonic()
+        # All members at once, each publishes its own sample to its entities as well
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in members.values()))
+        _LOGGER.debug(
+            "%s: Round of %d member(s) took %.0f ms", self.name, len(members), (time.monotonic() - started) * 1000
+        )
+        return self.aggregate.snapshot(time.time(), self._max_age, set(members))
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        for coordinator, unsubscribe in self._joined.values():
+            unsubscribe()
+            coordinator.leave_group(self.config_entry.entry_id)
+        self._joined.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """State of every member, under CONF_MAC to be redacted like the plug diagnostics."""
+        data = self.data
+        members: list[dict[str, Any]] = []
+        for mac in self.members:
+            sample = self.aggregate.samples.get(mac)
+            state = None
+            if data is not None:
+                state = "stale" if mac in data.stale else "missing" if mac in data.missing else "fresh"
+            members.append(
+                {
+                    CONF_MAC: mac,
+                    "joined": mac in self._joined,
+                    "state": state,
+                    "age": time.time() - sample.timestamp if sample is not None else None,
+                    "power": sample.power if sample is not None else None,
+                    "total_energy": sample.total_energy if sample is not None else None,
+                }
+            )
+        return {"members": members, "energy": self.aggregate.energy}
@@ -0,0 +1,72 @@
+"""Import of the device-side consumption history into long-term statistics."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMeanType, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics, get_last_statistics
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import EnergyConverter
+
+from .const import DOMAIN
+
+
+def history_statistic_id(mac: str) -> str:
+    return f"{DOMAIN}:energy_history_{mac.replace(':', '').lower()}"
+
+
+async def async_import_hourly_history(
+    hass: HomeAssistant,
+    mac: str,
+    name: str,
+    hourly_energy: Sequence[int],
+    now: datetime,
+) -> int:
+    """Import complete hours (Wh per hour, oldest first) not yet in the statistics, returns the count."""
+    statistic_id = history_statistic_id(mac)
+
+    # The last value belongs to the still running hour, it is imported by the next fetch
+    current_hour = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0)
+    complete_hours = hourly_energy[:-1]
+    first_hour = current_hour - timedelta(hours=len(complete_hours))
+
+    last_stats = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic_id, True, {"sum"}
+    )
+    last_sum = 0.0
+    last_start: datetime | None = None
+    if rows := last_stats.get(statistic_id):
+        last_sum = rows[0].get("sum") or 0.0
+        last_start = dt_util.utc_from_timestamp(rows[0]["start"])
+
+    statistics: list[StatisticData] = []
+    for index, energy in enumerate(complete_hours):
+        start = first_hour + timedelta(hours=index)
+        if last_start is not None and start <= last_start:
+            # Already imported
+            continue
+
+        consumed = energy / 1000.0  # Wh to kWh
+        last_sum += consumed
+        statistics.append(StatisticData(start=start, state=consumed, sum=last_sum))
+
+    if not statistics:
+        return 0
+
+    metadata = StatisticMetaData(
+        mean_type=StatisticMeanType.NONE,
+        has_sum=True,
+        name=f"{name} energy history",
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_class=EnergyConverter.UNIT_CLASS,
+        unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    )
+    # All hours go to the recorder as one batch
+    async_add_external_statistics(hass, metadata, statistics)
+    return len(statistics)
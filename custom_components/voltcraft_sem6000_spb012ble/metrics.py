@@ -0,0 +1,130 @@
+"""Per-device performance counters, kept in memory for the diagnostic sensors and the diagnostics download."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from typing import Any
+
+from .const import DIAGNOSTICS_FRAME_RING, LATENCY_BUCKETS_MS, METRICS_RATE_WINDOW
+
+
+class Histogram:
+    """Counts of observations per bucket (upper bounds), plus count, sum, maximum and the last value."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)  # the last bucket counts values above all bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (the maximum for the overflow bucket)."""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        buckets = {f"<={bound:g}": count for bound, count in zip(self.bounds, self.buckets, strict=False)}
+        buckets[f">{self.bounds[-1]:g}"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max if self.count else None,
+            "last": self.last,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+class RateMeter:
+    """Events per second over the last full window."""
+
+    def __init__(self, window: float = METRICS_RATE_WINDOW) -> None:
+        self.window = window
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._rate = 0.0
+
+    @property
+    def rate(self) -> float:
+        self._roll_window(time.monotonic())
+        return self._rate
+
+    def mark(self, count: int = 1) -> None:
+        self._roll_window(time.monotonic())
+        self._window_count += count
+
+    def _roll_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+
+        self._rate = self._window_count / elapsed
+        self._window_start = now
+        self._window_count = 0
+
+
+class DeviceMetrics:
+    """Performance counters of one plug."""
+
+    def __init__(self) -> None:
+        self.write_latency = Histogram(LATENCY_BUCKETS_MS)  # ms
+        self.poll_round_trip = Histogram(LATENCY_BUCKETS_MS)  # ms
+        self.notification_rate = RateMeter()
+        self.notifications = 0
+        self.notification_bytes = 0
+        self.unknown_frames = 0
+        self.polls = 0
+        self.poll_failures = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self.last_sample_at: float | None = None  # unix timestamp of the last measurement
+        # Recent raw traffic: (unix timestamp, "tx" or "rx", bytes)
+        self.frames: deque[tuple[float, str, bytes]] = deque(maxlen=DIAGNOSTICS_FRAME_RING)
+
+    def record_write(self, frame: bytes, latency: float) -> None:
+        self.write_latency.observe(latency * 1000)
+        self.frames.append((time.time(), "tx", frame))
+
+    def record_notification(self, data: bytes) -> None:
+        self.notifications += 1
+        self.notification_bytes += len(data)
+        self.notification_rate.mark()
+        self.frames.append((time.time(), "rx", data))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "write_latency_ms": self.write_latency.as_dict(),
+            "poll_round_trip_ms": self.poll_round_trip.as_dict(),
+            "notifications": self.notifications,
+            "notification_bytes": self.notification_bytes,
+            "notifications_per_second": self.notification_rate.rate,
+            "unknown_frames": self.unknown_frames,
+            "polls": self.polls,
+            "poll_failures": self.poll_failures,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "seconds_since_last_sample": time.time() - self.last_sample_at if self.last_sample_at else None,
+        }
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from homeassistant.components.number import NumberDeviceClass, NumberMode, RestoreNumber
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfPower
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, POWER_LIMIT_MAX
+from .coordinator import VoltcraftDataUpdateCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: VoltcraftDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([VoltcraftPowerLimitNumber(coordinator)])
+
+
+class VoltcraftPowerLimitNumber(CoordinatorEntity[VoltcraftDataUpdateCoordinator], RestoreNumber):
+    """Load above which the plug switches its outlet off by itself, 0 disables the protection."""
+
+    _attr_device_class = NumberDeviceClass.POWER
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_mode = NumberMode.BOX
+    _attr_native_min_value = 0
+    _attr_native_max_value = POWER_LIMIT_MAX
+    _attr_native_step = 1
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_power_limit"
+        self._attr_name = "Power Limit"
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last = await self.async_get_last_number_data()
+        if last is not None and last.native_value is not None and self.coordinator.power_limit is None:
+            self.coordinator.restore_power_limit(int(last.native_value))
+
+    @property
+    def native_value(self) -> int | None:
+        return self.coordinator.power_limit
+
+    async def async_set_native_value(self, value: float) -> None:
+        await self.coordinator.async_set_power_limit(int(value))
+        self.async_write_ha_state()
@@ -0,0 +1,122 @@
+"""Choice of the connection path (local adapter or Bluetooth proxy) of a plug."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    PATH_DEGRADED_FAILURE_RATE,
+    PATH_DEGRADED_ROUND_TRIP,
+    PATH_EWMA_ALPHA,
+    PATH_MIGRATION_BACKOFF,
+    PATH_MIGRATION_BACKOFF_MAX,
+    PATH_MIN_DWELL,
+    PATH_MIN_SAMPLES,
+    PATH_RSSI_HYSTERESIS,
+)
+
+
+@dataclass(slots=True)
+class PathQuality:
+    round_trip: float | None = None  # seconds, moving average of successful polls
+    failure_rate: float = 0.0  # 0.0 - 1.0, moving average
+    polls: int = 0
+
+    def record(self, round_trip: float | None) -> None:
+        """Add a poll result (None for a failed poll)."""
+        self.polls += 1
+        failed = round_trip is None
+        self.failure_rate += PATH_EWMA_ALPHA * (failed - self.failure_rate)
+        if round_trip is not None:
+            if self.round_trip is None:
+                self.round_trip = round_trip
+            else:
+                self.round_trip += PATH_EWMA_ALPHA * (round_trip - self.round_trip)
+
+    @property
+    def degraded(self) -> bool:
+        if self.polls < PATH_MIN_SAMPLES:
+            return False
+        return self.failure_rate > PATH_DEGRADED_FAILURE_RATE or (self.round_trip or 0.0) > PATH_DEGRADED_ROUND_TRIP
+
+
+class PathSelector:
+    """Link quality per path (scanner source) and the decision to move the connection."""
+
+    def __init__(self) -> None:
+        self.paths: dict[str, PathQuality] = {}
+        self.current: str | None = None
+        self.target: str | None = None  # path of a pending move
+        self.migrations = 0
+        self.failed_migrations = 0  # consecutive moves that ended up on another path
+        self._current_since = 0.0  # monotonic
+        self._migrate_after = 0.0  # monotonic
+
+    def migrate(self, target: str) -> None:
+        """Start moving the connection to target, the next connection should go through it."""
+        self.target = target
+        self.migrations += 1
+
+    def connected(self, source: str, now: float, verified: bool = True) -> bool:
+        """Record the path of a new connection, returns False if a pending move didn't reach its target.
+
+        Unverified sources (the active path couldn't be determined) never complete a move.
+        """
+        target, self.target = self.target, None
+        moved = target is None or (verified and source == target)
+        if target is not None:
+            if moved:
+                self.failed_migrations = 0
+            else:
+                self.failed_migrations += 1
+                backoff = PATH_MIGRATION_BACKOFF * 2 ** (self.failed_migrations - 1)
+                self._migrate_after = now + min(backoff, PATH_MIGRATION_BACKOFF_MAX)
+        if source != self.current or target is not None:
+            # A move restarts the dwell time, even when it landed on the same path again
+            self.current = source
+            self._current_since = now
+        self.paths.setdefault(source, PathQuality())
+        return moved
+
+    def record_poll(self, round_trip: float | None) -> None:
+        if self.current is not None:
+            self.paths.setdefault(self.current, PathQuality()).record(round_trip)
+
+    def better_path(self, rssi_by_source: dict[str, int], now: float) -> str | None:
+        """Return the source to move the connection to, or None to stay on the current path."""
+        current = self.current
+        if current is None or now < self._migrate_after or now - self._current_since < PATH_MIN_DWELL:
+            return None
+        if not self.paths[current].degraded:
+            return None
+
+        candidates = {
+            source: rssi
+            for source, rssi in rssi_by_source.items()
+            if source != current and not ((quality := self.paths.get(source)) and quality.degraded)
+        }
+        if not candidates:
+            return None
+
+        best = max(candidates, key=candidates.__getitem__)
+        current_rssi = rssi_by_source.get(current)
+        if current_rssi is not None and candidates[best] < current_rssi + PATH_RSSI_HYSTERESIS:
+            return None
+        return best
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "current": self.current,
+            "migrations": self.migrations,
+            "failed_migrations": self.failed_migrations,
+            "paths": {
+                source: {
+                    "round_trip_ms": quality.round_trip * 1000 if quality.round_trip is not None else None,
+                    "failure_rate": quality.failure_rate,
+                    "polls": quality.polls,
+                    "degraded": quality.degraded,
+                }
+                for source, quality in self.paths.items()
+            },
+        }
@@ -22,68 +22,149 @@ MEASURE notification layout:
   Bytes 10+    : consumed_energy (big-endian, Wh)
                  14-byte payload (hw v2): 4 bytes
                  12-byte payload (hw v3): 2 bytes
+
+TIME_SYNC (0x01) request params: seconds, minutes, hours, day, month (1 byte each), year (2 bytes,
+  big-endian), 2 zero bytes. Local time, the plug runs its timers on it. Acknowledged with TIME_SYNC.
+
+SCHEDULE (0x14) request params: action (0 add, 1 edit, 2 delete), slot, switch on (bool),
+  weekdays (bit mask, bit 0 Monday to bit 6 Sunday), hour, minute. Acknowledged with SCHEDULE.
+  A delete only needs the action and the slot, the other bytes are sent as zeros.
+
+POWER_LIMIT (0x05) request params: power limit (2 bytes, big-endian, watts), 0 disables the protection
+POWER_LIMIT notification: acknowledgement, no meaningful params. The plug cuts the outlet itself when
+the load exceeds the limit, it doesn't send a dedicated notification for that.
+
+HOURLY_HISTORY (0x0A) request params: 0x00 0x00
+HOURLY_HISTORY notification layout:
+  Bytes 0-47   : consumed energy of the last 24 hours (24 x 2 bytes, big-endian, Wh),
+                 oldest hour first, the last value is the current (still running) hour
 """
 
 from __future__ import annotations
 
+import struct
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from enum import IntEnum
+from functools import lru_cache
+from typing import TypeVar
+
+HEADER = 0x0F
+TRAILER = b"\xff\xff"
+
+# Offsets within a frame
+_LENGTH_OFFSET = 1
+_COMMAND_OFFSET = 2
+_PARAMS_OFFSET = 4
+
+# is_on, power (high byte, low word), voltage, current, frequency, 2 unknown bytes
+_MEASURE_LAYOUT = struct.Struct(">BBHBHB2x")
+_MEASURE_ENERGY_LAYOUTS = {
+    2: struct.Struct(">H"),  # hw v3
+    4: struct.Struct(">I"),  # hw v2
+}
+
+
+def checksum(command: int, params: bytes | memoryview) -> int:
+    return (1 + command + sum(params)) % 256
+
+
+@lru_cache(maxsize=32)
+def _encode_frame(command: int, params: bytes) -> bytes:
+    length = len(params) + 3
+    return bytes((HEADER, length, command, 0x00)) + params + bytes((checksum(command, params),)) + TRAILER
 
 
 class Command(IntEnum):
+    TIME_SYNC = 0x01
     SWITCH = 0x03
     MEASURE = 0x04
+    POWER_LIMIT = 0x05
+    HOURLY_HISTORY = 0x0A
+    SCHEDULE = 0x14
 
-    def build_payload(self, params: bytearray | None = None) -> bytearray:
-        if params is None:
-            params = bytearray()
-
-        length = len(params) + 3
-        checksum = (1 + sum(list(params)) + self) % 256
-        return bytearray([0x0F, length, self, 0x00]) + params + bytearray([checksum, 0xFF, 0xFF])
+    def build_payload(self, params: bytes = b"") -> bytes:
+        # Frames are cached, repeated commands (e.g. MEASURE on every poll) don't allocate
+        return _encode_frame(self.value, bytes(params))
 
 
 class SwitchModes(IntEnum):
     ON = 0x01
     OFF = 0x00
 
-    def build_payload(self) -> bytearray:
-        return Command.SWITCH.build_payload(bytearray([self]))
+    def build_payload(self) -> bytes:
+        return Command.SWITCH.build_payload(bytes((self.value,)))
+
+
+class ScheduleAction(IntEnum):
+    ADD = 0x00
+    EDIT = 0x01
+    DELETE = 0x02
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleEntry:
+    """One timer stored on the plug: switch the outlet at hour:minute on the given weekdays."""
+
+    is_on: bool
+    hour: int
+    minute: int
+    weekdays: int  # bit mask, bit 0 Monday to bit 6 Sunday
+
+
+_P = TypeVar("_P", bound="NotifyPayload")
+_PARSERS: dict[int, Callable[[memoryview], ParsedNotifyPayload | None]] = {}
+_COMMANDS: dict[type[NotifyPayload], Command] = {}
+
+
+def _register(command: Command) -> Callable[[type[_P]], type[_P]]:
+    """Register a payload class as the parser for notifications of the given command."""
+
+    def decorator(cls: type[_P]) -> type[_P]:
+        _PARSERS[command] = cls.from_data  # type: ignore[attr-defined]
+        _COMMANDS[cls] = command
+        return cls
+
+    return decorator
 
 
 class NotifyPayload:
+    __slots__ = ()
+
     @staticmethod
-    def from_payload(payload: bytearray) -> ParsedNotifyPayload | None:
-        if payload[0] != 0x0F:
+    def from_payload(
+        payload: bytes | bytearray | memoryview,
+        validate_checksum: bool = False,
+    ) -> ParsedNotifyPayload | None:
+        view = memoryview(payload)
+        if len(view) < _PARAMS_OFFSET or view[0] != HEADER:
             # Not a valid payload
             return None
 
-        length = payload[1]
-        body = payload[2 : length + 2]
-
-        params = body[0:-1]
-
-        # # The checksum always seems to be wrong...
-        # checksum = body[-1]
-        # checksumExpected = (1 + sum(list(params))) % 256
-        # if checksum != checksumExpected:
-        #     # Not a valid payload
-        #     return None
+        # Length covers command, the unknown byte, params and checksum
+        checksum_offset = view[_LENGTH_OFFSET] + 1
+        if checksum_offset < _PARAMS_OFFSET or len(view) <= checksum_offset:
+            # Truncated payload
+            return None
 
-        command = params[0]
+        command = view[_COMMAND_OFFSET]
+        arguments = view[_PARAMS_OFFSET:checksum_offset]
 
-        arguments = params[2:]
+        # The checksum of notifications doesn't seem to match the one of commands on all devices,
+        # so it is only checked on request
+        if validate_checksum and view[checksum_offset] != checksum(command, arguments):
+            return None
 
-        if command == Command.SWITCH:
-            return SwitchNotifyPayload.from_data(arguments)
-        elif command == Command.MEASURE:
-            return MeasureNotifyPayload.from_data(arguments)
-        else:
+        parser = _PARSERS.get(command)
+        if parser is None:
             # Unknown command
             return None
+        return parser(arguments)
 
 
-@dataclass(frozen=True)
+@_register(Command.MEASURE)
+@dataclass(frozen=True, slots=True)
 class MeasureNotifyPayload(NotifyPayload):
     is_on: bool
     power: int
@@ -93,24 +174,215 @@ class MeasureNotifyPayload(NotifyPayload):
     consumed_energy: int
 
     @staticmethod
-    def from_data(data: bytearray) -> MeasureNotifyPayload:
-        # data[8:10] are unknown padding bytes — skip them
+    def from_data(data: memoryview) -> MeasureNotifyPayload | None:
+        if len(data) < _MEASURE_LAYOUT.size:
+            return None
+
+        is_on, power_high, power_low, voltage, current, frequency = _MEASURE_LAYOUT.unpack_from(data)
+
+        # data[8:10] are unknown padding bytes — skipped by the layout
         # consumed_energy starts at offset 10; length varies by hw version
+        energy_length = len(data) - _MEASURE_LAYOUT.size
+        energy_layout = _MEASURE_ENERGY_LAYOUTS.get(energy_length)
+        if energy_layout is not None:
+            (consumed_energy,) = energy_layout.unpack_from(data, _MEASURE_LAYOUT.size)
+        else:
+            consumed_energy = int.from_bytes(data[_MEASURE_LAYOUT.size :], byteorder="big")
+
         return MeasureNotifyPayload(
-            is_on=bool(data[0]),
-            power=int.from_bytes(data[1:4], byteorder="big"),
-            voltage=int(data[4]),
-            current=int.from_bytes(data[5:7], byteorder="big"),
-            frequency=int(data[7]),
-            consumed_energy=int.from_bytes(data[10:], byteorder="big"),
+            is_on=bool(is_on),
+            power=(power_high << 16) | power_low,
+            voltage=voltage,
+            current=current,
+            frequency=frequency,
+            consumed_energy=consumed_energy,
         )
 
 
-@dataclass(frozen=True)
+@_register(Command.SWITCH)
+@dataclass(frozen=True, slots=True)
 class SwitchNotifyPayload(NotifyPayload):
     @staticmethod
-    def from_data(data: bytearray) -> SwitchNotifyPayload:
-        return SwitchNotifyPayload()
+    def from_data(data: memoryview) -> SwitchNotifyPayload:
+        return _SWITCH_NOTIFY_PAYLOAD
+
+
+_SWITCH_NOTIFY_PAYLOAD = SwitchNotifyPayload()
+
+
+def build_time_sync_request(now: datetime) -> bytes:
+    params = bytes((now.second, now.minute, now.hour, now.day, now.month)) + struct.pack(">H", now.year) + b"\x00\x00"
+    return Command.TIME_SYNC.build_payload(params)
+
+
+@_register(Command.TIME_SYNC)
+@dataclass(frozen=True, slots=True)
+class TimeSyncNotifyPayload(NotifyPayload):
+    @staticmethod
+    def from_data(data: memoryview) -> TimeSyncNotifyPayload:
+        return _TIME_SYNC_NOTIFY_PAYLOAD
+
+
+_TIME_SYNC_NOTIFY_PAYLOAD = TimeSyncNotifyPayload()
+
+
+def build_schedule_request(action: ScheduleAction, slot: int, entry: ScheduleEntry | None = None) -> bytes:
+    if entry is None:
+        return Command.SCHEDULE.build_payload(bytes((action, slot, 0, 0, 0, 0)))
+    return Command.SCHEDULE.build_payload(bytes((action, slot, entry.is_on, entry.weekdays, entry.hour, entry.minute)))
+
+
+@_register(Command.SCHEDULE)
+@dataclass(frozen=True, slots=True)
+class ScheduleNotifyPayload(NotifyPayload):
+    @staticmethod
+    def from_data(data: memoryview) -> ScheduleNotifyPayload:
+        return _SCHEDULE_NOTIFY_PAYLOAD
+
+
+_SCHEDULE_NOTIFY_PAYLOAD = ScheduleNotifyPayload()
+
+
+def build_power_limit_request(watts: int) -> bytes:
+    return Command.POWER_LIMIT.build_payload(struct.pack(">H", watts))
+
+
+@_register(Command.POWER_LIMIT)
+@dataclass(frozen=True, slots=True)
+class PowerLimitNotifyPayload(NotifyPayload):
+    @staticmethod
+    def from_data(data: memoryview) -> PowerLimitNotifyPayload:
+        return _POWER_LIMIT_NOTIFY_PAYLOAD
+
+
+_POWER_LIMIT_NOTIFY_PAYLOAD = PowerLimitNotifyPayload()
+
+
+def build_hourly_history_request() -> bytes:
+    return Command.HOURLY_HISTORY.build_payload(b"\x00\x00")
+
+
+@_register(Command.HOURLY_HISTORY)
+@dataclass(frozen=True, slots=True)
+class HourlyHistoryNotifyPayload(NotifyPayload):
+    hourly_energy: tuple[int, ...]  # Wh per hour, oldest first, last one is the current hour
+
+    @staticmethod
+    def from_data(data: memoryview) -> HourlyHistoryNotifyPayload:
+        return HourlyHistoryNotifyPayload(hourly_energy=struct.unpack_from(f">{len(data) // 2}H", data))
+
+
+ParsedNotifyPayload = (
+    SwitchNotifyPayload
+    | MeasureNotifyPayload
+    | PowerLimitNotifyPayload
+    | TimeSyncNotifyPayload
+    | ScheduleNotifyPayload
+    | HourlyHistoryNotifyPayload
+)
+
+
+def payload_command(payload: ParsedNotifyPayload) -> Command:
+    """Return the command a notification payload answers."""
+    return _COMMANDS[type(payload)]
+
+
+# Longest possible frame: header, length byte, 255 bytes counted by the length byte, trailer
+MAX_FRAME_SIZE = 2 + 0xFF + len(TRAILER)
+
+
+class FrameDecoder:
+    """
+    Incremental decoder for one connection's notification stream.
+
+    Some Bluetooth proxies and larger-MTU links split frames across notifications or pack several
+    frames into one. The decoder keeps a bounded buffer, resynchronises on the header byte and
+    returns every complete frame parsed.
+    """
+
+    def __init__(self, max_buffer: int = 2 * MAX_FRAME_SIZE, validate_checksum: bool = False) -> None:
+        self._buffer = bytearray()
+        self._max_buffer = max_buffer
+        self._validate_checksum = validate_checksum
+        self.unknown_frames = 0
+        self.discarded_bytes = 0
+
+    def reset(self) -> None:
+        self._buffer.clear()
+
+    def feed(self, chunk: bytes | bytearray) -> list[ParsedNotifyPayload]:
+        buffer = self._buffer
+        if not buffer and _is_single_frame(chunk):
+            # Common case: the notification is exactly one frame, parse it without buffering
+            return self._parse(chunk)
+
+        buffer += chunk
+        payloads: list[ParsedNotifyPayload] = []
+        while buffer:
+            start = buffer.find(HEADER)
+            if start < 0:
+                self._discard(len(buffer))
+                break
+            if start > 0:
+                self._discard(start)
+
+            if len(buffer) < 2:
+                break
+
+            frame_size = buffer[_LENGTH_OFFSET] + 2 + len(TRAILER)
+            if frame_size < _PARAMS_OFFSET + 1 + len(TRAILER):
+                # Impossible length, the header byte was part of garbage
+                self._discard(1)
+                continue
+
+            if len(buffer) < frame_size:
+                next_frame = _find_complete_frame(buffer, 1)
+                if next_frame < 0:
+                    # Wait for the rest of the frame
+                    break
+                # A complete frame follows, so the pending header byte was part of garbage
+                self._discard(next_frame)
+                continue
+
+            if buffer[frame_size - len(TRAILER) : frame_size] != TRAILER:
+                # Not a frame boundary, resynchronise on the next header byte
+                self._discard(1)
+                continue
+
+            payloads += self._parse(memoryview(buffer)[:frame_size])
+            del buffer[:frame_size]
+
+        if len(buffer) > self._max_buffer:
+            self._discard(len(buffer) - self._max_buffer)
+
+        return payloads
+
+    def _parse(self, frame: bytes | bytearray | memoryview) -> list[ParsedNotifyPayload]:
+        payload = NotifyPayload.from_payload(frame, self._validate_checksum)
+        if payload is None:
+            self.unknown_frames += 1
+            return []
+        return [payload]
+
+    def _discard(self, count: int) -> None:
+        del self._buffer[:count]
+        self.discarded_bytes += count
+
+
+def _is_single_frame(chunk: bytes | bytearray) -> bool:
+    return (
+        len(chunk) >= _PARAMS_OFFSET + 1 + len(TRAILER)
+        and chunk[0] == HEADER
+        and len(chunk) == chunk[_LENGTH_OFFSET] + 2 + len(TRAILER)
+        and chunk.endswith(TRAILER)
+    )
 
 
-ParsedNotifyPayload = SwitchNotifyPayload | MeasureNotifyPayload
+def _find_complete_frame(buffer: bytearray, start: int) -> int:
+    """Return the offset of the first complete frame (ending with the trailer) at or after start, or -1."""
+    while (start := buffer.find(HEADER, start)) >= 0 and start + 1 < len(buffer):
+        end = start + buffer[start + _LENGTH_OFFSET] + 2 + len(TRAILER)
+        if end <= len(buffer) and buffer[end - len(TRAILER) : end] == TRAILER:
+            return start
+        start += 1
+    return -1
@@ -0,0 +1,234 @@
+"""Shared scheduling of GATT operations for all plugs connected through one Bluetooth adapter or proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Protocol
+
+from homeassistant.components import bluetooth
+from homeassistant.components.bluetooth import HaBluetoothSlotAllocations
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    ADAPTER_CONNECTION_SLOTS,
+    ADAPTER_MAX_CONCURRENT_OPS,
+    ADAPTER_MAX_POLL_SPACING,
+    ADAPTER_SATURATION_WARNING,
+    ADAPTER_UTILIZATION_WINDOW,
+    DATA_SCHEDULERS,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PooledConnection(Protocol):
+    """A connection holding one of the adapter's connection slots."""
+
+    @property
+    def evictable(self) -> bool:
+        """Return True if the connection is idle and may be closed to free its slot."""
+
+    async def async_evict(self) -> None:
+        """Close the connection, its slot has been given to another plug."""
+
+
+class AdapterScheduler:
+    """Paces and limits GATT operations of the plugs sharing one adapter."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        source: str,
+        max_concurrent: int = ADAPTER_MAX_CONCURRENT_OPS,
+        max_connections: int = ADAPTER_CONNECTION_SLOTS,
+    ) -> None:
+        self.hass = hass
+        self.source = source
+        self._unsubscribe_allocations: CALLBACK_TYPE | None = None
+        self.max_concurrent = max_concurrent
+        self.max_connections = max_connections
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._members: set[str] = set()
+        self._next_poll_at = 0.0
+        self._active = 0
+
+        # Connected members, least recently used first
+        self._connections: OrderedDict[str, PooledConnection] = OrderedDict()
+        self._slot_freed = asyncio.Event()
+        self.evictions = 0
+
+        # Utilization accounting
+        self._window_start = time.monotonic()
+        self._window_busy = 0.0
+        self._utilization = 0.0
+        self._saturation_warned = False
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    @property
+    def active_operations(self) -> int:
+        return self._active
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    @property
+    def utilization(self) -> float:
+        """Fraction (0.0 - 1.0) of the adapter's GATT capacity used during the last full window."""
+        self._roll_window(time.monotonic())
+        return self._utilization
+
+    @callback
+    def async_register(self, member: str) -> Callable[[], None]:
+        """Register a plug with the adapter, returns a callback to unregister it."""
+        if not self._members:
+            self._async_track_allocations()
+        self._members.add(member)
+
+        @callback
+        def _unregister() -> None:
+            self._members.discard(member)
+            if not self._members:
+                self._async_remove()
+
+        return _unregister
+
+    @callback
+    def _async_track_allocations(self) -> None:
+        """Follow the slot count the adapter reports to Home Assistant's Bluetooth manager."""
+        try:
+            current = bluetooth.async_current_allocations(self.hass, self.source)
+            self._unsubscribe_allocations = bluetooth.async_register_allocation_callback(
+                self.hass, self.async_update_allocations, self.source
+            )
+        except RuntimeError:
+            # Bluetooth isn't set up (e.g. the benchmark harness), keep the default
+            return
+        for allocations in current or ():
+            self.async_update_allocations(allocations)
+
+    @callback
+    def _async_remove(self) -> None:
+        """Drop the scheduler once the last plug on the adapter unloaded or moved to another adapter."""
+        if self._unsubscribe_allocations is not None:
+            self._unsubscribe_allocations()
+            self._unsubscribe_allocations = None
+        schedulers: dict[str, AdapterScheduler] = self.hass.data.get(DOMAIN, {}).get(DATA_SCHEDULERS, {})
+        if schedulers.get(self.source) is self:
+            del schedulers[self.source]
+
+    @callback
+    def async_update_allocations(self, allocations: HaBluetoothSlotAllocations) -> None:
+        """Take the adapter's slot count from the Bluetooth manager (0 while it hasn't reported one)."""
+        slots = allocations.slots or ADAPTER_CONNECTION_SLOTS
+        if slots == self.max_connections:
+            return
+        _LOGGER.debug("Adapter %s: %d connection slots (was %d)", self.source, slots, self.max_connections)
+        if slots > self.max_connections:
+            self._slot_freed.set()
+        self.max_connections = slots
+
+    def poll_spacing(self, interval: timedelta) -> float:
+        """Minimum time in seconds between two MEASURE polls on this adapter."""
+        return min(ADAPTER_MAX_POLL_SPACING, interval.total_seconds() / max(1, len(self._members)))
+
+    async def async_acquire_connection(self, member: str, connection: PooledConnection, pinned: bool) -> None:
+        """Take a connection slot before connecting.
+
+        When all slots are taken the least recently used evictable connection is closed. Pinned
+        (persistent) connections never wait for a slot, on-demand ones wait until a slot frees up.
+        """
+        while True:
+            if member in self._connections:
+                self._connections.move_to_end(member)
+                return
+
+            if len(self._connections) >= self.max_connections:
+                victim = next((key for key, held in self._connections.items() if held.evictable), None)
+                if victim is not None:
+                    evicted = self._connections.pop(victim)
+                    self._connections[member] = connection
+                    self.evictions += 1
+                    _LOGGER.debug("Adapter %s: Closing idle connection of %s for %s", self.source, victim, member)
+                    await evicted.async_evict()
+                    return
+
+            if pinned or len(self._connections) < self.max_connections:
+                self._connections[member] = connection
+                return
+
+            self._slot_freed.clear()
+            await self._slot_freed.wait()
+
+    @callback
+    def touch_connection(self, member: str) -> None:
+        """Mark a connection as just used."""
+        if member in self._connections:
+            self._connections.move_to_end(member)
+
+    @callback
+    def release_connection(self, member: str) -> None:
+        """Give back the connection slot of a member (disconnected)."""
+        if self._connections.pop(member, None) is not None:
+            self._slot_freed.set()
+
+    async def async_wait_poll_turn(self, interval: timedelta) -> None:
+        """Wait for this poll's turn on the adapter (the GATT slot is taken when the command is written)."""
+        now = time.monotonic()
+        start = max(now, self._next_poll_at)
+        self._next_poll_at = start + self.poll_spacing(interval)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def async_command_slot(self) -> AsyncIterator[None]:
+        """Hold one GATT slot for writing a command and receiving its answer."""
+        async with self._semaphore:
+            self._active += 1
+            started = time.monotonic()
+            try:
+                yield
+            finally:
+                self._active -= 1
+                self._record_busy(started, time.monotonic())
+
+    def _record_busy(self, started: float, ended: float) -> None:
+        self._roll_window(ended)
+        self._window_busy += ended - started
+
+    def _roll_window(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < ADAPTER_UTILIZATION_WINDOW:
+            return
+
+        self._utilization = min(1.0, self._window_busy / (elapsed * self.max_concurrent))
+        self._window_start = now
+        self._window_busy = 0.0
+
+        if self._utilization >= ADAPTER_SATURATION_WARNING and not self._saturation_warned:
+            _LOGGER.warning(
+                "Bluetooth adapter %s is %.0f%% busy with %d plugs, polls will be delayed",
+                self.source,
+                self._utilization * 100,
+                len(self._members),
+            )
+        self._saturation_warned = self._utilization >= ADAPTER_SATURATION_WARNING
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant, source: str) -> AdapterScheduler:
+    """Return the shared scheduler for an adapter, creating it on first use."""
+    schedulers: dict[str, AdapterScheduler] = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_SCHEDULERS, {})
+    if (scheduler := schedulers.get(source)) is None:
+        scheduler = schedulers[source] = AdapterScheduler(hass, source)
+    return scheduler
@@ -1,24 +1,164 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfFrequency,
     UnitOfPower,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
+from .aggregates import RollingStats
+from .appliance import ApplianceState
 from .const import DOMAIN
 from .coordinator import VoltcraftDataUpdateCoordinator
+from .group import GroupData, VoltcraftGroupCoordinator
+from .metrics import Histogram
+
+
+@dataclass(frozen=True, slots=True)
+class RollingAggregate:
+    key: str
+    name: str
+    device_class: SensorDeviceClass
+    unit: str
+    state_filter_key: str
+    value_fn: Callable[[RollingStats], float]
+
+
+_POWER = (SensorDeviceClass.POWER, UnitOfPower.WATT, "rolling_power")
+_CURRENT = (SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE, "rolling_current")
+
+ROLLING_AGGREGATES: tuple[RollingAggregate, ...] = (
+    RollingAggregate("power_mean", "Power Mean", *_POWER, attrgetter("power_mean")),
+    RollingAggregate("power_min", "Power Min", *_POWER, attrgetter("power_min")),
+    RollingAggregate("power_max", "Power Max", *_POWER, attrgetter("power_max")),
+    RollingAggregate("power_stddev", "Power Std Dev", *_POWER, attrgetter("power_stddev")),
+    RollingAggregate("current_peak", "Current Peak", *_CURRENT, attrgetter("current_peak")),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class DiagnosticMetric:
+    key: str
+    name: str
+    unit: str | None
+    device_class: SensorDeviceClass | None
+    state_class: SensorStateClass | None
+    value_fn: Callable[[VoltcraftDataUpdateCoordinator], StateType | datetime]
+    histogram_fn: Callable[[VoltcraftDataUpdateCoordinator], Histogram] | None = None
+    precision: int | None = 0  # suggested display precision
+
+
+def _last_sample(coordinator: VoltcraftDataUpdateCoordinator) -> datetime | None:
+    timestamp = coordinator.metrics.last_sample_at
+    return dt_util.utc_from_timestamp(timestamp) if timestamp is not None else None
+
+
+_MS = (UnitOfTime.MILLISECONDS, SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT)
+_COUNT = (None, None, SensorStateClass.TOTAL_INCREASING)
+
+DIAGNOSTIC_METRICS: tuple[DiagnosticMetric, ...] = (
+    DiagnosticMetric(
+        "write_latency",
+        "Write Latency",
+        *_MS,
+        lambda coord: coord.metrics.write_latency.last,
+        lambda coord: coord.metrics.write_latency,
+    ),
+    DiagnosticMetric(
+        "poll_round_trip",
+        "Poll Round Trip",
+        *_MS,
+        lambda coord: coord.metrics.poll_round_trip.last,
+        lambda coord: coord.metrics.poll_round_trip,
+    ),
+    DiagnosticMetric(
+        "notification_rate",
+        "Notification Rate",
+        "notifications/s",
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda coord: coord.metrics.notification_rate.rate,
+        precision=1,
+    ),
+    DiagnosticMetric("unknown_payloads", "Unknown Payloads", *_COUNT, lambda coord: coord.metrics.unknown_frames),
+    DiagnosticMetric("poll_failures", "Poll Failures", *_COUNT, lambda coord: coord.metrics.poll_failures),
+    DiagnosticMetric("reconnects", "Reconnects", *_COUNT, lambda coord: coord.metrics.reconnects),
+    DiagnosticMetric(
+        "queue_depth",
+        "Command Queue Depth",
+        None,
+        None,
+        SensorStateClass.MEASUREMENT,
+        lambda coord: coord.queue_depth,
+    ),
+    DiagnosticMetric(
+        "last_sample", "Last Sample", None, SensorDeviceClass.TIMESTAMP, None, _last_sample, precision=None
+    ),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class GroupTotal:
+    key: str
+    name: str
+    device_class: SensorDeviceClass
+    unit: str
+    state_class: SensorStateClass
+    value_fn: Callable[[GroupData], float | None]
+    restore: bool = False  # continue from the last state after a restart
+
+
+GROUP_TOTALS: tuple[GroupTotal, ...] = (
+    GroupTotal(
+        "power",
+        "Total Power",
+        SensorDeviceClass.POWER,
+        UnitOfPower.WATT,
+        SensorStateClass.MEASUREMENT,
+        attrgetter("power"),
+    ),
+    GroupTotal(
+        "current",
+        "Total Current",
+        SensorDeviceClass.CURRENT,
+        UnitOfElectricCurrent.AMPERE,
+        SensorStateClass.MEASUREMENT,
+        attrgetter("current"),
+    ),
+    GroupTotal(
+        "energy",
+        "Total Energy",
+        SensorDeviceClass.ENERGY,
+        UnitOfEnergy.KILO_WATT_HOUR,
+        SensorStateClass.TOTAL_INCREASING,
+        attrgetter("energy"),
+        restore=True,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -26,32 +166,66 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    coordinator: VoltcraftDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    async_add_entities(
-        [
-            VoltcraftPowerSensor(coordinator),
-            VoltcraftVoltageSensor(coordinator),
-            VoltcraftCurrentSensor(coordinator),
-            VoltcraftFrequencySensor(coordinator),
-            VoltcraftPowerFactorSensor(coordinator),
-            VoltcraftEnergySensor(coordinator),
-        ]
+    coordinator: VoltcraftDataUpdateCoordinator | VoltcraftGroupCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if isinstance(coordinator, VoltcraftGroupCoordinator):
+        async_add_entities(VoltcraftGroupSensor(coordinator, total) for total in GROUP_TOTALS)
+        return
+
+    entities: list[SensorEntity] = [
+        VoltcraftPowerSensor(coordinator),
+        VoltcraftVoltageSensor(coordinator),
+        VoltcraftCurrentSensor(coordinator),
+        VoltcraftFrequencySensor(coordinator),
+        VoltcraftPowerFactorSensor(coordinator),
+        VoltcraftEnergySensor(coordinator),
+        VoltcraftAdapterUtilizationSensor(coordinator),
+        VoltcraftSwitchLatencySensor(coordinator),
+        VoltcraftApplianceSensor(coordinator),
+    ]
+    entities.extend(VoltcraftMetricSensor(coordinator, metric) for metric in DIAGNOSTIC_METRICS)
+    entities.extend(
+        VoltcraftRollingSensor(coordinator, window, aggregate)
+        for window in coordinator.rolling_windows
+        for aggregate in ROLLING_AGGREGATES
     )
+    async_add_entities(entities)
 
 
 class VoltcraftSensor(CoordinatorEntity[VoltcraftDataUpdateCoordinator], SensorEntity):
     """Base class for sensors."""
 
+    _state_filter_key: str
+
     def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._attr_device_info = coordinator.device_info
+        self._state_filter = coordinator.create_state_filter(self._state_filter_key)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state unless the state filter suppresses it."""
+        if self._state_filter is None or self._state_filter.should_publish(self.native_value, self.available):
+            super()._handle_coordinator_update()
+
+
+class VoltcraftMeasurementSensor(VoltcraftSensor, RestoreSensor):
+    """Sensor showing its last known value until the first measurement after a restart arrives."""
 
+    _restored_value: float | None = None
 
-class VoltcraftPowerSensor(VoltcraftSensor):
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known value."""
+        await super().async_added_to_hass()
+        last = await self.async_get_last_sensor_data()
+        if last is not None and isinstance(last.native_value, int | float | Decimal):
+            self._restored_value = float(last.native_value)
+
+
+class VoltcraftPowerSensor(VoltcraftMeasurementSensor):
     """Power consumption sensor."""
 
+    _state_filter_key = "power"
     _attr_device_class = SensorDeviceClass.POWER
     _attr_native_unit_of_measurement = UnitOfPower.WATT
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -65,12 +239,13 @@ class VoltcraftPowerSensor(VoltcraftSensor):
     @property
     def native_value(self) -> float | None:
         """Return the power value."""
-        return self.coordinator.data.power if self.coordinator.data else None
+        return self.coordinator.data.power if self.coordinator.data else self._restored_value
 
 
-class VoltcraftVoltageSensor(VoltcraftSensor):
+class VoltcraftVoltageSensor(VoltcraftMeasurementSensor):
     """Voltage sensor."""
 
+    _state_filter_key = "voltage"
     _attr_device_class = SensorDeviceClass.VOLTAGE
     _attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -84,12 +259,13 @@ class VoltcraftVoltageSensor(VoltcraftSensor):
     @property
     def native_value(self) -> float | None:
         """Return the voltage value."""
-        return self.coordinator.data.voltage if self.coordinator.data else None
+        return self.coordinator.data.voltage if self.coordinator.data else self._restored_value
 
 
-class VoltcraftCurrentSensor(VoltcraftSensor):
+class VoltcraftCurrentSensor(VoltcraftMeasurementSensor):
     """Current sensor."""
 
+    _state_filter_key = "current"
     _attr_device_class = SensorDeviceClass.CURRENT
     _attr_native_unit_of_measurement = UnitOfElectricCurrent.AMPERE
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -103,12 +279,13 @@ class VoltcraftCurrentSensor(VoltcraftSensor):
     @property
     def native_value(self) -> float | None:
         """Return the current value."""
-        return self.coordinator.data.current if self.coordinator.data else None
+        return self.coordinator.data.current if self.coordinator.data else self._restored_value
 
 
-class VoltcraftFrequencySensor(VoltcraftSensor):
+class VoltcraftFrequencySensor(VoltcraftMeasurementSensor):
     """Frequency sensor."""
 
+    _state_filter_key = "frequency"
     _attr_device_class = SensorDeviceClass.FREQUENCY
     _attr_native_unit_of_measurement = UnitOfFrequency.HERTZ
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -120,14 +297,15 @@ class VoltcraftFrequencySensor(VoltcraftSensor):
         self._attr_name = "Frequency"
 
     @property
-    def native_value(self) -> int | None:
+    def native_value(self) -> float | None:
         """Return the frequency value."""
-        return self.coordinator.data.frequency if self.coordinator.data else None
+        return self.coordinator.data.frequency if self.coordinator.data else self._restored_value
 
 
-class VoltcraftPowerFactorSensor(VoltcraftSensor):
+class VoltcraftPowerFactorSensor(VoltcraftMeasurementSensor):
     """Power factor sensor."""
 
+    _state_filter_key = "power_factor"
     _attr_device_class = SensorDeviceClass.POWER_FACTOR
     _attr_native_unit_of_measurement = None
     _attr_state_class = SensorStateClass.MEASUREMENT
@@ -141,13 +319,15 @@ class VoltcraftPowerFactorSensor(VoltcraftSensor):
     @property
     def native_value(self) -> float | None:
         """Return the power factor value."""
-        return self.coordinator.data.power_factor if self.coordinator.data else None
+        return self.coordinator.data.power_factor if self.coordinator.data else self._restored_value
 
 
-class VoltcraftEnergySensor(VoltcraftSensor):
+class VoltcraftEnergySensor(VoltcraftMeasurementSensor):
     """Total energy consumption sensor."""
 
+    _state_filter_key = "energy"
     _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_suggested_display_precision = 3
     _attr_entity_registry_enabled_default = False
     _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
@@ -160,5 +340,232 @@ class VoltcraftEnergySensor(VoltcraftSensor):
 
     @property
     def native_value(self) -> float | None:
-        """Return the total energy value."""
-        return self.coordinator.data.consumed_energy if self.coordinator.data else None
+        """Return the total energy value (never decreasing, unlike the device counter)."""
+        return self.coordinator.data.total_energy if self.coordinator.data else self._restored_value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the raw device counter."""
+        if not self.coordinator.data:
+            return None
+        return {"device_counter": self.coordinator.data.consumed_energy}
+
+
+class VoltcraftAdapterUtilizationSensor(VoltcraftSensor):
+    """How busy the Bluetooth adapter used by the device is (shared by all plugs on that adapter)."""
+
+    _state_filter_key = "adapter_utilization"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
+        """Initialize the adapter utilization sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_adapter_utilization"
+        self._attr_name = "Adapter Utilization"
+
+    @property
+    def available(self) -> bool:
+        """Return True, utilization is known even when the device is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> float:
+        """Return the adapter utilization."""
+        return self.coordinator.scheduler.utilization * 100
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return details about the adapter."""
+        scheduler = self.coordinator.scheduler
+        return {
+            "adapter": scheduler.source,
+            "plugs": scheduler.member_count,
+            "active_operations": scheduler.active_operations,
+            "connections": scheduler.connection_count,
+            "connection_evictions": scheduler.evictions,
+        }
+
+
+class VoltcraftSwitchLatencySensor(VoltcraftSensor):
+    """Time from the last switch command until its confirmed state was published."""
+
+    _state_filter_key = "switch_latency"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 0
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
+        """Initialize the switch latency sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_switch_latency"
+        self._attr_name = "Switch Latency"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the switch latency."""
+        latency = self.coordinator.last_switch_latency
+        return latency * 1000 if latency is not None else None
+
+
+class VoltcraftMetricSensor(VoltcraftSensor):
+    """Performance counter of the device connection."""
+
+    _state_filter_key = "metric"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator, metric: DiagnosticMetric) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator)
+        self._metric = metric
+        self._attr_device_class = metric.device_class
+        self._attr_native_unit_of_measurement = metric.unit
+        self._attr_state_class = metric.state_class
+        self._attr_unique_id = f"{coordinator.mac}_{metric.key}"
+        self._attr_name = metric.name
+        self._attr_suggested_display_precision = metric.precision
+
+    @property
+    def available(self) -> bool:
+        """Return True, the counters are most interesting while the device is unreachable."""
+        return True
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the metric value."""
+        return self._metric.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the percentiles of latency metrics."""
+        if self._metric.histogram_fn is None:
+            return None
+        histogram = self._metric.histogram_fn(self.coordinator)
+        return {
+            "count": histogram.count,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+            "max": histogram.max if histogram.count else None,
+        }
+
+
+class VoltcraftRollingSensor(VoltcraftSensor):
+    """Aggregate of the samples of a rolling window (kept in memory, no database queries)."""
+
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 2
+
+    def __init__(
+        self,
+        coordinator: VoltcraftDataUpdateCoordinator,
+        window: int,
+        aggregate: RollingAggregate,
+    ) -> None:
+        """Initialize the rolling aggregate sensor."""
+        # Set before the base class picks the state filter
+        self._state_filter_key = aggregate.state_filter_key
+        super().__init__(coordinator)
+        self._window = window
+        self._aggregate = aggregate
+        self._attr_device_class = aggregate.device_class
+        self._attr_native_unit_of_measurement = aggregate.unit
+        self._attr_unique_id = f"{coordinator.mac}_{aggregate.key}_{window}s"
+        self._attr_name = f"{aggregate.name} {_format_window(window)}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the aggregate value."""
+        stats = self.coordinator.rolling_stats(self._window)
+        return self._aggregate.value_fn(stats) if stats else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the number of samples in the window."""
+        stats = self.coordinator.rolling_stats(self._window)
+        return {"samples": stats.samples if stats else 0}
+
+
+def _format_window(seconds: int) -> str:
+    if seconds % 3600 == 0:
+        return f"{seconds // 3600} h"
+    if seconds % 60 == 0:
+        return f"{seconds // 60} min"
+    return f"{seconds} s"
+
+
+class VoltcraftApplianceSensor(VoltcraftSensor):
+    """Cycle state of the appliance behind the plug, detected from its power draw."""
+
+    _state_filter_key = "appliance"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [state.value for state in ApplianceState]
+
+    def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
+        """Initialize the appliance sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.mac}_appliance"
+        self._attr_name = "Appliance"
+
+    @property
+    def native_value(self) -> str:
+        """Return the appliance state."""
+        return self.coordinator.appliance.state.value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the running and the last cycle, both only change when a cycle starts or ends."""
+        appliance = self.coordinator.appliance
+        attributes: dict[str, Any] = {
+            "cycle_started": dt_util.utc_from_timestamp(appliance.cycle.started_at) if appliance.cycle else None,
+        }
+        if (last := appliance.last_cycle) is not None:
+            attributes["last_cycle_started"] = dt_util.utc_from_timestamp(last.started_at)
+            attributes["last_cycle_duration"] = round(last.duration)
+            attributes["last_cycle_energy"] = round(last.energy, 2)
+            attributes["last_cycle_peak_power"] = last.peak_power
+        return attributes
+
+
+class VoltcraftGroupSensor(CoordinatorEntity[VoltcraftGroupCoordinator], RestoreSensor):
+    """Total over the members of a group, from samples taken in the same polling round."""
+
+    def __init__(self, coordinator: VoltcraftGroupCoordinator, total: GroupTotal) -> None:
+        super().__init__(coordinator)
+        self._total = total
+        self._attr_unique_id = f"group_{coordinator.config_entry.entry_id}_{total.key}"
+        self._attr_name = total.name
+        self._attr_device_class = total.device_class
+        self._attr_native_unit_of_measurement = total.unit
+        self._attr_state_class = total.state_class
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if not self._total.restore:
+            return
+        last = await self.async_get_last_sensor_data()
+        if last is not None and isinstance(last.native_value, int | float | Decimal):
+            self.coordinator.aggregate.restore_energy(float(last.native_value))
+
+    @property
+    def native_value(self) -> float | None:
+        return self._total.value_fn(self.coordinator.data) if self.coordinator.data else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        data = self.coordinator.data
+        if not data:
+            return None
+        return {
+            "members": len(self.coordinator.members),
+            "members_reporting": len(data.fresh),
+            "sample_spread": round(data.spread, 3) if data.spread is not None else None,
+        }
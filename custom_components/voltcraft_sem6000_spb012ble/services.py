@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict
+from datetime import time as dt_time
+from pathlib import Path
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID, ATTR_ENTITY_ID, ATTR_STATE
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BURST_DEFAULT_DURATION,
+    BURST_MAX_DURATION,
+    DOMAIN,
+    SCHEDULE_SLOTS,
+    SERVICE_CAPTURE_BURST,
+    SERVICE_GET_ROLLING_STATISTICS,
+    SERVICE_IMPORT_HISTORY,
+    SERVICE_PUSH_SCHEDULE,
+    SERVICE_SET_OUTLETS,
+)
+from .coordinator import VoltcraftDataUpdateCoordinator
+from .protocol import SwitchModes
+from .timers import WEEKDAYS, compile_events, entry_as_dict, range_events
+
+ATTR_AT = "at"
+ATTR_DURATION = "duration"
+ATTR_TO_FILE = "to_file"
+ATTR_SCHEDULE = "schedule"
+ATTR_TIMERS = "timers"
+ATTR_WEEKDAYS = "weekdays"
+
+DEVICES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+SET_OUTLETS_SCHEMA = DEVICES_SCHEMA.extend(
+    {
+        vol.Required(ATTR_STATE): cv.boolean,
+    }
+)
+
+CAPTURE_BURST_SCHEMA = DEVICES_SCHEMA.extend(
+    {
+        vol.Optional(ATTR_DURATION, default=BURST_DEFAULT_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=BURST_MAX_DURATION)
+        ),
+        vol.Optional(ATTR_TO_FILE, default=False): cv.boolean,
+    }
+)
+
+TIMER_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_AT): cv.time,
+        vol.Required(ATTR_STATE): cv.boolean,
+        vol.Optional(ATTR_WEEKDAYS, default=list(WEEKDAYS)): vol.All(cv.ensure_list, [vol.In(WEEKDAYS)]),
+    }
+)
+
+PUSH_SCHEDULE_SCHEMA = DEVICES_SCHEMA.extend(
+    {
+        vol.Exclusive(ATTR_SCHEDULE, "schedule"): cv.entity_domain("schedule"),
+        vol.Exclusive(ATTR_TIMERS, "schedule"): vol.All(cv.ensure_list, [TIMER_SCHEMA]),
+    }
+)
+
+
+@callback
+def async_get_coordinators(hass: HomeAssistant, device_ids: list[str]) -> dict[str, VoltcraftDataUpdateCoordinator]:
+    """Return the coordinators of the given devices, by device id."""
+    device_registry = dr.async_get(hass)
+    loaded: dict[str, VoltcraftDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+
+    coordinators: dict[str, VoltcraftDataUpdateCoordinator] = {}
+    for device_id in device_ids:
+        device = device_registry.async_get(device_id)
+        if device is None:
+            raise ServiceValidationError(f"Unknown device {device_id}")
+
+        coordinator = next(
+            (
+                coord
+                for entry_id in device.config_entries
+                if isinstance(coord := loaded.get(entry_id), VoltcraftDataUpdateCoordinator)
+            ),
+            None,
+        )
+        if coordinator is None:
+            raise ServiceValidationError(f"Device {device.name} is not a loaded {DOMAIN} device")
+        coordinators[device_id] = coordinator
+
+    return coordinators
+
+
+async def async_set_outlet(coordinator: VoltcraftDataUpdateCoordinator, mode: SwitchModes) -> dict[str, Any]:
+    """Switch one outlet and return the outcome, errors are reported instead of raised."""
+    started = time.monotonic()
+    try:
+        await coordinator.async_send_switch_command(mode)
+    except HomeAssistantError as err:
+        return {
+            "success": False,
+            "error": str(err),
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+            "adapter": coordinator.scheduler.source,
+        }
+
+    data = coordinator.data
+    return {
+        "success": True,
+        "is_on": data.is_on if data else None,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "adapter": coordinator.scheduler.source,
+    }
+
+
+async def async_get_schedule_ranges(hass: HomeAssistant, entity_id: str) -> dict[int, list[tuple[dt_time, dt_time]]]:
+    """Return the on-ranges of a schedule helper by weekday (0 for Monday)."""
+    response = await hass.services.async_call(
+        "schedule", "get_schedule", {ATTR_ENTITY_ID: entity_id}, blocking=True, return_response=True
+    )
+    days: dict[str, list[dict[str, Any]]] = response[entity_id]  # type: ignore[index,assignment]
+    return {
+        weekday: [(_as_time(time_range["from"]), _as_time(time_range["to"])) for time_range in days.get(day, [])]
+        for weekday, day in enumerate(WEEKDAYS)
+    }
+
+
+def _as_time(value: dt_time | str) -> dt_time:
+    if isinstance(value, dt_time):
+        return value
+    # The end of a range reaching midnight is stored as 24:00
+    return dt_time.max if value.startswith("24:00") else cv.time(value)
+
+
+async def async_capture_burst(
+    hass: HomeAssistant, coordinator: VoltcraftDataUpdateCoordinator, duration: float, to_file: bool
+) -> dict[str, Any]:
+    """Run a burst capture, return its samples or write them to a CSV file in the config directory."""
+    buffer = await coordinator.async_capture_burst(duration)
+    if not to_file:
+        return buffer.as_dict()
+
+    timestamp = dt_util.now().strftime("%Y%m%d-%H%M%S")
+    path = Path(hass.config.path(DOMAIN, f"burst_{coordinator.mac.replace(':', '')}_{timestamp}.csv"))
+    await hass.async_add_executor_job(buffer.write_csv, path)
+    return {**buffer.summary(), "file": str(path)}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    async def async_import_history(call: ServiceCall) -> ServiceResponse:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_DEVICE_ID])
+        return {
+            device_id: {"imported_hours": await coordinator.async_import_history()}
+            for device_id, coordinator in coordinators.items()
+        }
+
+    async def async_get_rolling_statistics(call: ServiceCall) -> ServiceResponse:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_DEVICE_ID])
+        return {
+            device_id: {
+                str(window): asdict(stats) if (stats := coordinator.rolling_stats(window)) else None
+                for window in coordinator.rolling_windows
+            }
+            for device_id, coordinator in coordinators.items()
+        }
+
+    async def async_set_outlets(call: ServiceCall) -> ServiceResponse:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_DEVICE_ID])
+        mode = SwitchModes.ON if call.data[ATTR_STATE] else SwitchModes.OFF
+        # All plugs at once, the adapter schedulers bound the writes in flight on each adapter or proxy
+        results = await asyncio.gather(*(async_set_outlet(coordinator, mode) for coordinator in coordinators.values()))
+        return dict(zip(coordinators, results, strict=True))
+
+    async def async_push_schedule(call: ServiceCall) -> ServiceResponse:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_DEVICE_ID])
+        if (entity_id := call.data.get(ATTR_SCHEDULE)) is not None:
+            events = range_events(await async_get_schedule_ranges(hass, entity_id))
+        else:
+            events = [
+                (WEEKDAYS.index(day), timer[ATTR_AT], timer[ATTR_STATE])
+                for timer in call.data.get(ATTR_TIMERS, [])
+                for day in timer[ATTR_WEEKDAYS]
+            ]
+
+        entries = compile_events(events)
+        if len(entries) > SCHEDULE_SLOTS:
+            raise ServiceValidationError(
+                f"The schedule needs {len(entries)} timers, the plugs store at most {SCHEDULE_SLOTS}"
+            )
+
+        await asyncio.gather(*(coordinator.async_push_schedule(entries) for coordinator in coordinators.values()))
+        return {device_id: {"timers": [entry_as_dict(entry) for entry in entries]} for device_id in coordinators}
+
+    async def async_capture_bursts(call: ServiceCall) -> ServiceResponse:
+        coordinators = async_get_coordinators(hass, call.data[ATTR_DEVICE_ID])
+        results = await asyncio.gather(
+            *(
+                async_capture_burst(hass, coordinator, call.data[ATTR_DURATION], call.data[ATTR_TO_FILE])
+                for coordinator in coordinators.values()
+            )
+        )
+        return dict(zip(coordinators, results, strict=True))
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ROLLING_STATISTICS,
+        async_get_rolling_statistics,
+        schema=DEVICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        async_import_history,
+        schema=DEVICES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_OUTLETS,
+        async_set_outlets,
+        schema=SET_OUTLETS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PUSH_SCHEDULE,
+        async_push_schedule,
+        schema=PUSH_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CAPTURE_BURST,
+        async_capture_bursts,
+        schema=CAPTURE_BURST_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
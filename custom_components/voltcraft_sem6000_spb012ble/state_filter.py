@@ -0,0 +1,55 @@
+"""Deadband and rate limiting of entity state writes."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class Deadband:
+    absolute: float = 0.0
+    relative: float = 0.0  # fraction of the last published value
+
+    def exceeded(self, previous: Any, current: Any) -> bool:
+        if not isinstance(previous, int | float) or not isinstance(current, int | float):
+            return bool(previous != current)
+
+        change = abs(current - previous)
+        if change == 0:
+            return False
+        return change > max(self.absolute, self.relative * abs(previous))
+
+
+class StateFilter:
+    def __init__(self, deadband: Deadband, min_interval: float, max_interval: float) -> None:
+        self._deadband = deadband
+        self._min_interval = min_interval  # seconds
+        self._max_interval = max_interval  # seconds, 0 disables the heartbeat
+        self._published = False
+        self._last_value: Any = None
+        self._last_available = False
+        self._last_publish = 0.0
+
+    def should_publish(self, value: Any, available: bool) -> bool:
+        """Return True if the state should be written, the value is then remembered as published."""
+        now = time.monotonic()
+        if self._published and available == self._last_available and not self._is_due(value, now):
+            return False
+
+        self._published = True
+        self._last_value = value
+        self._last_available = available
+        self._last_publish = now
+        return True
+
+    def _is_due(self, value: Any, now: float) -> bool:
+        elapsed = now - self._last_publish
+        if self._max_interval and elapsed >= self._max_interval:
+            return True
+        if (value is None) != (self._last_value is None):
+            return True
+        if elapsed < self._min_interval:
+            return False
+        return self._deadband.exceeded(self._last_value, value)
@@ -5,8 +5,10 @@ from typing import Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
@@ -25,7 +27,7 @@ async def async_setup_entry(
     async_add_entities([MainSwitchEntity(coordinator)])
 
 
-class MainSwitchEntity(CoordinatorEntity[VoltcraftDataUpdateCoordinator], SwitchEntity):
+class MainSwitchEntity(CoordinatorEntity[VoltcraftDataUpdateCoordinator], SwitchEntity, RestoreEntity):
     _attr_device_class = SwitchDeviceClass.OUTLET
 
     def __init__(self, coordinator: VoltcraftDataUpdateCoordinator) -> None:
@@ -33,13 +35,42 @@ class MainSwitchEntity(CoordinatorEntity[VoltcraftDataUpdateCoordinator], Switch
         self._attr_unique_id = coordinator.mac
         self._attr_name = "Power switch"
         self._attr_device_info = coordinator.device_info
+        self._state_filter = coordinator.create_state_filter("switch")
+        # Assumed state while a switch command waits for its confirmation
+        self._optimistic_is_on: bool | None = None
+        # Last known state until the first measurement after a restart arrives
+        self._restored_is_on: bool | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state is not None and last_state.state in (STATE_ON, STATE_OFF):
+            self._restored_is_on = last_state.state == STATE_ON
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._state_filter is None or self._state_filter.should_publish(self.is_on, self.available):
+            super()._handle_coordinator_update()
 
     @property
     def is_on(self) -> bool | None:
-        return self.coordinator.data.is_on if self.coordinator.data else None
+        if self._optimistic_is_on is not None:
+            return self._optimistic_is_on
+        return self.coordinator.data.is_on if self.coordinator.data else self._restored_is_on
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        await self.coordinator.async_send_switch_command(SwitchModes.ON)
+        await self._async_switch(SwitchModes.ON, True)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await self.coordinator.async_send_switch_command(SwitchModes.OFF)
+        await self._async_switch(SwitchModes.OFF, False)
+
+    async def _async_switch(self, mode: SwitchModes, is_on: bool) -> None:
+        """Show the requested state right away, the measurement confirming the switch replaces it."""
+        self._optimistic_is_on = is_on
+        self.async_write_ha_state()
+        try:
+            await self.coordinator.async_send_switch_command(mode)
+        finally:
+            # Confirmed, or rolled back to the last known state if the command failed
+            self._optimistic_is_on = None
+            self.async_write_ha_state()
@@ -0,0 +1,84 @@
+"""Compilation of switching schedules into the timers stored on the plug."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from .const import DOMAIN
+from .protocol import ScheduleEntry
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+ALL_WEEKDAYS = (1 << len(WEEKDAYS)) - 1
+
+
+def schedule_storage_key(entry_id: str) -> str:
+    return f"{DOMAIN}.{entry_id}.schedule"
+
+
+def compile_events(events: Iterable[tuple[int, time, bool]]) -> list[ScheduleEntry]:
+    """Merge (weekday with 0 for Monday, time, switch on) events into timers, ordered by time of day."""
+    masks: dict[tuple[int, int, bool], int] = {}
+    for weekday, at, is_on in events:
+        key = (at.hour, at.minute, is_on)
+        masks[key] = masks.get(key, 0) | (1 << weekday)
+    return [
+        ScheduleEntry(is_on=is_on, hour=hour, minute=minute, weekdays=mask)
+        for (hour, minute, is_on), mask in sorted(masks.items())
+    ]
+
+
+def range_events(ranges_by_weekday: Mapping[int, Sequence[tuple[time, time]]]) -> list[tuple[int, time, bool]]:
+    """Turn the on-ranges of each weekday (as a schedule helper has them) into switch on and off events.
+
+    A range ending at midnight that continues in a range of the next day starting at midnight keeps the
+    outlet on, neither the off nor the on event is emitted.
+    """
+    events: list[tuple[int, time, bool]] = []
+    for weekday, ranges in ranges_by_weekday.items():
+        previous_day = ranges_by_weekday.get((weekday - 1) % len(WEEKDAYS), ())
+        next_day = ranges_by_weekday.get((weekday + 1) % len(WEEKDAYS), ())
+        for start, end in ranges:
+            if start != time.min or not any(previous_end == time.max for _, previous_end in previous_day):
+                events.append((weekday, start, True))
+            if end != time.max:
+                events.append((weekday, end, False))
+            elif not any(next_start == time.min for next_start, _ in next_day):
+                # 24:00 is midnight of the next day
+                events.append(((weekday + 1) % len(WEEKDAYS), time.min, False))
+    return events
+
+
+def timer_due(entries: Iterable[ScheduleEntry], is_on: bool, start: datetime, end: datetime) -> bool:
+    """Return True if a timer switching the outlet to is_on fires between start and end (local time).
+
+    A timer fires at some point within its minute, so a timer of the minute start falls into counts too.
+    """
+    start = start.replace(second=0, microsecond=0)
+    for entry in entries:
+        if entry.is_on != is_on:
+            continue
+        day = start.date()
+        while day <= end.date():
+            fires_at = datetime.combine(day, time(entry.hour, entry.minute), start.tzinfo)
+            if entry.weekdays & (1 << day.weekday()) and start <= fires_at <= end:
+                return True
+            day += timedelta(days=1)
+    return False
+
+
+def entry_as_dict(entry: ScheduleEntry) -> dict[str, Any]:
+    return {
+        "state": "on" if entry.is_on else "off",
+        "at": f"{entry.hour:02d}:{entry.minute:02d}",
+        "weekdays": [day for index, day in enumerate(WEEKDAYS) if entry.weekdays & (1 << index)],
+    }
+
+
+def entry_from_dict(data: Mapping[str, Any]) -> ScheduleEntry:
+    hour, minute = (int(part) for part in data["at"].split(":"))
+    weekdays = 0
+    for day in data["weekdays"]:
+        weekdays |= 1 << WEEKDAYS.index(day)
+    return ScheduleEntry(is_on=data["state"] == "on", hour=hour, minute=minute, weekdays=weekdays)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import asdict
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, LIVE_MAX_BATCH_DELAY, LIVE_MAX_BATCH_SIZE
+from .coordinator import VoltcraftData
+from .services import async_get_coordinators
+
+ATTR_MIN_INTERVAL = "min_interval"
+ATTR_BATCH_SIZE = "batch_size"
+ATTR_MAX_DELAY = "max_delay"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, websocket_subscribe_measurements)
+
+
+class MeasurementStream:
+    """Samples of one subscription, downsampled per device and sent in batches."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        send: Callable[[dict[str, Any]], None],
+        min_interval: float,
+        batch_size: int,
+        max_delay: float,
+    ) -> None:
+        self._hass = hass
+        self._send = send
+        self._min_interval = min_interval
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._last_sample_at: dict[str, float] = {}  # unix timestamp of the last accepted sample, by device id
+        self._batch: list[dict[str, Any]] = []
+        self._cancel_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def add(self, device_id: str, timestamp: float, data: VoltcraftData) -> None:
+        last = self._last_sample_at.get(device_id)
+        if last is not None and timestamp - last < self._min_interval:
+            return
+        self._last_sample_at[device_id] = timestamp
+
+        self._batch.append({"device_id": device_id, "time": timestamp, **asdict(data)})
+        if len(self._batch) >= self._batch_size:
+            self.flush()
+        elif self._cancel_flush is None:
+            self._cancel_flush = async_call_later(self._hass, self._max_delay, self._flush_later)
+
+    @callback
+    def _flush_later(self, _now: Any) -> None:
+        self._cancel_flush = None
+        self.flush()
+
+    @callback
+    def flush(self) -> None:
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self._send({"samples": batch})
+
+    @callback
+    def close(self) -> None:
+        if self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+        self._batch.clear()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_measurements",
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        # Seconds between two samples of a device, 0 streams every sample
+        vol.Optional(ATTR_MIN_INTERVAL, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_BATCH_SIZE, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=LIVE_MAX_BATCH_SIZE)),
+        # Seconds before an incomplete batch is sent anyway
+        vol.Optional(ATTR_MAX_DELAY, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=LIVE_MAX_BATCH_DELAY)
+        ),
+    }
+)
+@callback
+def websocket_subscribe_measurements(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream the measurements of the given plugs as they are decoded, bypassing the state machine."""
+    try:
+        coordinators = async_get_coordinators(hass, msg[ATTR_DEVICE_ID])
+    except ServiceValidationError as err:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(err))
+        return
+
+    msg_id: int = msg["id"]
+    stream = MeasurementStream(
+        hass,
+        lambda event: connection.send_message(websocket_api.event_message(msg_id, event)),
+        msg[ATTR_MIN_INTERVAL],
+        msg[ATTR_BATCH_SIZE],
+        msg[ATTR_MAX_DELAY],
+    )
+    unsubscribers = [
+        coordinator.async_subscribe_measurements(partial(stream.add, device_id))
+        for device_id, coordinator in coordinators.items()
+    ]
+
+    @callback
+    def _unsubscribe() -> None:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+        stream.close()
+
+    connection.subscriptions[msg_id] = _unsubscribe
+    connection.send_result(msg_id)
@@ -0,0 +1,163 @@
+"""
+End-to-end load benchmark: N coordinators polling simulated plugs inside a test Home Assistant.
+
+Needs the development dependencies (pip install -r requirements-dev.txt). Run it from the repository
+root, for example:
+
+    python -m scripts.benchmark --plugs 20 --adapters 2 --duration 60 --interval 1 --mtu 20 --drop-rate 0.01
+
+It reports notification throughput, poll-to-state latency percentiles and CPU time and memory per
+plug. Compare the numbers of two commits on the same machine, absolute values vary between hosts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import resource
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+
+from bleak import BleakClient
+from bleak.backends.device import BLEDevice
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_test_home_assistant
+
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+
+from custom_components.voltcraft_sem6000_spb012ble.const import DOMAIN
+from custom_components.voltcraft_sem6000_spb012ble.coordinator import (
+    VoltcraftData,
+    VoltcraftDataUpdateCoordinator,
+)
+
+from .fake_plug import FakeBleakClient, FakePlug, FakePlugConfig
+
+
+class BenchmarkCoordinator(VoltcraftDataUpdateCoordinator):
+    """Coordinator connected to a FakePlug, recording the poll-to-state latency."""
+
+    def __init__(self, hass: HomeAssistant, entry: MockConfigEntry, ble_device: BLEDevice, plug: FakePlug) -> None:
+        super().__init__(hass, entry, ble_device)
+        self.plug = plug
+        self.fake_client: FakeBleakClient | None = None
+        self.latencies: list[float] = []
+        self._poll_started: float | None = None
+
+    def _get_ble_device(self) -> BLEDevice:
+        return self._ble_device
+
+    async def _async_establish_client(self, ble_device: BLEDevice) -> BleakClient:
+        self.fake_client = FakeBleakClient(self.plug, disconnected_callback=self._handle_disconnect)
+        return self.fake_client  # type: ignore[return-value]
+
+    def scanner_rssi(self) -> dict[str, int]:
+        # No Bluetooth integration in the test instance, and no other path to move to
+        return {}
+
+    async def _async_update_data(self) -> VoltcraftData | None:
+        self._poll_started = time.perf_counter()
+        return await super()._async_update_data()
+
+    def record_state(self) -> None:
+        if self._poll_started is not None and self.last_update_success:
+            self.latencies.append(time.perf_counter() - self._poll_started)
+            self._poll_started = None
+
+
+async def _async_run(args: argparse.Namespace) -> None:
+    async with async_test_home_assistant() as hass:
+        if args.trace_memory:
+            tracemalloc.start()
+        gc.collect()
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        coordinators: list[BenchmarkCoordinator] = []
+        for index in range(args.plugs):
+            mac = f"AA:BB:CC:00:{index // 256:02X}:{index % 256:02X}"
+            entry = MockConfigEntry(domain=DOMAIN, data={CONF_MAC: mac}, unique_id=mac)
+            entry.add_to_hass(hass)
+            plug = FakePlug(
+                FakePlugConfig(
+                    latency=args.latency,
+                    jitter=args.jitter,
+                    drop_rate=args.drop_rate,
+                    mtu=args.mtu,
+                    hw_version=args.hw,
+                )
+            )
+            ble_device = BLEDevice(mac, f"Plug {index}", {"source": f"hci{index % args.adapters}"})
+            coordinator = BenchmarkCoordinator(hass, entry, ble_device, plug)
+            coordinator.update_interval = timedelta(seconds=args.interval)
+            await coordinator.async_setup()
+            await coordinator.async_start()
+            coordinator.async_add_listener(coordinator.record_state)
+            coordinators.append(coordinator)
+
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        await asyncio.sleep(args.duration)
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+
+        traced = tracemalloc.get_traced_memory()[0] if args.trace_memory else None
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    _report(args, coordinators, wall, cpu, rss_after - rss_before, traced)
+
+
+def _report(
+    args: argparse.Namespace,
+    coordinators: list[BenchmarkCoordinator],
+    wall: float,
+    cpu: float,
+    rss_growth_kib: int,
+    traced: int | None,
+) -> None:
+    plugs = len(coordinators)
+    notifications = sum(coordinator.plug.stats.notifications for coordinator in coordinators)
+    commands = sum(coordinator.plug.stats.commands for coordinator in coordinators)
+    dropped = sum(coordinator.plug.stats.dropped for coordinator in coordinators)
+    latencies = sorted(latency for coordinator in coordinators for latency in coordinator.latencies)
+
+    print(f"plugs: {plugs} on {args.adapters} adapter(s), {wall:.1f} s")
+    print(f"commands: {commands} ({commands / wall:.1f}/s), replies dropped: {dropped}")
+    print(f"notifications: {notifications} ({notifications / wall:.1f}/s)")
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(
+            f"poll-to-state latency ms: p50 {quantiles[49] * 1000:.1f}  p90 {quantiles[89] * 1000:.1f}"
+            f"  p99 {quantiles[98] * 1000:.1f}  max {latencies[-1] * 1000:.1f}  (n={len(latencies)})"
+        )
+    else:
+        print("poll-to-state latency: no successful polls")
+    print(f"cpu: {cpu:.2f} s ({cpu / wall * 100:.1f}% of one core), {cpu / plugs * 1000:.1f} ms per plug")
+    print(f"max rss growth: {rss_growth_kib / plugs:.1f} KiB per plug")
+    if traced is not None:
+        print(f"traced memory: {traced / plugs / 1024:.1f} KiB per plug")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plugs", type=int, default=10, help="number of simulated plugs")
+    parser.add_argument("--adapters", type=int, default=1, help="number of Bluetooth adapters the plugs are spread on")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--interval", type=float, default=1.0, help="poll interval in seconds")
+    parser.add_argument("--latency", type=float, default=0.02, help="reply latency of the plugs in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="random extra reply latency in seconds")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="probability that a reply is lost")
+    parser.add_argument("--mtu", type=int, default=None, help="split replies into notifications of this many bytes")
+    parser.add_argument("--hw", type=int, choices=(2, 3), default=2, help="hardware version (energy field length)")
+    parser.add_argument("--trace-memory", action="store_true", help="measure allocations with tracemalloc (slower)")
+    asyncio.run(_async_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
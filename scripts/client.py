@@ -0,0 +1,134 @@
+"""
+Asyncio client for one plug on top of plain bleak, for polling, switching and profiling plugs from a shell.
+
+Uses the same building blocks as the coordinator (frame encoding and FrameDecoder from protocol.py,
+CommandQueue for one command in flight at a time). Importing the integration's modules needs the
+development requirements (Home Assistant is imported, not run). Reconnection, adapter scheduling and
+connection slots are left to the caller.
+
+    async with VoltcraftClient("AA:BB:CC:DD:EE:FF") as client:
+        data = await client.measure()
+        await client.switch(True)
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+from collections.abc import Callable
+from typing import Any, Self, cast
+
+from bleak import BleakClient, BleakGATTCharacteristic
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakError
+
+from custom_components.voltcraft_sem6000_spb012ble.command_queue import CommandPriority, CommandQueue
+from custom_components.voltcraft_sem6000_spb012ble.const import (
+    COMMAND_UUID,
+    NOTIFY_UUID,
+    RESPONSE_TIMEOUT,
+    SWITCH_RESPONSE_TIMEOUT,
+)
+from custom_components.voltcraft_sem6000_spb012ble.coordinator import VoltcraftData
+from custom_components.voltcraft_sem6000_spb012ble.protocol import (
+    Command,
+    FrameDecoder,
+    MeasureNotifyPayload,
+    ParsedNotifyPayload,
+    SwitchModes,
+    payload_command,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 20.0  # seconds
+
+
+class VoltcraftClient:
+    """Connection to one plug: requests with their answers, and every notification to subscribers."""
+
+    def __init__(
+        self,
+        device: BLEDevice | str,
+        response_timeout: float = RESPONSE_TIMEOUT,
+        disconnected_callback: Callable[[VoltcraftClient], None] | None = None,
+    ) -> None:
+        self._client = BleakClient(device, disconnected_callback=self._handle_disconnect)
+        self._response_timeout = response_timeout
+        self._disconnected_callback = disconnected_callback
+        self._decoder = FrameDecoder()
+        self._queue = CommandQueue(self._async_write, contextlib.nullcontext)
+        self._subscribers: list[Callable[[ParsedNotifyPayload], None]] = []
+        self.unsolicited = 0  # notifications no request was waiting for
+
+    @property
+    def address(self) -> str:
+        return self._client.address
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client.is_connected
+
+    async def connect(self, timeout: float = CONNECT_TIMEOUT) -> None:
+        await self._client.connect(timeout=timeout)
+        # Frames split across notifications must not be completed with data from another connection
+        self._decoder = FrameDecoder()
+        try:
+            await self._client.start_notify(NOTIFY_UUID, self._handle_notify)
+        except BleakError:
+            await self._client.disconnect()
+            raise
+        _LOGGER.debug("%s: Connected", self.address)
+
+    async def disconnect(self) -> None:
+        self._queue.cancel()
+        await self._client.disconnect()
+
+    async def __aenter__(self) -> Self:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.disconnect()
+
+    async def request(
+        self,
+        frame: bytes,
+        response: Command,
+        priority: CommandPriority = CommandPriority.CONFIG,
+        timeout: float | None = None,
+    ) -> ParsedNotifyPayload:
+        """Write a command frame and wait for its answer, raises TimeoutError if none arrives."""
+        return await self._queue.async_request(frame, response, priority, timeout or self._response_timeout)
+
+    async def measure(self) -> VoltcraftData:
+        payload = await self.request(Command.MEASURE.build_payload(), Command.MEASURE, CommandPriority.POLL)
+        return VoltcraftData.from_payload(cast(MeasureNotifyPayload, payload))
+
+    async def switch(self, on: bool) -> None:
+        mode = SwitchModes.ON if on else SwitchModes.OFF
+        await self.request(mode.build_payload(), Command.SWITCH, CommandPriority.CONTROL, SWITCH_RESPONSE_TIMEOUT)
+
+    def subscribe(self, subscriber: Callable[[ParsedNotifyPayload], None]) -> Callable[[], None]:
+        """Call subscriber with every decoded notification until the returned callback is called."""
+        self._subscribers.append(subscriber)
+        return lambda: self._subscribers.remove(subscriber)
+
+    async def _async_write(self, frame: bytes) -> None:
+        if not self._client.is_connected:
+            raise BleakError(f"{self.address} is not connected")
+        await self._client.write_gatt_char(COMMAND_UUID, frame)
+
+    def _handle_notify(self, sender: BleakGATTCharacteristic, data: bytearray) -> None:
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("%s: Received notification: %s", self.address, data.hex())
+        for payload in self._decoder.feed(data):
+            if not self._queue.resolve(payload_command(payload), payload):
+                self.unsolicited += 1
+            for subscriber in self._subscribers:
+                subscriber(payload)
+
+    def _handle_disconnect(self, client: BleakClient) -> None:
+        self._queue.fail_all(BleakError(f"{self.address} disconnected"))
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
@@ -0,0 +1,161 @@
+"""
+Simulated SEM6000 / SPB012BLE plug speaking the protocol from protocol.py.
+
+FakeBleakClient implements the subset of BleakClient used by the integration and answers command
+frames with notifications after a configurable latency. Replies can be dropped, fragmented into
+MTU-sized notifications, and use the hw v2 (4 bytes) or hw v3 (2 bytes) energy field.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from custom_components.voltcraft_sem6000_spb012ble.protocol import HEADER, TRAILER, Command, checksum
+
+
+@dataclass
+class FakePlugConfig:
+    latency: float = 0.02  # seconds until a reply is sent
+    jitter: float = 0.01  # seconds, uniformly added to the latency
+    drop_rate: float = 0.0  # probability that a reply is lost
+    mtu: int | None = None  # split replies into notifications of at most this many bytes
+    hw_version: int = 2  # 2: 4-byte energy counter, 3: 2-byte energy counter
+    base_power: float = 60.0  # W
+    power_noise: float = 5.0  # W
+
+
+@dataclass
+class FakePlugStats:
+    commands: int = 0
+    notifications: int = 0
+    dropped: int = 0
+
+
+@dataclass
+class FakePlug:
+    """State of one simulated plug."""
+
+    config: FakePlugConfig = field(default_factory=FakePlugConfig)
+    stats: FakePlugStats = field(default_factory=FakePlugStats)
+    is_on: bool = True
+    energy_wh: float = 0.0
+    power_limit: int = 0  # W, 0 when the protection is disabled
+    _last_measure: float = field(default_factory=time.monotonic)
+
+    def handle_command(self, frame: bytes) -> bytes | None:
+        """Return the reply frame for a command frame (None if the plug doesn't answer it)."""
+        self.stats.commands += 1
+        if len(frame) < 7 or frame[0] != HEADER:
+            return None
+
+        command = frame[2]
+        params = frame[4 : frame[1] + 1]
+        if command == Command.SWITCH:
+            self.is_on = bool(params[0])
+            return _encode(Command.SWITCH, b"\x00")
+        if command in (Command.TIME_SYNC, Command.SCHEDULE):
+            return _encode(command, b"\x00")
+        if command == Command.POWER_LIMIT:
+            self.power_limit = int.from_bytes(params[:2])
+            return _encode(Command.POWER_LIMIT, b"\x00")
+        if command == Command.MEASURE:
+            return _encode(Command.MEASURE, self._measure())
+        if command == Command.HOURLY_HISTORY:
+            return _encode(Command.HOURLY_HISTORY, b"".join(int(self.config.base_power).to_bytes(2) for _ in range(24)))
+        return None
+
+    def _measure(self) -> bytes:
+        now = time.monotonic()
+        power = 0.0
+        if self.is_on:
+            power = max(0.0, self.config.base_power + random.uniform(-1, 1) * self.config.power_noise)
+            if self.power_limit and power > self.power_limit:
+                # Overload protection cuts the outlet
+                self.is_on = False
+                power = 0.0
+        self.energy_wh += power * (now - self._last_measure) / 3600
+        self._last_measure = now
+
+        voltage = 230
+        current_ma = round(power / voltage * 1000)
+        energy_size = 4 if self.config.hw_version == 2 else 2
+        energy = math.floor(self.energy_wh) % (1 << (8 * energy_size))
+        return (
+            bytes((self.is_on,))
+            + round(power * 1000).to_bytes(3)
+            + bytes((voltage,))
+            + current_ma.to_bytes(2)
+            + bytes((50, 0, 0))
+            + energy.to_bytes(energy_size)
+        )
+
+
+class FakeBleakClient:
+    """Stand-in for BleakClient connected to a FakePlug."""
+
+    def __init__(
+        self,
+        plug: FakePlug,
+        disconnected_callback: Callable[[Any], None] | None = None,
+    ) -> None:
+        self.plug = plug
+        self._disconnected_callback = disconnected_callback
+        self._notify_callback: Callable[[Any, bytearray], Any] | None = None
+        self._connected = True
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def start_notify(self, char: str, callback: Callable[[Any, bytearray], Any]) -> None:
+        self._notify_callback = callback
+
+    async def stop_notify(self, char: str) -> None:
+        self._notify_callback = None
+
+    async def write_gatt_char(self, char: str, data: bytes | bytearray, response: bool | None = None) -> None:
+        reply = self.plug.handle_command(bytes(data))
+        if reply is None:
+            return
+
+        config = self.plug.config
+        if random.random() < config.drop_rate:
+            self.plug.stats.dropped += 1
+            return
+
+        delay = config.latency + random.uniform(0, config.jitter)
+        asyncio.get_running_loop().call_later(delay, self._notify, reply)
+
+    async def disconnect(self) -> bool:
+        self.simulate_disconnect()
+        return True
+
+    def simulate_disconnect(self) -> None:
+        if not self._connected:
+            return
+        self._connected = False
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+    def _notify(self, frame: bytes) -> None:
+        callback = self._notify_callback
+        if callback is None or not self._connected:
+            return
+
+        mtu = self.plug.config.mtu or len(frame)
+        for offset in range(0, len(frame), mtu):
+            self.plug.stats.notifications += 1
+            result = callback(None, bytearray(frame[offset : offset + mtu]))
+            if asyncio.iscoroutine(result):
+                asyncio.get_running_loop().create_task(result)
+
+
+def _encode(command: Command, params: bytes) -> bytes:
+    # Not Command.build_payload, which caches frames: every measurement is different
+    return bytes((HEADER, len(params) + 3, command, 0x00)) + params + bytes((checksum(command, params),)) + TRAILER
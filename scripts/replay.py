@@ -0,0 +1,126 @@
+"""
+Replay notifications captured in Home Assistant debug logs through the frame decoder at full speed.
+
+Collects the `Received notification: <hex>` lines the integration logs at debug level (one decoder per
+plug, lines without a plug name share one) and feeds them through FrameDecoder, then reports the decode
+throughput and what was decoded. With --dump every decoded payload is printed as a JSON line instead,
+a reproducible input to diff between two commits. Needs the development requirements (the integration
+package imports Home Assistant):
+
+    python -m scripts.replay home-assistant.log --repeat 100
+    python -m scripts.replay home-assistant.log --dump > payloads.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from custom_components.voltcraft_sem6000_spb012ble.protocol import FrameDecoder
+
+NOTIFICATION_LINE = re.compile(r"(?:(?P<source>\S+): )?Received notification: (?P<data>[0-9a-fA-F]+)\s*$")
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    notifications: int = 0
+    bytes: int = 0
+    payloads: Counter[str] = field(default_factory=Counter)
+    unknown_frames: int = 0
+    discarded_bytes: int = 0
+    seconds: float = 0.0
+
+
+def read_notifications(lines: Iterable[str]) -> Iterator[tuple[int, str, bytes]]:
+    """Yield (line number, plug, data) of every logged notification, the plug is "-" in older logs."""
+    for number, line in enumerate(lines, 1):
+        if (match := NOTIFICATION_LINE.search(line)) is not None:
+            yield number, match["source"] or "-", bytes.fromhex(match["data"])
+
+
+def replay(notifications: list[tuple[int, str, bytes]], repeat: int = 1) -> ReplayStats:
+    stats = ReplayStats()
+    for _ in range(repeat):
+        decoders: dict[str, FrameDecoder] = {}
+        payloads: Counter[str] = Counter()
+        started = time.perf_counter()
+        for _, source, data in notifications:
+            decoder = decoders.get(source)
+            if decoder is None:
+                decoder = decoders[source] = FrameDecoder()
+            for payload in decoder.feed(data):
+                payloads[type(payload).__name__] += 1
+        stats.seconds += time.perf_counter() - started
+
+        stats.notifications += len(notifications)
+        stats.bytes += sum(len(data) for _, _, data in notifications)
+        stats.payloads += payloads
+        stats.unknown_frames += sum(decoder.unknown_frames for decoder in decoders.values())
+        stats.discarded_bytes += sum(decoder.discarded_bytes for decoder in decoders.values())
+    return stats
+
+
+def dump(notifications: list[tuple[int, str, bytes]]) -> Iterator[str]:
+    """Yield one JSON line per decoded payload."""
+    decoders: dict[str, FrameDecoder] = {}
+    for number, source, data in notifications:
+        decoder = decoders.get(source)
+        if decoder is None:
+            decoder = decoders[source] = FrameDecoder()
+        for payload in decoder.feed(data):
+            yield json.dumps({"line": number, "plug": source, "type": type(payload).__name__, **asdict(payload)})
+
+
+def _report(stats: ReplayStats, repeat: int) -> None:
+    seconds = stats.seconds or float("nan")
+    decoded = sum(stats.payloads.values())
+    print(f"notifications: {stats.notifications // repeat} x {repeat}, {stats.bytes // repeat} bytes per pass")
+    print(
+        f"decode: {stats.seconds:.3f} s, {stats.notifications / seconds:,.0f} notifications/s, "
+        f"{decoded / seconds:,.0f} payloads/s, {stats.bytes / seconds / 1e6:.2f} MB/s"
+    )
+    print(f"unknown frames: {stats.unknown_frames // repeat}, discarded bytes: {stats.discarded_bytes // repeat}")
+    for name, count in stats.payloads.most_common():
+        print(f"  {name}: {count // repeat}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    run(parser.parse_args())
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("logs", nargs="+", type=Path, help="Home Assistant log files, - reads stdin")
+    parser.add_argument("--repeat", type=int, default=1, help="decode the notifications this many times")
+    parser.add_argument("--dump", action="store_true", help="print the decoded payloads as JSON lines")
+
+
+def run(args: argparse.Namespace) -> None:
+    notifications: list[tuple[int, str, bytes]] = []
+    for path in args.logs:
+        if str(path) == "-":
+            notifications += read_notifications(sys.stdin)
+            continue
+        with path.open(encoding="utf-8", errors="replace") as file:
+            notifications += read_notifications(file)
+
+    if not notifications:
+        sys.exit("No 'Received notification' lines found, enable debug logging for the integration")
+
+    if args.dump:
+        for line in dump(notifications):
+            print(line)
+        return
+    _report(replay(notifications, args.repeat), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
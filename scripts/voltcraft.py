@@ -0,0 +1,148 @@
+"""
+Command line client for SEM6000 / SPB012BLE plugs, without a running Home Assistant (needs requirements-dev.txt).
+
+Stop the integration (or disable the plug's entry) first, a plug accepts one connection at a time.
+Run it from the repository root, for example:
+
+    python -m scripts.voltcraft scan
+    python -m scripts.voltcraft measure AA:BB:CC:DD:EE:FF --count 100 --interval 0
+    python -m scripts.voltcraft switch AA:BB:CC:DD:EE:FF off
+    python -m scripts.voltcraft watch AA:BB:CC:DD:EE:FF --interval 5
+    python -m scripts.voltcraft replay home-assistant.log --repeat 100
+
+measure reports the achieved sample rate and round trip percentiles at the end, watch prints every
+notification (including the ones the plug sends on its own, e.g. when its button is pressed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import asdict
+
+from bleak import BleakScanner
+from bleak.exc import BleakError
+
+from custom_components.voltcraft_sem6000_spb012ble.const import RESPONSE_TIMEOUT, SERVICE_UUID
+from custom_components.voltcraft_sem6000_spb012ble.coordinator import VoltcraftData
+from custom_components.voltcraft_sem6000_spb012ble.protocol import ParsedNotifyPayload
+
+from . import replay
+from .client import VoltcraftClient
+
+
+def _format(data: VoltcraftData) -> str:
+    return (
+        f"{'on ' if data.is_on else 'off'}  {data.power:8.3f} W  {data.voltage:5.0f} V  {data.current:6.3f} A"
+        f"  {data.frequency:2d} Hz  {data.consumed_energy:9.3f} kWh"
+    )
+
+
+async def _async_scan(args: argparse.Namespace) -> None:
+    found = await BleakScanner.discover(args.timeout, return_adv=True, service_uuids=[SERVICE_UUID])
+    for device, advertisement in sorted(found.values(), key=lambda item: -item[1].rssi):
+        print(f"{device.address}  {advertisement.rssi:4d} dBm  {device.name or ''}")
+
+
+async def _async_measure(args: argparse.Namespace) -> None:
+    round_trips: list[float] = []
+    timeouts = 0
+    async with VoltcraftClient(args.address, response_timeout=args.timeout) as client:
+        started = time.perf_counter()
+        for index in range(args.count):
+            if index and args.interval:
+                await asyncio.sleep(args.interval)
+            requested = time.perf_counter()
+            try:
+                data = await client.measure()
+            except TimeoutError:
+                timeouts += 1
+                continue
+            round_trips.append(time.perf_counter() - requested)
+            if not args.quiet:
+                print(_format(data))
+        elapsed = time.perf_counter() - started
+
+    print(f"samples: {len(round_trips)} in {elapsed:.1f} s ({len(round_trips) / elapsed:.2f}/s), timeouts: {timeouts}")
+    if len(round_trips) >= 2:
+        quantiles = statistics.quantiles(round_trips, n=100, method="inclusive")
+        print(
+            f"round trip ms: p50 {quantiles[49] * 1000:.1f}  p90 {quantiles[89] * 1000:.1f}"
+            f"  p99 {quantiles[98] * 1000:.1f}  max {max(round_trips) * 1000:.1f}"
+        )
+
+
+async def _async_switch(args: argparse.Namespace) -> None:
+    async with VoltcraftClient(args.address) as client:
+        await client.switch(args.state == "on")
+        print(_format(await client.measure()))
+
+
+async def _async_watch(args: argparse.Namespace) -> None:
+    def _print(payload: ParsedNotifyPayload) -> None:
+        print(f"{time.strftime('%H:%M:%S')}  {type(payload).__name__}  {asdict(payload)}")
+
+    disconnected = asyncio.Event()
+    async with VoltcraftClient(args.address, disconnected_callback=lambda _: disconnected.set()) as client:
+        client.subscribe(_print)
+        deadline = time.monotonic() + args.duration if args.duration else None
+        while not disconnected.is_set() and (deadline is None or time.monotonic() < deadline):
+            try:
+                # The plug only sends measurements when asked
+                await client.measure()
+            except TimeoutError:
+                print(f"{time.strftime('%H:%M:%S')}  no answer")
+            except BleakError:
+                break
+            try:
+                await asyncio.wait_for(disconnected.wait(), args.interval)
+            except TimeoutError:
+                pass
+    if disconnected.is_set():
+        print("disconnected")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="list plugs in range")
+    scan.add_argument("--timeout", type=float, default=10.0, help="seconds to scan")
+    scan.set_defaults(run=_async_scan)
+
+    measure = commands.add_parser("measure", help="poll measurements")
+    measure.add_argument("address", help="Bluetooth address of the plug")
+    measure.add_argument("--count", type=int, default=1, help="number of measurements")
+    measure.add_argument("--interval", type=float, default=1.0, help="seconds between requests, 0 back to back")
+    measure.add_argument("--timeout", type=float, default=RESPONSE_TIMEOUT, help="seconds to wait for an answer")
+    measure.add_argument("--quiet", action="store_true", help="only print the summary")
+    measure.set_defaults(run=_async_measure)
+
+    switch = commands.add_parser("switch", help="switch the outlet")
+    switch.add_argument("address", help="Bluetooth address of the plug")
+    switch.add_argument("state", choices=("on", "off"))
+    switch.set_defaults(run=_async_switch)
+
+    watch = commands.add_parser("watch", help="poll and print every notification")
+    watch.add_argument("address", help="Bluetooth address of the plug")
+    watch.add_argument("--interval", type=float, default=5.0, help="seconds between measure requests")
+    watch.add_argument("--duration", type=float, default=0.0, help="seconds to run, 0 until interrupted")
+    watch.set_defaults(run=_async_watch)
+
+    replay_parser = commands.add_parser("replay", help="decode notifications captured in debug logs")
+    replay.add_arguments(replay_parser)
+
+    args = parser.parse_args()
+    if args.command == "replay":
+        replay.run(args)
+        return
+    try:
+        asyncio.run(args.run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
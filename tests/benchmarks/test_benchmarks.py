@@ -0,0 +1,173 @@
+"""
+Hot path benchmarks (pytest-benchmark): frame decoding and encoding, the command queue and the per-sample models.
+
+The frames are a generated session of 100 000 notifications shaped like recorded traffic (scripts/replay.py
+measures the decoder on the notifications of real debug logs). Compare runs with --benchmark-autosave and
+--benchmark-compare:
+
+    pytest tests/benchmarks --benchmark-only
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+from datetime import datetime
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from custom_components.voltcraft_sem6000_spb012ble.aggregates import SampleBuffer
+from custom_components.voltcraft_sem6000_spb012ble.appliance import ApplianceDetector
+from custom_components.voltcraft_sem6000_spb012ble.command_queue import CommandPriority, CommandQueue
+from custom_components.voltcraft_sem6000_spb012ble.energy import EnergyIntegrator
+from custom_components.voltcraft_sem6000_spb012ble.protocol import (
+    Command,
+    FrameDecoder,
+    NotifyPayload,
+    SwitchModes,
+    build_time_sync_request,
+)
+
+SESSION_FRAMES = 100_000
+SAMPLES = 100_000
+QUEUE_REQUESTS = 10_000
+
+
+def _session() -> list[bytes]:
+    """Notifications of a polled plug: mostly MEASURE answers (hw v2 and v3), some switch acks and histories."""
+    rng = random.Random(0)
+    frames = []
+    energy = 10_000
+    for index in range(SESSION_FRAMES):
+        if index % 1000 == 999:
+            frames.append(Command.HOURLY_HISTORY.build_payload(bytes(48)))
+        elif index % 100 == 99:
+            frames.append(Command.SWITCH.build_payload(b"\x00"))
+        else:
+            power = rng.randrange(0, 3_000_000)  # mW
+            energy += rng.random() < 0.01
+            params = bytes((1,)) + power.to_bytes(3, "big") + bytes((230,)) + (power // 230).to_bytes(2, "big")
+            params += bytes((50, 0, 0))
+            if index % 2:
+                params += (energy & 0xFFFF).to_bytes(2, "big")
+            else:
+                params += energy.to_bytes(4, "big")
+            frames.append(Command.MEASURE.build_payload(params))
+    return frames
+
+
+@pytest.fixture(scope="module")
+def frames() -> list[bytes]:
+    return _session()
+
+
+def _decode(chunks: list[bytes]) -> int:
+    decoder = FrameDecoder()
+    decoded = 0
+    for chunk in chunks:
+        decoded += len(decoder.feed(chunk))
+    return decoded
+
+
+def test_decode_frames(benchmark: BenchmarkFixture, frames: list[bytes]) -> None:
+    """One frame per notification, the common case."""
+    decoded = benchmark.pedantic(_decode, args=(frames,), rounds=10)
+    assert decoded == len(frames)
+
+
+def test_decode_fragmented(benchmark: BenchmarkFixture, frames: list[bytes]) -> None:
+    """Frames split into 20 byte notifications (default ATT MTU)."""
+    stream = b"".join(frames)
+    chunks = [stream[start : start + 20] for start in range(0, len(stream), 20)]
+    assert benchmark.pedantic(_decode, args=(chunks,), rounds=5) == len(frames)
+
+
+def test_decode_coalesced(benchmark: BenchmarkFixture, frames: list[bytes]) -> None:
+    """Several frames per notification (large MTU, proxies batching notifications)."""
+    stream = b"".join(frames)
+    chunks = [stream[start : start + 244] for start in range(0, len(stream), 244)]
+    assert benchmark.pedantic(_decode, args=(chunks,), rounds=5) == len(frames)
+
+
+def test_parse_payloads(benchmark: BenchmarkFixture, frames: list[bytes]) -> None:
+    def parse() -> int:
+        return sum(NotifyPayload.from_payload(frame) is not None for frame in frames)
+
+    assert benchmark.pedantic(parse, rounds=10) == len(frames)
+
+
+def test_encode_commands(benchmark: BenchmarkFixture) -> None:
+    now = datetime(2026, 1, 1, 12, 0, 0)
+
+    def encode() -> int:
+        size = 0
+        for _ in range(SESSION_FRAMES // 4):
+            size += len(Command.MEASURE.build_payload())
+            size += len(SwitchModes.ON.build_payload())
+            size += len(SwitchModes.OFF.build_payload())
+            size += len(build_time_sync_request(now))
+        return size
+
+    assert benchmark.pedantic(encode, rounds=10)
+
+
+def test_command_queue(benchmark: BenchmarkFixture) -> None:
+    """Round trips through the queue with an answer on the next loop iteration."""
+    answer = NotifyPayload.from_payload(Command.MEASURE.build_payload(bytes(12)))
+    measure = Command.MEASURE.build_payload()
+
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+
+        async def write(frame: bytes) -> None:
+            loop.call_soon(queue.resolve, Command.MEASURE, answer)
+
+        queue = CommandQueue(write, contextlib.nullcontext)
+        for _ in range(QUEUE_REQUESTS):
+            await queue.async_request(measure, Command.MEASURE, CommandPriority.POLL, 1.0)
+
+    benchmark.pedantic(lambda: asyncio.run(run()), rounds=5)
+
+
+def _samples() -> list[tuple[float, float]]:
+    rng = random.Random(0)
+    return [(float(second), rng.uniform(0.0, 2000.0)) for second in range(SAMPLES)]
+
+
+def test_rolling_windows(benchmark: BenchmarkFixture) -> None:
+    samples = _samples()
+
+    def run() -> None:
+        buffer = SampleBuffer(3600)
+        for duration in (60.0, 300.0, 900.0, 3600.0):
+            buffer.add_window(duration)
+        for timestamp, power in samples:
+            buffer.append(timestamp, power, 230.0, power / 230.0)
+
+    benchmark.pedantic(run, rounds=5)
+
+
+def test_energy_integrator(benchmark: BenchmarkFixture) -> None:
+    samples = _samples()
+
+    def run() -> float:
+        energy = EnergyIntegrator()
+        total = 0.0
+        for timestamp, power in samples:
+            total = energy.update(timestamp, power, int(timestamp) // 10)
+        return total
+
+    assert benchmark.pedantic(run, rounds=5)
+
+
+def test_appliance_detector(benchmark: BenchmarkFixture) -> None:
+    samples = _samples()
+
+    def run() -> None:
+        detector = ApplianceDetector(threshold=5.0, end_delay=300.0)
+        for timestamp, power in samples:
+            detector.update(timestamp, power, True)
+
+    benchmark.pedantic(run, rounds=5)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import random
+import statistics
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.aggregates import SampleBuffer
+
+
+def test_empty_window() -> None:
+    buffer = SampleBuffer(10)
+    window = buffer.add_window(60.0)
+    assert window.stats(0.0) is None
+
+
+def test_stats() -> None:
+    buffer = SampleBuffer(10)
+    window = buffer.add_window(60.0)
+    for second, (power, current) in enumerate([(10.0, 0.1), (30.0, 0.5), (20.0, 0.2)]):
+        buffer.append(float(second), power, 230.0, current)
+
+    stats = window.stats(2.0)
+    assert stats is not None
+    assert stats.samples == 3
+    assert stats.power_mean == pytest.approx(20.0)
+    assert (stats.power_min, stats.power_max) == (10.0, 30.0)
+    assert stats.power_stddev == pytest.approx(statistics.pstdev([10.0, 30.0, 20.0]))
+    assert stats.current_peak == 0.5
+    assert stats.voltage_mean == pytest.approx(230.0)
+
+
+def test_samples_expire() -> None:
+    buffer = SampleBuffer(100)
+    window = buffer.add_window(10.0)
+    buffer.append(0.0, 1000.0, 230.0, 4.0)
+    buffer.append(5.0, 10.0, 230.0, 0.1)
+    stats = window.stats(12.0)
+    assert stats is not None
+    assert (stats.samples, stats.power_max, stats.current_peak) == (1, 10.0, 0.1)
+    assert window.stats(20.0) is None
+
+
+def test_buffer_capacity_bounds_the_window() -> None:
+    buffer = SampleBuffer(3)
+    window = buffer.add_window(3600.0)
+    for second in range(5):
+        buffer.append(float(second), float(second), 230.0, 0.0)
+    stats = window.stats(5.0)
+    assert stats is not None
+    assert (stats.samples, stats.power_min, stats.power_max) == (3, 2.0, 4.0)
+    assert len(buffer) == 3
+
+
+def test_matches_brute_force() -> None:
+    rng = random.Random(1)
+    buffer = SampleBuffer(500)
+    windows = [buffer.add_window(duration) for duration in (10.0, 60.0, 300.0)]
+    samples: list[tuple[float, float, float]] = []
+    now = 0.0
+    for _ in range(2000):
+        now += rng.uniform(0.5, 2.0)
+        power, current = rng.uniform(0.0, 2000.0), rng.uniform(0.0, 10.0)
+        buffer.append(now, power, 230.0, current)
+        samples.append((now, power, current))
+
+    kept = samples[-500:]
+    for window in windows:
+        expected = [sample for sample in kept if sample[0] >= now - window.duration]
+        stats = window.stats(now)
+        assert stats is not None
+        assert stats.samples == len(expected)
+        assert stats.power_mean == pytest.approx(statistics.fmean(power for _, power, _ in expected))
+        assert stats.power_min == min(power for _, power, _ in expected)
+        assert stats.power_max == max(power for _, power, _ in expected)
+        assert stats.power_stddev == pytest.approx(statistics.pstdev(power for _, power, _ in expected), rel=1e-6)
+        assert stats.current_peak == max(current for _, _, current in expected)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.appliance import (
+    ApplianceDetector,
+    ApplianceEvent,
+    ApplianceState,
+)
+
+
+def feed(detector: ApplianceDetector, start: float, seconds: int, power: float, is_on: bool = True) -> list:
+    """Feed one sample per second, return the events."""
+    events = []
+    for second in range(seconds):
+        if (event := detector.update(start + second, power, is_on)) is not None:
+            events.append((start + second, event))
+    return events
+
+
+def test_idle_level_is_learned() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    assert feed(detector, 0.0, 100, 2.0) == []
+    assert detector.state is ApplianceState.IDLE
+    assert detector.idle_power == pytest.approx(2.0)
+
+
+def test_large_load_starts_a_cycle_at_once() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    feed(detector, 0.0, 10, 2.0)
+    assert feed(detector, 10.0, 2, 2000.0) == [(10.0, ApplianceEvent.CYCLE_STARTED)]
+    assert detector.state is ApplianceState.RUNNING
+
+
+def test_small_load_starts_a_cycle_after_a_while() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    feed(detector, 0.0, 10, 2.0)
+    # 7.5 W above the end level: 150 W*s take 20 s
+    assert feed(detector, 10.0, 40, 12.0) == [(29.0, ApplianceEvent.CYCLE_STARTED)]
+
+
+def test_spike_doesnt_start_a_cycle() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    feed(detector, 0.0, 10, 2.0)
+    assert feed(detector, 10.0, 1, 100.0) == []
+    assert feed(detector, 11.0, 100, 2.0) == []
+    assert detector.state is ApplianceState.IDLE
+
+
+def test_cycle_with_a_pause() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    feed(detector, 0.0, 10, 2.0)
+    events = feed(detector, 10.0, 600, 500.0)
+    # A pause shorter than the end delay doesn't end the cycle
+    events += feed(detector, 610.0, 30, 2.0)
+    events += feed(detector, 640.0, 300, 1500.0)
+    events += feed(detector, 940.0, 120, 2.0)
+    assert events == [(10.0, ApplianceEvent.CYCLE_STARTED), (1000.0, ApplianceEvent.CYCLE_FINISHED)]
+    assert detector.state is ApplianceState.FINISHED
+
+    cycle = detector.last_cycle
+    assert cycle is not None
+    # From the sample before the one that started it to the start of the quiet tail
+    assert cycle.duration == pytest.approx(931.0)
+    assert cycle.peak_power == 1500.0
+    assert cycle.energy == pytest.approx((599 * 500 + 30 * 2 + 300 * 1500 + 61 * 2) / 3600, rel=0.01)
+
+
+def test_switched_off_interrupts_the_cycle() -> None:
+    detector = ApplianceDetector(threshold=5.0, end_delay=60.0)
+    feed(detector, 0.0, 10, 2.0)
+    feed(detector, 10.0, 60, 500.0)
+    assert feed(detector, 70.0, 1, 0.0, is_on=False) == [(70.0, ApplianceEvent.CYCLE_INTERRUPTED)]
+    assert detector.state is ApplianceState.IDLE
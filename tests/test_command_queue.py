@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.command_queue import CommandPriority, CommandQueue
+from custom_components.voltcraft_sem6000_spb012ble.protocol import (
+    Command,
+    NotifyPayload,
+    ParsedNotifyPayload,
+    SwitchModes,
+    SwitchNotifyPayload,
+)
+
+MEASURE = Command.MEASURE.build_payload()
+MEASURE_ANSWER = NotifyPayload.from_payload(Command.MEASURE.build_payload(bytes(12)))
+SWITCH_ANSWER = SwitchNotifyPayload()
+
+
+class FakePlug:
+    """Answers every written command on the next loop iteration, unless held."""
+
+    def __init__(self) -> None:
+        self.queue = CommandQueue(self.write, contextlib.nullcontext)
+        self.written: list[bytes] = []
+        self.answers: dict[Command, ParsedNotifyPayload | None] = {
+            Command.MEASURE: MEASURE_ANSWER,
+            Command.SWITCH: SWITCH_ANSWER,
+        }
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def write(self, frame: bytes) -> None:
+        self.written.append(frame)
+        await self.release.wait()
+        command = Command(frame[2])
+        if (answer := self.answers[command]) is not None:
+            asyncio.get_running_loop().call_soon(self.queue.resolve, command, answer)
+
+
+async def wait_written(plug: FakePlug, count: int) -> None:
+    while len(plug.written) < count:
+        await asyncio.sleep(0)
+
+
+def test_request_gets_answer() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        assert await plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0) is MEASURE_ANSWER
+        assert plug.written == [MEASURE]
+        assert len(plug.queue) == 0
+
+    asyncio.run(run())
+
+
+def test_priority_order() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        plug.release.clear()
+        first = asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0))
+        await wait_written(plug, 1)
+        history = Command.HOURLY_HISTORY.build_payload(b"\x00\x00")
+        plug.answers[Command.HOURLY_HISTORY] = MEASURE_ANSWER
+        waiting = [
+            asyncio.create_task(
+                plug.queue.async_request(history, Command.HOURLY_HISTORY, CommandPriority.BACKGROUND, 1)
+            ),
+            asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0)),
+            asyncio.create_task(
+                plug.queue.async_request(SwitchModes.OFF.build_payload(), Command.SWITCH, CommandPriority.CONTROL, 1)
+            ),
+        ]
+        await asyncio.sleep(0)
+        plug.release.set()
+        await asyncio.gather(first, *waiting)
+        assert plug.written == [MEASURE, SwitchModes.OFF.build_payload(), MEASURE, history]
+
+    asyncio.run(run())
+
+
+def test_equal_commands_coalesce() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        plug.release.clear()
+        first = asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0))
+        await wait_written(plug, 1)
+        # Two more polls while the first one is in flight join into one
+        waiting = [
+            asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        assert len(plug.queue) == 1
+        plug.release.set()
+        results = await asyncio.gather(first, *waiting)
+        assert results == [MEASURE_ANSWER] * 3
+        assert plug.written == [MEASURE, MEASURE]
+        assert plug.queue.coalesced == 1
+
+    asyncio.run(run())
+
+
+def test_timeout() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        plug.answers[Command.MEASURE] = None
+        with pytest.raises(TimeoutError):
+            await plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 0.01)
+        # The queue carries on with the next command
+        assert await plug.queue.async_request(
+            SwitchModes.ON.build_payload(), Command.SWITCH, CommandPriority.CONTROL, 1
+        )
+
+    asyncio.run(run())
+
+
+def test_write_error() -> None:
+    async def run() -> None:
+        async def write(frame: bytes) -> None:
+            raise OSError("not connected")
+
+        queue = CommandQueue(write, contextlib.nullcontext)
+        with pytest.raises(OSError, match="not connected"):
+            await queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0)
+
+    asyncio.run(run())
+
+
+def test_fail_all() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        plug.release.clear()
+        requests = [
+            asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0)),
+            asyncio.create_task(
+                plug.queue.async_request(SwitchModes.ON.build_payload(), Command.SWITCH, CommandPriority.CONTROL, 1)
+            ),
+        ]
+        await wait_written(plug, 1)
+        plug.queue.fail_all(ConnectionError("disconnected"))
+        for request in requests:
+            with pytest.raises(ConnectionError):
+                await request
+        assert len(plug.queue) == 0
+        plug.queue.cancel()
+
+    asyncio.run(run())
+
+
+def test_unexpected_answer() -> None:
+    async def run() -> None:
+        plug = FakePlug()
+        assert not plug.queue.resolve(Command.MEASURE, MEASURE_ANSWER)  # type: ignore[arg-type]
+        plug.answers[Command.MEASURE] = None
+        request = asyncio.create_task(plug.queue.async_request(MEASURE, Command.MEASURE, CommandPriority.POLL, 1.0))
+        await wait_written(plug, 1)
+        # An answer to another command doesn't resolve the one in flight
+        assert not plug.queue.resolve(Command.SWITCH, SWITCH_ANSWER)
+        assert plug.queue.resolve(Command.MEASURE, MEASURE_ANSWER)  # type: ignore[arg-type]
+        assert await request is MEASURE_ANSWER
+
+    asyncio.run(run())
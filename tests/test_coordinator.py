@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import random
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+from datetime import timedelta
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from bleak import BleakClient
+from bleak.backends.device import BLEDevice
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from homeassistant.components.bluetooth import HaBluetoothSlotAllocations
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.voltcraft_sem6000_spb012ble import coordinator as coordinator_module
+from custom_components.voltcraft_sem6000_spb012ble.const import (
+    CONF_CONNECTION_MODE,
+    CONF_IDLE_TIMEOUT,
+    CONNECTION_MODE_ON_DEMAND,
+    DOMAIN,
+    ENERGY_STORAGE_VERSION,
+    EVENT_OVERLOAD,
+    RECONNECT_BACKOFF_MIN,
+    STALL_POLL_LIMIT,
+)
+from custom_components.voltcraft_sem6000_spb012ble.coordinator import VoltcraftDataUpdateCoordinator
+from custom_components.voltcraft_sem6000_spb012ble.energy import energy_storage_key
+from custom_components.voltcraft_sem6000_spb012ble.protocol import SwitchModes
+from scripts.fake_plug import FakeBleakClient, FakePlug, FakePlugConfig
+
+MAC = "AA:BB:CC:DD:EE:01"
+
+
+class FakeCoordinator(VoltcraftDataUpdateCoordinator):
+    """Coordinator connected to a FakePlug instead of a Bluetooth adapter."""
+
+    def __init__(self, hass: HomeAssistant, entry: MockConfigEntry, ble_device: BLEDevice, plug: FakePlug) -> None:
+        super().__init__(hass, entry, ble_device)
+        self.plug = plug
+        self.fake_client: FakeBleakClient | None = None
+        self.connects = 0
+
+    def _get_ble_device(self) -> BLEDevice:
+        return self._ble_device
+
+    async def _async_establish_client(self, ble_device: BLEDevice) -> BleakClient:
+        self.connects += 1
+        self.fake_client = FakeBleakClient(self.plug, disconnected_callback=self._handle_disconnect)
+        return self.fake_client  # type: ignore[return-value]
+
+    def scanner_rssi(self) -> dict[str, int]:
+        return {}
+
+
+CoordinatorFactory = Callable[..., Coroutine[Any, Any, FakeCoordinator]]
+
+
+@pytest.fixture
+async def create_coordinator(hass: HomeAssistant) -> AsyncIterator[CoordinatorFactory]:
+    """Return a factory of started coordinators, each on its own simulated plug, shut down after the test."""
+    coordinators: list[FakeCoordinator] = []
+
+    async def _create(
+        mac: str = MAC,
+        options: dict[str, Any] | None = None,
+        plug: FakePlug | None = None,
+        entry_id: str | None = None,
+    ) -> FakeCoordinator:
+        entry = MockConfigEntry(
+            domain=DOMAIN, data={CONF_MAC: mac}, unique_id=mac, options=options or {}, entry_id=entry_id
+        )
+        entry.add_to_hass(hass)
+        plug = plug or FakePlug(FakePlugConfig(latency=0.0, jitter=0.0, power_noise=0.0))
+        coordinator = FakeCoordinator(hass, entry, BLEDevice(mac, "Plug", {"source": "hci0"}), plug)
+        coordinators.append(coordinator)
+        await coordinator.async_setup()
+        await coordinator.async_start()
+        return coordinator
+
+    yield _create
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+@pytest.fixture
+def no_backoff() -> Iterator[MagicMock]:
+    """Reconnect right away, the mock records the backoff windows the delays are drawn from."""
+    with patch.object(random, "uniform", return_value=0.0) as uniform:
+        yield uniform
+
+
+async def test_connect_and_poll(create_coordinator: CoordinatorFactory) -> None:
+    coordinator = await create_coordinator()
+
+    assert coordinator.is_connected
+    assert coordinator.last_update_success
+    assert coordinator.data is not None
+    assert coordinator.data.is_on
+    assert coordinator.data.power == pytest.approx(60.0)
+    assert coordinator.data.voltage == 230
+    assert coordinator.last_round_trip is not None
+
+
+async def test_reconnect_after_drop(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory, no_backoff: MagicMock
+) -> None:
+    coordinator = await create_coordinator()
+    assert coordinator.fake_client is not None
+
+    coordinator.fake_client.simulate_disconnect()
+    assert not coordinator.is_connected
+    assert coordinator.metrics.disconnects == 1
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Full jitter over the first backoff window
+    no_backoff.assert_called_with(RECONNECT_BACKOFF_MIN, RECONNECT_BACKOFF_MIN)
+    assert coordinator.is_connected
+    assert coordinator.connects == 2
+    assert coordinator.metrics.reconnects == 1
+    assert coordinator.connection_info["reconnect_attempt"] == 0
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+
+async def test_stall_watchdog_reconnects(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory, no_backoff: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    coordinator = await create_coordinator()
+    # The clock sync after the first poll is answered before the replies go missing
+    await hass.async_block_till_done(wait_background_tasks=True)
+    monkeypatch.setattr(coordinator_module, "RESPONSE_TIMEOUT", 0.01)
+    # Writes still go through but the notifications stop
+    coordinator.plug.config.drop_rate = 1.0
+
+    for _ in range(STALL_POLL_LIMIT):
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert coordinator.is_connected
+
+    coordinator.plug.config.drop_rate = 0.0
+    await coordinator.async_refresh()
+    assert isinstance(coordinator.last_exception, UpdateFailed)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.connects == 2
+    assert coordinator.is_connected
+    assert coordinator.connection_info["polls_without_measure"] == 0
+
+
+async def test_switch_publishes_the_confirmed_state(create_coordinator: CoordinatorFactory) -> None:
+    coordinator = await create_coordinator()
+    updates: list[bool] = []
+    unsubscribe = coordinator.async_add_listener(lambda: updates.append(coordinator.data.is_on))
+
+    await coordinator.async_send_switch_command(SwitchModes.OFF)
+
+    assert not coordinator.plug.is_on
+    # Published from the MEASURE sent right after the acknowledgement, not from a later poll
+    assert updates == [False]
+    assert coordinator.data.power == 0.0
+    assert coordinator.last_switch_latency is not None
+    unsubscribe()
+
+
+async def test_on_demand_disconnects_when_idle(hass: HomeAssistant, create_coordinator: CoordinatorFactory) -> None:
+    coordinator = await create_coordinator(
+        options={CONF_CONNECTION_MODE: CONNECTION_MODE_ON_DEMAND, CONF_IDLE_TIMEOUT: 10}
+    )
+    assert coordinator.last_update_success
+    assert coordinator.is_connected
+    assert coordinator.evictable
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert not coordinator.is_connected
+    assert coordinator.scheduler.connection_count == 0
+
+    # The next request connects again
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.connects == 2
+
+
+async def test_full_adapter_evicts_the_least_recently_used_connection(
+    create_coordinator: CoordinatorFactory,
+) -> None:
+    options = {CONF_CONNECTION_MODE: CONNECTION_MODE_ON_DEMAND}
+    first = await create_coordinator("AA:BB:CC:DD:EE:01", options)
+    second = await create_coordinator("AA:BB:CC:DD:EE:02", options)
+    first.scheduler.max_connections = 2
+    await first.async_refresh()
+
+    third = await create_coordinator("AA:BB:CC:DD:EE:03", options)
+
+    assert third.is_connected
+    assert first.is_connected
+    assert not second.is_connected
+    assert third.scheduler.evictions == 1
+
+
+async def test_energy_offset_survives_a_restart(
+    hass: HomeAssistant, hass_storage: dict[str, Any], create_coordinator: CoordinatorFactory
+) -> None:
+    entry_id = "energy"
+    key = energy_storage_key(entry_id)
+    hass_storage[key] = {
+        "version": ENERGY_STORAGE_VERSION,
+        "key": key,
+        "data": {"offset": 1000, "last_counter": 500, "fraction": 0.0},
+    }
+    plug = FakePlug(FakePlugConfig(latency=0.0, jitter=0.0), energy_wh=20.0)
+    coordinator = await create_coordinator(plug=plug, entry_id=entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # The plug lost power while Home Assistant was down and counts from zero again
+    assert coordinator.energy.resets == 1
+    assert coordinator.data.total_energy == pytest.approx(1.52)
+    assert hass_storage[key]["data"]["offset"] == 1500
+    assert hass_storage[key]["data"]["last_counter"] == 20
+
+
+async def test_path_migration_is_checked_after_reconnecting(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory, no_backoff: MagicMock
+) -> None:
+    coordinator = await create_coordinator()
+    allocations = [
+        HaBluetoothSlotAllocations(source="hci0", slots=3, free=2, allocated=[MAC]),
+        HaBluetoothSlotAllocations(source="proxy", slots=3, free=3, allocated=[]),
+    ]
+
+    assert coordinator.fake_client is not None
+
+    coordinator.paths.migrate("proxy")
+    with patch.object(coordinator_module.bluetooth, "async_current_allocations", return_value=allocations):
+        coordinator.fake_client.simulate_disconnect()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert coordinator.is_connected
+    # Home Assistant connected through the old path again
+    assert coordinator.paths.current == "hci0"
+    assert coordinator.paths.failed_migrations == 1
+    assert coordinator.paths.target is None
+
+
+async def test_overload_is_reported_when_the_plug_cuts_a_load_above_its_limit(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory
+) -> None:
+    events = async_capture_events(hass, EVENT_OVERLOAD)
+    coordinator = await create_coordinator()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    await coordinator.async_set_power_limit(50)
+    # The 60 W load is measured above the limit, the plug cuts the outlet
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.plug.is_on
+    assert coordinator.overload_tripped
+    assert len(events) == 1
+    assert events[0].data["power_limit"] == 50
+    assert events[0].data["last_power"] == pytest.approx(60.0)
+
+
+async def test_outlet_turned_off_below_the_limit_is_no_overload(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory
+) -> None:
+    events = async_capture_events(hass, EVENT_OVERLOAD)
+    coordinator = await create_coordinator()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    await coordinator.async_set_power_limit(1000)
+
+    # Button on the plug
+    coordinator.plug.is_on = False
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert not coordinator.overload_tripped
+    assert events == []
+
+
+async def test_limit_not_on_the_plug_yet_is_no_overload(
+    hass: HomeAssistant, create_coordinator: CoordinatorFactory
+) -> None:
+    events = async_capture_events(hass, EVENT_OVERLOAD)
+    coordinator = await create_coordinator()
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # Restored after a restart, it is only sent after the next poll
+    coordinator.restore_power_limit(50)
+    coordinator.plug.is_on = False
+    await coordinator.async_refresh()
+
+    assert not coordinator.overload_tripped
+    assert events == []
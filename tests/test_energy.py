@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.energy import EnergyIntegrator
+
+
+def test_first_sample() -> None:
+    energy = EnergyIntegrator()
+    assert energy.total is None
+    assert energy.update(0.0, 100.0, 42) == 42
+    assert energy.total == 42
+
+
+def test_power_fills_in_between_counter_steps() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 360.0, 10)
+    # 360 W for 5 s is 0.5 Wh
+    assert energy.update(5.0, 360.0, 10) == pytest.approx(10.5)
+    # Clamped below the next counter step
+    assert energy.update(10.0, 360.0, 10) == pytest.approx(10.999)
+    # The counter moved on, its own fraction starts from zero again
+    assert energy.update(15.0, 360.0, 11) == 11
+
+
+def test_no_integration_across_long_gaps() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 1000.0, 10)
+    assert energy.update(3600.0, 1000.0, 10) == 10
+
+
+def test_wrap() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 3000.0, 65535)
+    # 3000 W for 5 s is about 4 Wh, enough to go from 65535 to 2 through 0
+    assert energy.update(5.0, 3000.0, 2) == 65536 + 2
+    assert (energy.wraps, energy.resets) == (1, 0)
+
+
+def test_reset_near_the_top_of_the_counter() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 100.0, 65000)
+    # 100 W can't have drawn 536 Wh in 5 s, the plug lost power and counts from zero
+    assert energy.update(5.0, 100.0, 0) == 65000
+    assert (energy.wraps, energy.resets) == (0, 1)
+
+
+def test_reset() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 100.0, 1234)
+    assert energy.update(5.0, 100.0, 3) == 1234 + 3
+    assert energy.update(10.0, 100.0, 4) == 1234 + 4
+    assert (energy.wraps, energy.resets) == (0, 1)
+
+
+def test_wrap_after_restart_uses_the_margin() -> None:
+    # Restored from storage, no previous sample to bound the delta
+    energy = EnergyIntegrator.from_dict({"offset": 0, "last_counter": 65500, "fraction": 0.0})
+    assert energy.update(0.0, 100.0, 3) == 65536 + 3
+    assert energy.wraps == 1
+
+
+def test_wrap_of_a_4_byte_counter() -> None:
+    energy = EnergyIntegrator(last_counter=(1 << 32) - 1)
+    assert energy.update(0.0, 100.0, 0) == 1 << 32
+
+
+def test_persistence() -> None:
+    energy = EnergyIntegrator()
+    energy.update(0.0, 360.0, 1000)
+    energy.update(5.0, 360.0, 1)
+    restored = EnergyIntegrator.from_dict(energy.as_dict())
+    assert restored.total == energy.total
+    assert restored.update(10.0, 360.0, 2) == 1000 + 2
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.coordinator import VoltcraftData
+from custom_components.voltcraft_sem6000_spb012ble.group import GroupAggregate
+
+MEMBERS = ["AA:AA:AA:AA:AA:01", "AA:AA:AA:AA:AA:02", "AA:AA:AA:AA:AA:03"]
+FIRST, SECOND, THIRD = MEMBERS
+
+
+def sample(power: float, total_energy: float | None = None) -> VoltcraftData:
+    return VoltcraftData(
+        is_on=True,
+        power=power,
+        voltage=230.0,
+        current=power / 230.0,
+        frequency=50,
+        power_factor=None,
+        consumed_energy=0.0,
+        total_energy=total_energy,
+    )
+
+
+def test_totals_of_fresh_members() -> None:
+    group = GroupAggregate(MEMBERS)
+    group.update(FIRST, 100.0, sample(100.0))
+    group.update(SECOND, 100.5, sample(50.0))
+    group.update(THIRD, 101.0, sample(10.0))
+    # Only the last sample of a member counts
+    group.update(FIRST, 105.0, sample(200.0))
+
+    data = group.snapshot(105.0, max_age=10.0, loaded=set(MEMBERS))
+    assert data.power == pytest.approx(260.0)
+    assert data.current == pytest.approx(260.0 / 230.0)
+    assert data.fresh == MEMBERS
+    assert (data.stale, data.missing) == ([], [])
+    assert data.spread == pytest.approx(4.5)
+
+
+def test_stale_and_missing_members_are_left_out() -> None:
+    group = GroupAggregate(MEMBERS)
+    group.update(FIRST, 100.0, sample(100.0))
+    group.update(SECOND, 80.0, sample(50.0))
+    group.update(THIRD, 100.0, sample(10.0))
+
+    data = group.snapshot(100.0, max_age=10.0, loaded={FIRST, SECOND})
+    assert data.power == pytest.approx(100.0)
+    assert (data.fresh, data.stale, data.missing) == ([FIRST], [SECOND], [THIRD])
+    assert data.spread == 0.0
+
+
+def test_energy_adds_the_increases_of_every_member() -> None:
+    group = GroupAggregate(MEMBERS)
+    assert group.snapshot(0.0, 10.0, set(MEMBERS)).energy is None
+
+    group.update(FIRST, 0.0, sample(100.0, total_energy=10.0))
+    group.update(SECOND, 0.0, sample(100.0, total_energy=500.0))
+    assert group.energy == 0.0
+
+    group.update(FIRST, 5.0, sample(100.0, total_energy=10.5))
+    group.update(SECOND, 5.0, sample(100.0, total_energy=501.0))
+    # THIRD never reported, the total doesn't wait for it
+    assert group.snapshot(5.0, 10.0, set(MEMBERS)).energy == pytest.approx(1.5)
+
+    # A member that was away for a while adds what it used meanwhile when it reports again
+    group.update(FIRST, 3600.0, sample(100.0, total_energy=12.0))
+    assert group.energy == pytest.approx(3.0)
+
+
+def test_energy_is_restored() -> None:
+    group = GroupAggregate(MEMBERS)
+    group.update(FIRST, 0.0, sample(100.0, total_energy=10.0))
+    group.update(FIRST, 5.0, sample(100.0, total_energy=11.0))
+    group.restore_energy(100.0)
+    assert group.energy == pytest.approx(101.0)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble.protocol import (
+    MAX_FRAME_SIZE,
+    Command,
+    FrameDecoder,
+    HourlyHistoryNotifyPayload,
+    MeasureNotifyPayload,
+    NotifyPayload,
+    ScheduleAction,
+    ScheduleEntry,
+    SwitchModes,
+    SwitchNotifyPayload,
+    build_hourly_history_request,
+    build_power_limit_request,
+    build_schedule_request,
+    build_time_sync_request,
+    payload_command,
+)
+
+# is_on, 1234.567 W, 230 V, 5.432 A, 50 Hz, 2 unknown bytes, energy counter
+MEASURE_V2 = Command.MEASURE.build_payload(bytes.fromhex("01 12d687 e6 1538 32 0000 0001e240"))
+MEASURE_V3 = Command.MEASURE.build_payload(bytes.fromhex("00 000000 e5 0000 31 0000 fffe"))
+SWITCH_ACK = Command.SWITCH.build_payload(b"\x00")
+
+
+def test_measure_frames() -> None:
+    assert NotifyPayload.from_payload(MEASURE_V2) == MeasureNotifyPayload(
+        is_on=True, power=1234567, voltage=230, current=5432, frequency=50, consumed_energy=123456
+    )
+    assert NotifyPayload.from_payload(MEASURE_V3) == MeasureNotifyPayload(
+        is_on=False, power=0, voltage=229, current=0, frequency=49, consumed_energy=65534
+    )
+
+
+def test_command_frames() -> None:
+    assert SwitchModes.ON.build_payload() == bytes.fromhex("0f 04 03 00 01 05 ffff")
+    assert Command.MEASURE.build_payload() == bytes.fromhex("0f 03 04 00 05 ffff")
+    # Constant frames are built once
+    assert Command.MEASURE.build_payload() is Command.MEASURE.build_payload()
+    assert build_power_limit_request(3680) == bytes.fromhex("0f 05 05 00 0e60 74 ffff")
+    assert build_hourly_history_request() == bytes.fromhex("0f 05 0a 00 0000 0b ffff")
+    assert build_time_sync_request(datetime(2026, 3, 1, 12, 34, 56)) == bytes.fromhex(
+        "0f 0c 01 00 38 22 0c 01 03 07ea 0000 5d ffff"
+    )
+    entry = ScheduleEntry(is_on=True, hour=7, minute=30, weekdays=0b0011111)
+    assert build_schedule_request(ScheduleAction.ADD, 2, entry) == bytes.fromhex(
+        "0f 09 14 00 00 02 01 1f 07 1e 5c ffff"
+    )
+    assert build_schedule_request(ScheduleAction.DELETE, 2) == bytes.fromhex("0f 09 14 00 02 02 00 00 00 00 19 ffff")
+
+
+def test_history_frame() -> None:
+    hours = tuple(range(100, 124))
+    frame = Command.HOURLY_HISTORY.build_payload(b"".join(hour.to_bytes(2, "big") for hour in hours))
+    assert NotifyPayload.from_payload(frame) == HourlyHistoryNotifyPayload(hourly_energy=hours)
+
+
+def test_payload_command() -> None:
+    assert payload_command(NotifyPayload.from_payload(MEASURE_V3)) is Command.MEASURE  # type: ignore[arg-type]
+    assert payload_command(NotifyPayload.from_payload(SWITCH_ACK)) is Command.SWITCH  # type: ignore[arg-type]
+
+
+def test_checksum_validation() -> None:
+    corrupted = bytearray(MEASURE_V2)
+    corrupted[-3] ^= 0xFF
+    assert NotifyPayload.from_payload(corrupted) is not None
+    assert NotifyPayload.from_payload(corrupted, validate_checksum=True) is None
+    assert NotifyPayload.from_payload(MEASURE_V2, validate_checksum=True) is not None
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [b"", b"\x0f", b"\x00" + MEASURE_V2[1:], MEASURE_V2[:10], bytes.fromhex("0f 01 04 00 ffff")],
+    ids=["empty", "header only", "no header", "truncated", "impossible length"],
+)
+def test_invalid_frames(frame: bytes) -> None:
+    assert NotifyPayload.from_payload(frame) is None
+
+
+def test_decoder_single_frames() -> None:
+    decoder = FrameDecoder()
+    assert decoder.feed(MEASURE_V2) == [NotifyPayload.from_payload(MEASURE_V2)]
+    assert decoder.feed(SWITCH_ACK) == [SwitchNotifyPayload()]
+    assert decoder.discarded_bytes == 0
+    assert decoder.unknown_frames == 0
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 20])
+def test_decoder_fragmented(size: int) -> None:
+    decoder = FrameDecoder()
+    stream = MEASURE_V2 + SWITCH_ACK + MEASURE_V3
+    payloads = []
+    for start in range(0, len(stream), size):
+        payloads += decoder.feed(stream[start : start + size])
+    assert payloads == [
+        NotifyPayload.from_payload(MEASURE_V2),
+        SwitchNotifyPayload(),
+        NotifyPayload.from_payload(MEASURE_V3),
+    ]
+    assert decoder.discarded_bytes == 0
+
+
+def test_decoder_coalesced() -> None:
+    decoder = FrameDecoder()
+    assert decoder.feed(MEASURE_V3 + SWITCH_ACK + MEASURE_V3) == [
+        NotifyPayload.from_payload(MEASURE_V3),
+        SwitchNotifyPayload(),
+        NotifyPayload.from_payload(MEASURE_V3),
+    ]
+
+
+def test_decoder_garbage() -> None:
+    decoder = FrameDecoder()
+    garbage = bytes.fromhex("00 12 0f ff 0f 0f")
+    payloads = decoder.feed(garbage + MEASURE_V2 + b"\xaa\x0f" + SWITCH_ACK)
+    assert payloads == [NotifyPayload.from_payload(MEASURE_V2), SwitchNotifyPayload()]
+    assert decoder.discarded_bytes == len(garbage) + 2
+
+
+def test_decoder_unknown_command() -> None:
+    decoder = FrameDecoder()
+    unknown = bytes.fromhex("0f 04 7f 00 00 80 ffff")
+    assert decoder.feed(unknown + MEASURE_V3) == [NotifyPayload.from_payload(MEASURE_V3)]
+    assert decoder.unknown_frames == 1
+
+
+def test_decoder_bounded_buffer() -> None:
+    decoder = FrameDecoder()
+    # A header announcing the longest frame, never completed
+    for _ in range(10):
+        assert decoder.feed(b"\x0f\xff" + bytes(MAX_FRAME_SIZE)) == []
+    assert len(decoder._buffer) <= 2 * MAX_FRAME_SIZE
+    decoder.reset()
+    assert decoder.feed(MEASURE_V2) == [NotifyPayload.from_payload(MEASURE_V2)]
+
+
+def test_decoder_reset_drops_partial_frame() -> None:
+    decoder = FrameDecoder()
+    assert decoder.feed(MEASURE_V2[:7]) == []
+    decoder.reset()
+    assert decoder.feed(MEASURE_V2[7:] + SWITCH_ACK) == [SwitchNotifyPayload()]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import pytest
+
+from custom_components.voltcraft_sem6000_spb012ble import state_filter
+from custom_components.voltcraft_sem6000_spb012ble.state_filter import Deadband, StateFilter
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(state_filter.time, "monotonic", clock)
+    return clock
+
+
+def test_deadband() -> None:
+    deadband = Deadband(absolute=0.5, relative=0.02)
+    assert not deadband.exceeded(10.0, 10.4)
+    assert deadband.exceeded(10.0, 10.6)
+    # The relative band is wider for large values
+    assert not deadband.exceeded(1000.0, 1015.0)
+    assert deadband.exceeded(1000.0, 1025.0)
+    assert deadband.exceeded(1000.0, 975.0)
+
+
+def test_zero_deadband_publishes_every_change() -> None:
+    deadband = Deadband()
+    assert not deadband.exceeded(50, 50)
+    assert deadband.exceeded(50, 51)
+    assert deadband.exceeded("idle", "running")
+    assert not deadband.exceeded("idle", "idle")
+
+
+def test_filter(clock: Clock) -> None:
+    state = StateFilter(Deadband(absolute=1.0), min_interval=0.0, max_interval=300.0)
+    assert state.should_publish(230.0, True)
+    clock.now += 5
+    assert not state.should_publish(230.5, True)
+    clock.now += 5
+    assert state.should_publish(232.0, True)
+    # Measured against the last published value, not the last seen one
+    clock.now += 5
+    assert not state.should_publish(232.8, True)
+    clock.now += 5
+    assert not state.should_publish(231.4, True)
+
+
+def test_availability_and_none_publish_at_once(clock: Clock) -> None:
+    state = StateFilter(Deadband(absolute=1.0), min_interval=60.0, max_interval=300.0)
+    assert state.should_publish(230.0, True)
+    clock.now += 1
+    assert state.should_publish(230.0, False)
+    clock.now += 1
+    assert state.should_publish(None, True)
+    clock.now += 1
+    assert state.should_publish(230.0, True)
+
+
+def test_min_interval(clock: Clock) -> None:
+    state = StateFilter(Deadband(absolute=1.0), min_interval=30.0, max_interval=300.0)
+    assert state.should_publish(100.0, True)
+    clock.now += 10
+    assert not state.should_publish(200.0, True)
+    clock.now += 20
+    assert state.should_publish(200.0, True)
+
+
+def test_heartbeat(clock: Clock) -> None:
+    state = StateFilter(Deadband(absolute=1.0), min_interval=0.0, max_interval=300.0)
+    assert state.should_publish(230.0, True)
+    clock.now += 299
+    assert not state.should_publish(230.0, True)
+    clock.now += 1
+    assert state.should_publish(230.0, True)
+
+    disabled = StateFilter(Deadband(absolute=1.0), min_interval=0.0, max_interval=0.0)
+    assert disabled.should_publish(230.0, True)
+    clock.now += 86400
+    assert not disabled.should_publish(230.0, True)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import datetime, time
+
+from custom_components.voltcraft_sem6000_spb012ble.protocol import ScheduleEntry
+from custom_components.voltcraft_sem6000_spb012ble.timers import (
+    ALL_WEEKDAYS,
+    compile_events,
+    entry_as_dict,
+    entry_from_dict,
+    range_events,
+    timer_due,
+)
+
+WORKDAYS = 0b0011111
+
+
+def test_events_merge_across_weekdays() -> None:
+    events = [(day, time(7, 0), True) for day in range(5)] + [(day, time(18, 30), False) for day in range(5)]
+    assert compile_events(events) == [
+        ScheduleEntry(is_on=True, hour=7, minute=0, weekdays=WORKDAYS),
+        ScheduleEntry(is_on=False, hour=18, minute=30, weekdays=WORKDAYS),
+    ]
+
+
+def test_timers_are_ordered_by_time_of_day() -> None:
+    events = [(6, time(22, 0), False), (5, time(9, 15), True), (0, time(9, 15), False)]
+    assert [(entry.hour, entry.minute, entry.is_on) for entry in compile_events(events)] == [
+        (9, 15, False),
+        (9, 15, True),
+        (22, 0, False),
+    ]
+
+
+def test_ranges_of_a_workweek() -> None:
+    ranges = {day: [(time(8, 0), time(17, 0))] for day in range(5)}
+    assert compile_events(range_events(ranges)) == [
+        ScheduleEntry(is_on=True, hour=8, minute=0, weekdays=WORKDAYS),
+        ScheduleEntry(is_on=False, hour=17, minute=0, weekdays=WORKDAYS),
+    ]
+
+
+def test_range_until_midnight() -> None:
+    # Friday 20:00 until midnight switches off at 00:00 on Saturday
+    assert range_events({4: [(time(20, 0), time.max)]}) == [(4, time(20, 0), True), (5, time.min, False)]
+
+
+def test_range_across_midnight() -> None:
+    # Sunday 22:00 until Monday 06:00, the outlet stays on over midnight
+    ranges = {6: [(time(22, 0), time.max)], 0: [(time.min, time(6, 0))]}
+    assert sorted(range_events(ranges)) == [(0, time(6, 0), False), (6, time(22, 0), True)]
+
+
+def test_always_on() -> None:
+    ranges = {day: [(time.min, time.max)] for day in range(7)}
+    assert range_events(ranges) == []
+
+
+def test_timer_due() -> None:
+    entries = [ScheduleEntry(is_on=False, hour=23, minute=0, weekdays=WORKDAYS)]
+    monday = datetime(2026, 3, 2, 22, 59, 30)
+    assert timer_due(entries, False, monday, datetime(2026, 3, 2, 23, 0, 5))
+    # Within the minute the timer fires in
+    assert timer_due(entries, False, datetime(2026, 3, 2, 23, 0, 40), datetime(2026, 3, 2, 23, 0, 45))
+    assert not timer_due(entries, True, monday, datetime(2026, 3, 2, 23, 0, 5))
+    assert not timer_due(entries, False, monday, datetime(2026, 3, 2, 22, 59, 55))
+    # Not on Saturdays
+    assert not timer_due(entries, False, datetime(2026, 3, 7, 22, 59), datetime(2026, 3, 7, 23, 1))
+
+
+def test_timer_due_across_midnight() -> None:
+    entries = [ScheduleEntry(is_on=False, hour=0, minute=0, weekdays=ALL_WEEKDAYS)]
+    assert timer_due(entries, False, datetime(2026, 3, 2, 23, 59, 50), datetime(2026, 3, 3, 0, 0, 10))
+
+
+def test_entry_dict_round_trip() -> None:
+    entry = ScheduleEntry(is_on=True, hour=6, minute=5, weekdays=0b1100000)
+    assert entry_as_dict(entry) == {"state": "on", "at": "06:05", "weekdays": ["saturday", "sunday"]}
+    assert entry_from_dict(entry_as_dict(entry)) == entry